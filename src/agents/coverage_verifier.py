@@ -73,7 +73,7 @@ class CoverageVerifierAgent(BaseAgent):
             # Use LLM to suggest best arc fit
             prompt = f"""Given this entity:
 Name: {entity.name}
-Type: {entity.entity_type.value if hasattr(entity.entity_type, 'value') else entity.entity_type}
+Type: {entity.entity_type_str}
 Summary: {entity.summary}
 
 And these arcs:
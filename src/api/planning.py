@@ -15,6 +15,7 @@ from src.models import NovelInput, NovelOutline, Genre
 from src.llm import OllamaClient
 from src.memory import (
     LocalFileState,
+    LocalLogState,
     LocalObjectStore,
     QdrantVectorStore,
     InMemoryGraphStore,
@@ -41,9 +42,15 @@ def _create_storage(config: Dict[str, Any]):
 
     if provider == "local":
         local_config = storage_config.get("local", {})
-        structured_state = LocalFileState(
-            storage_dir=local_config.get("data_dir", "./data")
-        )
+        # "files": one JSON file per record (default); "log": one packed log per table
+        if local_config.get("layout", "files") == "log":
+            structured_state = LocalLogState(
+                storage_dir=local_config.get("data_dir", "./data")
+            )
+        else:
+            structured_state = LocalFileState(
+                storage_dir=local_config.get("data_dir", "./data")
+            )
         object_store = LocalObjectStore(
             storage_dir=local_config.get("objects_dir", "./data/objects")
         )
@@ -70,7 +77,15 @@ def _create_storage(config: Dict[str, Any]):
                 host=qdrant_config.get("host", "localhost"),
                 port=qdrant_config.get("port", 6333),
                 collection_name=qdrant_config.get("collection_name", "multiwriter-embeddings"),
-                vector_size=qdrant_config.get("vector_size", 768)
+                vector_size=qdrant_config.get("vector_size", 768),
+                prefer_grpc=qdrant_config.get("prefer_grpc", False),
+                grpc_port=qdrant_config.get("grpc_port", 6334),
+                hnsw_m=qdrant_config.get("hnsw_m", 24),
+                ef_construction=qdrant_config.get("ef_construction", 128),
+                quantization=qdrant_config.get("quantization", "scalar"),
+                vector_datatype=qdrant_config.get("vector_datatype", "float32"),
+                ef_search=qdrant_config.get("ef_search", 100),
+                oversampling=qdrant_config.get("oversampling")
             )
         except Exception:
             pass
@@ -84,7 +99,9 @@ def _create_storage(config: Dict[str, Any]):
                 uri=graph_config.get("uri", "bolt://localhost:7687"),
                 user=graph_config.get("user", "neo4j"),
                 password=graph_config.get("password", "password"),
-                database=graph_config.get("database", "neo4j")
+                database=graph_config.get("database", "neo4j"),
+                max_connection_pool_size=graph_config.get("max_connection_pool_size", 100),
+                fetch_size=graph_config.get("fetch_size", 10_000)
             )
         except Exception:
             graph_store = InMemoryGraphStore()
@@ -3,10 +3,11 @@
 from .structured_state import StructuredState, DynamoDBState
 from .object_store import ObjectStore, S3ObjectStore
 from .vector_store import VectorStore, QdrantVectorStore
-from .local_storage import LocalFileState, LocalObjectStore
+from .local_storage import LocalFileState, LocalLogState, LocalObjectStore
 from .graph_store import GraphStore
 from .in_memory_graph import InMemoryGraphStore
 from .rag_retrieval import HybridRAGRetrieval
+from .semantic_cache import SemanticQueryCache
 
 # Neo4j is optional - only import if available
 try:
@@ -20,6 +21,7 @@ __all__ = [
     "StructuredState",
     "DynamoDBState",
     "LocalFileState",
+    "LocalLogState",
     "ObjectStore",
     "S3ObjectStore",
     "LocalObjectStore",
@@ -28,6 +30,7 @@ __all__ = [
     "GraphStore",
     "InMemoryGraphStore",
     "HybridRAGRetrieval",
+    "SemanticQueryCache",
 ]
 
 if _NEO4J_AVAILABLE:
@@ -25,6 +25,11 @@ class GraphStore(ABC):
         """Get a node by ID"""
         pass
 
+    async def get_nodes(self, node_ids: List[str]) -> Dict[str, CanonNode]:
+        """Get several nodes by ID (missing IDs are left out); backends override this with a single bulk read"""
+        nodes = [await self.get_node(node_id) for node_id in node_ids]
+        return {node.id: node for node in nodes if node is not None}
+
     @abstractmethod
     async def update_node(self, node_id: str, **properties) -> Optional[CanonNode]:
         """Update node properties"""
@@ -40,6 +45,24 @@ class GraphStore(ABC):
         """Create a new edge in the graph"""
         pass
 
+    async def create_nodes_batch(self, nodes: List[CanonNode]) -> List[CanonNode]:
+        """Create several nodes; backends override this with a single bulk write"""
+        return [await self.create_node(node) for node in nodes]
+
+    async def update_nodes(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, CanonNode]:
+        """
+        Update several nodes (node ID -> properties); missing nodes are left out of the result
+
+        Calls run one after another, as a backend session may not allow concurrent
+        use; backends override this with a single bulk write.
+        """
+        nodes = [await self.update_node(node_id, **properties) for node_id, properties in updates.items()]
+        return {node.id: node for node in nodes if node is not None}
+
+    async def create_edges_batch(self, edges: List[CanonEdge]) -> List[CanonEdge]:
+        """Create several edges; backends override this with a single bulk write"""
+        return [await self.create_edge(edge) for edge in edges]
+
     @abstractmethod
     async def get_edges(
         self,
@@ -1,8 +1,11 @@
 """In-memory implementation of GraphStore using NetworkX-like structure"""
 
 import logging
+from dataclasses import dataclass
 from typing import List, Optional, Dict, Any, Set
-from collections import defaultdict, deque
+from collections import defaultdict
+
+import numpy as np
 
 from src.memory.graph_store import GraphStore
 from src.models.canon import (
@@ -16,34 +19,184 @@ from src.models.canon import (
 
 logger = logging.getLogger(__name__)
 
+# Stable small-int code per edge type for the CSR edge_type arrays
+EDGE_TYPE_CODES: Dict[str, int] = {et.value: code for code, et in enumerate(EdgeType)}
+
+
+@dataclass
+class CSRGraph:
+    """Read-only compressed sparse row snapshot of the graph"""
+    node_ids: List[str]  # iloc -> node id
+    iloc: Dict[str, int]  # node id -> iloc
+    out_indptr: np.ndarray  # out-edges of node i: out_indices[out_indptr[i]:out_indptr[i + 1]]
+    out_indices: np.ndarray  # target ilocs
+    out_types: np.ndarray  # edge type codes, parallel to out_indices
+    in_indptr: np.ndarray  # in-edges of node i, same layout
+    in_indices: np.ndarray  # source ilocs
+    in_types: np.ndarray
+
+    def out_degree(self) -> np.ndarray:
+        """Out-degree per node iloc"""
+        return np.diff(self.out_indptr)
+
+    def in_degree(self) -> np.ndarray:
+        """In-degree per node iloc"""
+        return np.diff(self.in_indptr)
+
+
+def _pack_csr(adjacency: List[List[CanonEdge]], iloc: Dict[str, int], endpoint: str):
+    """Pack per-node edge lists into (indptr, indices, type codes) arrays"""
+    counts = np.fromiter((len(edges) for edges in adjacency), dtype=np.int64, count=len(adjacency))
+    indptr = np.zeros(len(adjacency) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    total = int(indptr[-1])
+    indices = np.fromiter(
+        (iloc[getattr(e, endpoint)] for edges in adjacency for e in edges), dtype=np.int32, count=total
+    )
+    types = np.fromiter(
+        (EDGE_TYPE_CODES[e.type] for edges in adjacency for e in edges), dtype=np.int8, count=total
+    )
+    return indptr, indices, types
+
+
+def _expand(frontier: np.ndarray, indptr: np.ndarray, indices: np.ndarray, types: np.ndarray, type_code: int) -> np.ndarray:
+    """All neighbours of the frontier ilocs reached via edges with the given type code"""
+    starts = indptr[frontier]
+    lengths = indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    # Concatenate the ranges [start, start + length) without a Python loop
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+    return indices[offsets[types[offsets] == type_code]]
+
 
 class InMemoryGraphStore(GraphStore):
-    """In-memory graph store implementation"""
+    """
+    In-memory graph store implementation
+
+    Nothing here does I/O, so every read also has a ``*_sync`` twin (get_node_sync,
+    get_edges_sync, query_nodes_sync, ...) for callers in tight loops that want to
+    skip coroutine overhead. The async GraphStore methods delegate to them.
+
+    snapshot() hands out a read-only store sharing the current containers in O(1).
+    The next write copies the containers first (copy-on-write), and nodes/edges
+    that are updated in place are copied before mutation, so readers of a snapshot
+    never observe later writes and need no locking.
+    """
 
     def __init__(self):
         """Initialize empty graph"""
         self.nodes: Dict[str, CanonNode] = {}
-        self.edges: Dict[str, List[CanonEdge]] = defaultdict(list)  # source_id -> [edges]
-        self.reverse_edges: Dict[str, List[CanonEdge]] = defaultdict(list)  # target_id -> [edges]
-        self.edge_index: Dict[tuple, CanonEdge] = {}  # (source_id, target_id, edge_type) -> edge
+        self.nodes_by_type: Dict[str, Dict[str, CanonNode]] = defaultdict(dict)  # node type -> {node_id: node}
+        # Adjacency keyed by the far endpoint and type, so single edges are removed in O(1)
+        self.edges: Dict[str, Dict[tuple, CanonEdge]] = defaultdict(dict)  # source_id -> {(target_id, type): edge}
+        self.reverse_edges: Dict[str, Dict[tuple, CanonEdge]] = defaultdict(dict)  # target_id -> {(source_id, type): edge}
+        # (source_id, target_id, edge_type) -> edge. Plain string tuples on purpose: str hashes
+        # are cached, so these keys are cheaper than packing interned ints (which costs extra
+        # id -> int lookups per access)
+        self.edge_index: Dict[tuple, CanonEdge] = {}
+        # Lazily built NumPy CSR snapshot for bulk queries; dropped on every mutation
+        self._csr: Optional[CSRGraph] = None
+
+        # Copy-on-write state for snapshot()
+        self._read_only = False
+        self._shared = False  # containers are referenced by a snapshot
+        # Ids/keys of nodes and edges created or copied since the last snapshot (safe to
+        # mutate in place). None until the first snapshot: everything is owned.
+        self._owned_nodes: Optional[Set[str]] = None
+        self._owned_edges: Optional[Set[tuple]] = None
+
+    def _prepare_write(self):
+        """Detach from any outstanding snapshot before mutating"""
+        if self._read_only:
+            raise RuntimeError("Graph snapshots are read-only")
+        if self._shared:
+            self.nodes = dict(self.nodes)
+            self.nodes_by_type = defaultdict(dict, {t: dict(n) for t, n in self.nodes_by_type.items()})
+            self.edges = defaultdict(dict, {k: dict(e) for k, e in self.edges.items()})
+            self.reverse_edges = defaultdict(dict, {k: dict(e) for k, e in self.reverse_edges.items()})
+            self.edge_index = dict(self.edge_index)
+            self._shared = False
+
+    def _own_node(self, node: CanonNode) -> CanonNode:
+        """Return a node that may be mutated without affecting snapshots"""
+        if self._owned_nodes is None or node.id in self._owned_nodes:
+            return node
+        node = node.model_copy(deep=True)
+        self.nodes[node.id] = node
+        self.nodes_by_type[node.type][node.id] = node
+        self._owned_nodes.add(node.id)
+        return node
+
+    def _own_edge(self, key: tuple, edge: CanonEdge) -> CanonEdge:
+        """Return an edge that may be mutated without affecting snapshots"""
+        if self._owned_edges is None or key in self._owned_edges:
+            return edge
+        edge = edge.model_copy(deep=True)
+        self.edges[edge.source_id][(edge.target_id, edge.type)] = edge
+        self.reverse_edges[edge.target_id][(edge.source_id, edge.type)] = edge
+        self.edge_index[key] = edge
+        self._owned_edges.add(key)
+        return edge
+
+    def snapshot(self) -> "InMemoryGraphStore":
+        """
+        Get a consistent, read-only view of the graph as of now
+
+        The returned store supports every read method (sync and async); its
+        mutators raise RuntimeError.
+        """
+        snap = InMemoryGraphStore.__new__(InMemoryGraphStore)
+        snap.nodes = self.nodes
+        snap.nodes_by_type = self.nodes_by_type
+        snap.edges = self.edges
+        snap.reverse_edges = self.reverse_edges
+        snap.edge_index = self.edge_index
+        snap._csr = self._csr
+        snap._read_only = True
+        snap._shared = False
+        snap._owned_nodes = None
+        snap._owned_edges = None
+
+        self._shared = True
+        self._owned_nodes = set()
+        self._owned_edges = set()
+        return snap
 
     async def create_node(self, node: CanonNode) -> CanonNode:
         """Create a new node"""
         if node.id in self.nodes:
             raise ValueError(f"Node {node.id} already exists")
+        self._prepare_write()
+        if self._owned_nodes is not None:
+            self._owned_nodes.add(node.id)
         self.nodes[node.id] = node
+        self.nodes_by_type[node.type][node.id] = node
+        self._csr = None
         logger.debug(f"Created node {node.id} of type {node.type}")
         return node
 
-    async def get_node(self, node_id: str) -> Optional[CanonNode]:
+    def get_node_sync(self, node_id: str) -> Optional[CanonNode]:
         """Get a node by ID"""
         return self.nodes.get(node_id)
 
+    async def get_node(self, node_id: str) -> Optional[CanonNode]:
+        """Get a node by ID"""
+        return self.get_node_sync(node_id)
+
+    async def get_nodes(self, node_ids: List[str]) -> Dict[str, CanonNode]:
+        """Get several nodes by ID; missing IDs are left out of the result"""
+        nodes = self.nodes
+        return {node_id: nodes[node_id] for node_id in node_ids if node_id in nodes}
+
     async def update_node(self, node_id: str, **properties) -> Optional[CanonNode]:
         """Update node properties"""
         node = self.nodes.get(node_id)
         if not node:
             return None
+        self._prepare_write()
+        node = self._own_node(node)
         node.update(**properties)
         return node
 
@@ -51,38 +204,28 @@ class InMemoryGraphStore(GraphStore):
         """Delete a node and all its edges"""
         if node_id not in self.nodes:
             return False
-
-        # Delete all outgoing edges
-        if node_id in self.edges:
-            for edge in self.edges[node_id]:
-                # Remove from reverse index
-                if edge.target_id in self.reverse_edges:
-                    self.reverse_edges[edge.target_id] = [
-                        e for e in self.reverse_edges[edge.target_id]
-                        if not (e.source_id == edge.source_id and e.type == edge.type)
-                    ]
-                # Remove from edge index
-                key = (edge.source_id, edge.target_id, edge.type)
-                if key in self.edge_index:
-                    del self.edge_index[key]
-            del self.edges[node_id]
-
-        # Delete all incoming edges
-        if node_id in self.reverse_edges:
-            for edge in self.reverse_edges[node_id]:
-                # Remove from forward index
-                if edge.source_id in self.edges:
-                    self.edges[edge.source_id] = [
-                        e for e in self.edges[edge.source_id]
-                        if not (e.target_id == edge.target_id and e.type == edge.type)
-                    ]
-                # Remove from edge index
-                key = (edge.source_id, edge.target_id, edge.type)
-                if key in self.edge_index:
-                    del self.edge_index[key]
-            del self.reverse_edges[node_id]
-
-        del self.nodes[node_id]
+        self._prepare_write()
+
+        # Delete all outgoing edges, then all incoming ones
+        for target_id, edge_type in self.edges.pop(node_id, {}):
+            incoming = self.reverse_edges.get(target_id)
+            if incoming is not None:
+                incoming.pop((node_id, edge_type), None)
+            self.edge_index.pop((node_id, target_id, edge_type), None)
+
+        for source_id, edge_type in self.reverse_edges.pop(node_id, {}):
+            outgoing = self.edges.get(source_id)
+            if outgoing is not None:
+                outgoing.pop((node_id, edge_type), None)
+            self.edge_index.pop((source_id, node_id, edge_type), None)
+
+        node = self.nodes.pop(node_id)
+        self._csr = None
+        typed = self.nodes_by_type.get(node.type)
+        if typed is not None:
+            typed.pop(node_id, None)
+            if not typed:
+                del self.nodes_by_type[node.type]
         logger.debug(f"Deleted node {node_id}")
         return True
 
@@ -96,20 +239,24 @@ class InMemoryGraphStore(GraphStore):
 
         # Check if edge already exists
         key = (edge.source_id, edge.target_id, edge.type)
+        self._prepare_write()
         if key in self.edge_index:
             # Update existing edge
-            existing = self.edge_index[key]
+            existing = self._own_edge(key, self.edge_index[key])
             existing.update_properties(**edge.properties)
             return existing
 
         # Add to indexes
-        self.edges[edge.source_id].append(edge)
-        self.reverse_edges[edge.target_id].append(edge)
+        if self._owned_edges is not None:
+            self._owned_edges.add(key)
+        self._csr = None
+        self.edges[edge.source_id][(edge.target_id, edge.type)] = edge
+        self.reverse_edges[edge.target_id][(edge.source_id, edge.type)] = edge
         self.edge_index[key] = edge
         logger.debug(f"Created edge {edge.type} from {edge.source_id} to {edge.target_id}")
         return edge
 
-    async def get_edges(
+    def get_edges_sync(
         self,
         source_id: Optional[str] = None,
         target_id: Optional[str] = None,
@@ -120,73 +267,82 @@ class InMemoryGraphStore(GraphStore):
 
         if source_id:
             # Search from source
-            edges = self.edges.get(source_id, [])
+            edges = self.edges.get(source_id, {}).values()
             for edge in edges:
                 if (target_id is None or edge.target_id == target_id) and \
                    (edge_type is None or edge.type == edge_type):
                     results.append(edge)
         elif target_id:
             # Search from target (reverse)
-            edges = self.reverse_edges.get(target_id, [])
+            edges = self.reverse_edges.get(target_id, {}).values()
             for edge in edges:
                 if (edge_type is None or edge.type == edge_type):
                     results.append(edge)
         else:
             # Search all edges
-            for edges_list in self.edges.values():
-                for edge in edges_list:
+            for edges_by_key in self.edges.values():
+                for edge in edges_by_key.values():
                     if (edge_type is None or edge.type == edge_type):
                         results.append(edge)
 
         return results
 
+    async def get_edges(
+        self,
+        source_id: Optional[str] = None,
+        target_id: Optional[str] = None,
+        edge_type: Optional[EdgeType] = None
+    ) -> List[CanonEdge]:
+        """Get edges matching criteria"""
+        return self.get_edges_sync(source_id=source_id, target_id=target_id, edge_type=edge_type)
+
     async def delete_edge(self, source_id: str, target_id: str, edge_type: EdgeType) -> bool:
         """Delete an edge"""
         key = (source_id, target_id, edge_type)
         if key not in self.edge_index:
             return False
 
-        edge = self.edge_index[key]
+        self._prepare_write()
+        self._csr = None
 
-        # Remove from forward index
-        if source_id in self.edges:
-            self.edges[source_id] = [
-                e for e in self.edges[source_id]
-                if not (e.target_id == target_id and e.type == edge_type)
-            ]
-
-        # Remove from reverse index
-        if target_id in self.reverse_edges:
-            self.reverse_edges[target_id] = [
-                e for e in self.reverse_edges[target_id]
-                if not (e.source_id == source_id and e.type == edge_type)
-            ]
+        # Remove from forward and reverse indexes
+        outgoing = self.edges.get(source_id)
+        if outgoing is not None:
+            outgoing.pop((target_id, edge_type), None)
+        incoming = self.reverse_edges.get(target_id)
+        if incoming is not None:
+            incoming.pop((source_id, edge_type), None)
 
         del self.edge_index[key]
         logger.debug(f"Deleted edge {edge_type} from {source_id} to {target_id}")
         return True
 
-    async def query_nodes(self, query: CanonQuery) -> List[CanonNode]:
+    def query_nodes_sync(self, query: CanonQuery) -> List[CanonNode]:
         """Query nodes with filters"""
         results = []
 
-        for node in self.nodes.values():
-            # Filter by type
-            if query.node_type and node.type != query.node_type:
-                continue
+        # Narrow the candidate set via the id / type indexes before filtering
+        if query.node_id:
+            node = self.nodes.get(query.node_id)
+            candidates = [node] if node else []
+        elif query.node_type:
+            candidates = self.nodes_by_type.get(query.node_type, {}).values()
+        else:
+            candidates = self.nodes.values()
 
-            # Filter by ID
-            if query.node_id and node.id != query.node_id:
+        # Build the filter once instead of re-walking properties_filter per node
+        node_type = query.node_type
+        filter_items = tuple((query.properties_filter or {}).items())
+
+        for node in candidates:
+            # Filter by type
+            if node_type and node.type != node_type:
                 continue
 
             # Filter by properties
-            if query.properties_filter:
-                match = True
-                for key, value in query.properties_filter.items():
-                    if node.properties.get(key) != value:
-                        match = False
-                        break
-                if not match:
+            if filter_items:
+                properties = node.properties
+                if any(properties.get(key) != value for key, value in filter_items):
                     continue
 
             results.append(node)
@@ -197,42 +353,61 @@ class InMemoryGraphStore(GraphStore):
 
         return results
 
-    async def query_timeline(self, query: TimelineQuery) -> List[CanonNode]:
+    async def query_nodes(self, query: CanonQuery) -> List[CanonNode]:
+        """Query nodes with filters"""
+        return self.query_nodes_sync(query)
+
+    def query_timeline_sync(self, query: TimelineQuery) -> List[CanonNode]:
         """Query timeline (before/after traversal)"""
         edge_types = query.edge_types or [EdgeType.BEFORE, EdgeType.AFTER]
-        visited: Set[str] = set()
+        # Level-synchronous BFS: each hop's frontier is a plain list, so no (id, depth)
+        # tuples or deque ops per visit. Nodes are marked when first reached (at their
+        # minimal depth), so a frontier never holds duplicates
+        seen: Set[str] = {query.start_node_id}
         results: List[CanonNode] = []
-        queue = deque([(query.start_node_id, 0)])
+        frontier = [query.start_node_id]
 
-        while queue:
-            node_id, depth = queue.popleft()
+        for depth in range(query.max_depth + 1):
+            next_frontier: List[str] = []
 
-            if depth > query.max_depth or node_id in visited:
-                continue
+            for node_id in frontier:
+                node = self.nodes.get(node_id)
+                if node:
+                    results.append(node)
+                    if len(results) >= query.limit:
+                        return results
 
-            visited.add(node_id)
-            node = self.nodes.get(node_id)
-            if node:
-                results.append(node)
-
-            # Get neighbors based on direction
-            if query.direction in ("forward", "both"):
-                # Follow AFTER edges (forward in time)
-                edges = await self.get_edges(source_id=node_id, edge_type=EdgeType.AFTER)
-                for edge in edges:
-                    if edge.type in edge_types:
-                        queue.append((edge.target_id, depth + 1))
-
-            if query.direction in ("backward", "both"):
-                # Follow BEFORE edges (backward in time)
-                edges = await self.get_edges(target_id=node_id, edge_type=EdgeType.BEFORE)
-                for edge in edges:
-                    if edge.type in edge_types:
-                        queue.append((edge.source_id, depth + 1))
+                if depth >= query.max_depth:
+                    continue
+
+                # Get neighbors based on direction
+                if query.direction in ("forward", "both"):
+                    # Follow AFTER edges (forward in time)
+                    edges = self.get_edges_sync(source_id=node_id, edge_type=EdgeType.AFTER)
+                    for edge in edges:
+                        if edge.type in edge_types and edge.target_id not in seen:
+                            seen.add(edge.target_id)
+                            next_frontier.append(edge.target_id)
+
+                if query.direction in ("backward", "both"):
+                    # Follow BEFORE edges (backward in time)
+                    edges = self.get_edges_sync(target_id=node_id, edge_type=EdgeType.BEFORE)
+                    for edge in edges:
+                        if edge.type in edge_types and edge.source_id not in seen:
+                            seen.add(edge.source_id)
+                            next_frontier.append(edge.source_id)
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
 
         return results
 
-    async def get_neighbors(
+    async def query_timeline(self, query: TimelineQuery) -> List[CanonNode]:
+        """Query timeline (before/after traversal)"""
+        return self.query_timeline_sync(query)
+
+    def get_neighbors_sync(
         self,
         node_id: str,
         edge_types: Optional[List[EdgeType]] = None,
@@ -242,20 +417,30 @@ class InMemoryGraphStore(GraphStore):
         neighbors: Set[str] = set()
 
         if direction in ("out", "both"):
-            edges = self.edges.get(node_id, [])
+            edges = self.edges.get(node_id, {}).values()
             for edge in edges:
                 if edge_types is None or edge.type in edge_types:
                     neighbors.add(edge.target_id)
 
         if direction in ("in", "both"):
-            edges = self.reverse_edges.get(node_id, [])
+            edges = self.reverse_edges.get(node_id, {}).values()
             for edge in edges:
                 if edge_types is None or edge.type in edge_types:
                     neighbors.add(edge.source_id)
 
-        return [self.nodes[nid] for nid in neighbors if nid in self.nodes]
+        # Edge endpoints always exist: create_edge checks them and delete_node drops their edges
+        return list(map(self.nodes.__getitem__, neighbors))
 
-    async def get_related_entities(
+    async def get_neighbors(
+        self,
+        node_id: str,
+        edge_types: Optional[List[EdgeType]] = None,
+        direction: str = "both"
+    ) -> List[CanonNode]:
+        """Get neighboring nodes"""
+        return self.get_neighbors_sync(node_id=node_id, edge_types=edge_types, direction=direction)
+
+    def get_related_entities_sync(
         self,
         node_id: str,
         max_depth: int = 2,
@@ -264,24 +449,34 @@ class InMemoryGraphStore(GraphStore):
         """Get related entities within max_depth hops"""
         visited: Set[str] = {node_id}
         results: List[CanonNode] = []
-        queue = deque([(node_id, 0)])
-
-        while queue:
-            current_id, depth = queue.popleft()
-
-            if depth >= max_depth:
-                continue
-
-            neighbors = await self.get_neighbors(current_id, edge_types=edge_types, direction="both")
-            for neighbor in neighbors:
-                if neighbor.id not in visited:
-                    visited.add(neighbor.id)
-                    results.append(neighbor)
-                    queue.append((neighbor.id, depth + 1))
+        frontier = [node_id]
+
+        # Level-synchronous BFS, one frontier list per hop
+        for _ in range(max_depth):
+            next_frontier: List[str] = []
+            for current_id in frontier:
+                neighbors = self.get_neighbors_sync(current_id, edge_types=edge_types, direction="both")
+                for neighbor in neighbors:
+                    if neighbor.id not in visited:
+                        visited.add(neighbor.id)
+                        results.append(neighbor)
+                        next_frontier.append(neighbor.id)
+            if not next_frontier:
+                break
+            frontier = next_frontier
 
         return results
 
-    async def check_cycle(self, start_node_id: str, edge_types: Optional[List[EdgeType]] = None) -> bool:
+    async def get_related_entities(
+        self,
+        node_id: str,
+        max_depth: int = 2,
+        edge_types: Optional[List[EdgeType]] = None
+    ) -> List[CanonNode]:
+        """Get related entities within max_depth hops"""
+        return self.get_related_entities_sync(node_id=node_id, max_depth=max_depth, edge_types=edge_types)
+
+    def check_cycle_sync(self, start_node_id: str, edge_types: Optional[List[EdgeType]] = None) -> bool:
         """Check if there's a cycle in the graph (DFS)"""
         if start_node_id not in self.nodes:
             return False
@@ -294,7 +489,7 @@ class InMemoryGraphStore(GraphStore):
             rec_stack.add(node_id)
 
             # Check outgoing edges
-            edges = self.edges.get(node_id, [])
+            edges = self.edges.get(node_id, {}).values()
             for edge in edges:
                 if edge_types and edge.type not in edge_types:
                     continue
@@ -311,10 +506,93 @@ class InMemoryGraphStore(GraphStore):
 
         return has_cycle(start_node_id)
 
+    async def check_cycle(self, start_node_id: str, edge_types: Optional[List[EdgeType]] = None) -> bool:
+        """Check if there's a cycle in the graph (DFS)"""
+        return self.check_cycle_sync(start_node_id=start_node_id, edge_types=edge_types)
+
+    def csr(self) -> CSRGraph:
+        """Get a CSR snapshot of the graph (rebuilt after any mutation)"""
+        if self._csr is None:
+            node_ids = list(self.nodes)
+            iloc = {node_id: i for i, node_id in enumerate(node_ids)}
+            out_indptr, out_indices, out_types = _pack_csr(
+                [list(self.edges.get(node_id, {}).values()) for node_id in node_ids], iloc, "target_id"
+            )
+            in_indptr, in_indices, in_types = _pack_csr(
+                [list(self.reverse_edges.get(node_id, {}).values()) for node_id in node_ids], iloc, "source_id"
+            )
+            self._csr = CSRGraph(
+                node_ids=node_ids,
+                iloc=iloc,
+                out_indptr=out_indptr,
+                out_indices=out_indices,
+                out_types=out_types,
+                in_indptr=in_indptr,
+                in_indices=in_indices,
+                in_types=in_types,
+            )
+        return self._csr
+
+    def bulk_query_timeline(
+        self,
+        start_node_ids: List[str],
+        direction: str = "forward",
+        max_depth: int = 10,
+        edge_types: Optional[List[EdgeType]] = None
+    ) -> Dict[str, List[CanonNode]]:
+        """
+        Timeline traversal from many start nodes using vectorized frontier expansion
+
+        Follows the same edges as query_timeline (AFTER edges forward, BEFORE edges
+        backward). Nodes come back level by level; within a level they are in CSR
+        (insertion) order rather than edge order.
+
+        Returns:
+            Mapping of start node ID -> reachable nodes, start node first
+        """
+        graph = self.csr()
+        allowed = set(edge_types or [EdgeType.BEFORE, EdgeType.AFTER])
+        expansions = []
+        if direction in ("forward", "both") and EdgeType.AFTER in allowed:
+            expansions.append((graph.out_indptr, graph.out_indices, graph.out_types, EDGE_TYPE_CODES[EdgeType.AFTER.value]))
+        if direction in ("backward", "both") and EdgeType.BEFORE in allowed:
+            expansions.append((graph.in_indptr, graph.in_indices, graph.in_types, EDGE_TYPE_CODES[EdgeType.BEFORE.value]))
+
+        results: Dict[str, List[CanonNode]] = {}
+        for start_id in start_node_ids:
+            start = graph.iloc.get(start_id)
+            if start is None:
+                results[start_id] = []
+                continue
+
+            seen = np.zeros(len(graph.node_ids), dtype=bool)
+            seen[start] = True
+            order = [np.array([start], dtype=np.int64)]
+            frontier = order[0]
+            for _ in range(max_depth):
+                reached = [_expand(frontier, *expansion) for expansion in expansions]
+                if not reached:
+                    break
+                candidates = np.unique(np.concatenate(reached))
+                frontier = candidates[~seen[candidates]].astype(np.int64)
+                if frontier.size == 0:
+                    break
+                seen[frontier] = True
+                order.append(frontier)
+
+            results[start_id] = [self.nodes[graph.node_ids[i]] for i in np.concatenate(order)]
+        return results
+
     async def clear(self):
         """Clear all nodes and edges"""
-        self.nodes.clear()
-        self.edges.clear()
-        self.reverse_edges.clear()
-        self.edge_index.clear()
+        if self._read_only:
+            raise RuntimeError("Graph snapshots are read-only")
+        # Rebind rather than .clear() so outstanding snapshots keep their contents
+        self.nodes = {}
+        self.nodes_by_type = defaultdict(dict)
+        self.edges = defaultdict(dict)
+        self.reverse_edges = defaultdict(dict)
+        self.edge_index = {}
+        self._shared = False
+        self._csr = None
         logger.debug("Cleared graph store")
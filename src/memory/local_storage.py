@@ -1,25 +1,77 @@
 """Local file-based storage implementation"""
 
+import asyncio
 import json
+import mmap
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
 
+import orjson
+
+from .object_store import ObjectStore
 from .structured_state import StructuredState
 
+# orjson encodes datetime/enum natively; anything else goes through _json_default
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_default(obj: Any) -> str:
+    """Fallback encoder: only called for values the encoder can't handle itself"""
+    return str(obj)
+
+
+# Max threads used to read a table's files concurrently in query/list_all
+_MAX_READ_WORKERS = 16
+
+
+def _read_bytes(path: Path) -> Optional[bytes]:
+    """Read a file, returning None if it was deleted after being listed"""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _load_table(table_dir: Path) -> List[Dict[str, Any]]:
+    """Read and decode every record file in a table directory"""
+    paths = list(table_dir.glob("*.json"))
+    if len(paths) > 1:
+        # Overlap the per-file open/read syscalls; decoding stays on this thread
+        with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(paths))) as executor:
+            blobs = list(executor.map(_read_bytes, paths))
+    else:
+        blobs = [_read_bytes(p) for p in paths]
+    return [orjson.loads(b) for b in blobs if b is not None]
+
 
 class LocalFileState(StructuredState):
     """Local file-based implementation of structured state storage"""
 
-    def __init__(self, storage_dir: str = "./data"):
+    def __init__(self, storage_dir: str = "./data", pretty: bool = False, read_cache_size: int = 256):
         """
         Initialize local file storage
 
         Args:
             storage_dir: Directory to store data files
+            pretty: Indent JSON files (for debugging; compact by default)
+            read_cache_size: Max records kept in the read cache (0 disables it)
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self._dump_options = (_ORJSON_OPTIONS | orjson.OPT_INDENT_2) if pretty else _ORJSON_OPTIONS
+        self._lock = threading.Lock()
+
+        # LRU of raw record bytes: (table_name, key_value) -> (mtime_ns, size, data).
+        # Bytes rather than dicts so every hit decodes to a fresh, caller-owned dict.
+        self.read_cache_size = read_cache_size
+        self._read_cache: "OrderedDict[Tuple[str, str], Tuple[int, int, bytes]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def _get_table_dir(self, table_name: str) -> Path:
         """Get directory for a table"""
@@ -27,46 +79,115 @@ class LocalFileState(StructuredState):
         table_dir.mkdir(parents=True, exist_ok=True)
         return table_dir
 
+    def _get_key_value(self, key: Dict[str, Any]) -> str:
+        """Get the key value used as an item's filename"""
+        # Use the first key value as filename
+        return str(next(iter(key.values())))
+
     def _get_item_path(self, table_name: str, key: Dict[str, Any]) -> Path:
         """Get file path for an item"""
-        # Use the first key value as filename
-        key_value = list(key.values())[0]
-        return self._get_table_dir(table_name) / f"{key_value}.json"
-
-    def _serialize_datetime(self, obj: Any) -> Any:
-        """Recursively convert datetime objects to ISO strings"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: self._serialize_datetime(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._serialize_datetime(item) for item in obj]
-        return obj
+        return self._get_table_dir(table_name) / f"{self._get_key_value(key)}.json"
 
-    async def write(self, table_name: str, item: Dict[str, Any]) -> bool:
-        """Write an item to local storage"""
-        if "id" not in item:
-            raise ValueError("Item must have an 'id' field")
+    def _invalidate(self, table_name: str, key_value: Any):
+        """Drop an item from the read cache"""
+        with self._cache_lock:
+            self._read_cache.pop((table_name, str(key_value)), None)
 
-        file_path = self._get_table_dir(table_name) / f"{item['id']}.json"
+    def _dumps(self, item: Dict[str, Any]) -> bytes:
+        """Encode an item as JSON bytes"""
+        return orjson.dumps(item, default=_json_default, option=self._dump_options)
 
-        # Serialize datetime objects
-        serialized_item = self._serialize_datetime(item)
+    # Synchronous bodies, run via asyncio.to_thread so disk I/O doesn't block the event loop
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(serialized_item, f, indent=2, default=str)
+    def _sync_write(self, table_name: str, item: Dict[str, Any]) -> bool:
+        file_path = self._get_table_dir(table_name) / f"{item['id']}.json"
+        data = self._dumps(item)
+
+        with self._lock:
+            with open(file_path, "wb") as f:
+                f.write(data)
+            self._invalidate(table_name, item["id"])
 
         return True
 
-    async def read(self, table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Read an item from local storage"""
+    def _sync_read(self, table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         file_path = self._get_item_path(table_name, key)
 
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             return None
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # mtime/size guard against edits made outside this instance
+        cache_key = (table_name, self._get_key_value(key))
+        with self._cache_lock:
+            cached = self._read_cache.get(cache_key)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._read_cache.move_to_end(cache_key)
+                return orjson.loads(cached[2])
+
+        data = _read_bytes(file_path)
+        if data is None:
+            return None
+
+        if self.read_cache_size > 0:
+            with self._cache_lock:
+                self._read_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, data)
+                self._read_cache.move_to_end(cache_key)
+                while len(self._read_cache) > self.read_cache_size:
+                    self._read_cache.popitem(last=False)
+
+        return orjson.loads(data)
+
+    def _sync_query(self, table_name: str, key_condition: Dict[str, Any]) -> List[Dict[str, Any]]:
+        items = _load_table(self._get_table_dir(table_name))
+
+        # Check if item matches key condition
+        conditions = tuple(key_condition.items())
+        return [item for item in items if all(item.get(k) == v for k, v in conditions)]
+
+    def _sync_update(self, table_name: str, key: Dict[str, Any], updates: Dict[str, Any]) -> bool:
+        file_path = self._get_item_path(table_name, key)
+
+        # Read-modify-write must not interleave with another writer thread
+        with self._lock:
+            if not file_path.exists():
+                return False
+
+            with open(file_path, "rb") as f:
+                item = orjson.loads(f.read())
+
+            # Apply updates
+            item.update(updates)
+
+            with open(file_path, "wb") as f:
+                f.write(self._dumps(item))
+            self._invalidate(table_name, self._get_key_value(key))
+
+        return True
+
+    def _sync_delete(self, table_name: str, key: Dict[str, Any]) -> bool:
+        file_path = self._get_item_path(table_name, key)
+
+        with self._lock:
+            self._invalidate(table_name, self._get_key_value(key))
+            if file_path.exists():
+                file_path.unlink()
+                return True
+        return False
+
+    def _sync_list_all(self, table_name: str) -> List[Dict[str, Any]]:
+        return _load_table(self._get_table_dir(table_name))
+
+    async def write(self, table_name: str, item: Dict[str, Any]) -> bool:
+        """Write an item to local storage"""
+        if "id" not in item:
+            raise ValueError("Item must have an 'id' field")
+        return await asyncio.to_thread(self._sync_write, table_name, item)
+
+    async def read(self, table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Read an item from local storage"""
+        return await asyncio.to_thread(self._sync_read, table_name, key)
 
     async def query(
         self,
@@ -75,21 +196,7 @@ class LocalFileState(StructuredState):
         **kwargs
     ) -> List[Dict[str, Any]]:
         """Query items from local storage"""
-        table_dir = self._get_table_dir(table_name)
-        items = []
-
-        for file_path in table_dir.glob("*.json"):
-            with open(file_path, "r", encoding="utf-8") as f:
-                item = json.load(f)
-
-                # Check if item matches key condition
-                matches = all(
-                    item.get(k) == v for k, v in key_condition.items()
-                )
-                if matches:
-                    items.append(item)
-
-        return items
+        return await asyncio.to_thread(self._sync_query, table_name, key_condition)
 
     async def update(
         self,
@@ -98,46 +205,242 @@ class LocalFileState(StructuredState):
         updates: Dict[str, Any]
     ) -> bool:
         """Update an item in local storage"""
-        file_path = self._get_item_path(table_name, key)
+        return await asyncio.to_thread(self._sync_update, table_name, key, updates)
 
-        if not file_path.exists():
-            return False
+    async def delete(self, table_name: str, key: Dict[str, Any]) -> bool:
+        """Delete an item from local storage"""
+        return await asyncio.to_thread(self._sync_delete, table_name, key)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            item = json.load(f)
+    async def list_all(self, table_name: str) -> List[Dict[str, Any]]:
+        """List all items in a table"""
+        return await asyncio.to_thread(self._sync_list_all, table_name)
+
+
+class _LogTable:
+    """Append-only record log for one table plus its in-memory offset index"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.index: Dict[str, Tuple[int, int]] = {}  # key value -> (offset, length) of its live record
+        self.size = 0
+        self.dead_bytes = 0  # bytes held by overwritten records and tombstones
+        self._mm: Optional[mmap.mmap] = None
+        self._mm_size = 0
+        self.path.touch(exist_ok=True)
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Sequentially scan the log; later records for a key supersede earlier ones"""
+        self.index.clear()
+        self.dead_bytes = 0
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                length = len(line)
+                if not line.endswith(b"\n"):
+                    # Torn final append from a crash: drop it
+                    break
+                key, item = orjson.loads(line)
+                previous = self.index.pop(key, None)
+                if previous:
+                    self.dead_bytes += previous[1]
+                if item is None:
+                    self.dead_bytes += length
+                else:
+                    self.index[key] = (offset, length)
+                offset += length
+        if offset != self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        self.size = offset
+        self.close()
+
+    def _view(self) -> Optional[mmap.mmap]:
+        """Map the log for reading, remapping after appends"""
+        if self.size == 0:
+            return None
+        if self._mm is None or self._mm_size != self.size:
+            self.close()
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mm_size = self.size
+        return self._mm
+
+    def close(self):
+        """Release the read mapping"""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def append(self, key: str, record: bytes, live: bool):
+        """Append an encoded [key, item] line and point the index at it"""
+        with open(self.path, "ab") as f:
+            f.write(record)
+        previous = self.index.pop(key, None)
+        if previous:
+            self.dead_bytes += previous[1]
+        if live:
+            self.index[key] = (self.size, len(record))
+        else:
+            self.dead_bytes += len(record)
+        self.size += len(record)
 
-        # Apply updates
-        item.update(self._serialize_datetime(updates))
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Decode the live record for a key"""
+        slot = self.index.get(key)
+        if slot is None:
+            return None
+        offset, length = slot
+        return orjson.loads(self._view()[offset:offset + length])[1]
+
+    def scan(self) -> List[Dict[str, Any]]:
+        """Decode every live record in log order"""
+        mm = self._view()
+        if mm is None:
+            return []
+        slots = sorted(self.index.values())
+        return [orjson.loads(mm[offset:offset + length])[1] for offset, length in slots]
+
+    def compact(self):
+        """Rewrite the log with live records only"""
+        mm = self._view()
+        tmp_path = self.path.with_suffix(".log.tmp")
+        with open(tmp_path, "wb") as f:
+            if mm is not None:
+                for offset, length in sorted(self.index.values()):
+                    f.write(mm[offset:offset + length])
+        self.close()
+        os.replace(tmp_path, self.path)
+        self._rebuild_index()
+
+
+class LocalLogState(StructuredState):
+    """
+    Packed local storage: one append-only JSON-lines log per table.
+
+    Writes append a record and update an in-memory id -> (offset, length)
+    index; reads slice a memory-mapped view of the log, so query/list_all
+    are a single sequential pass over one file instead of a glob plus one
+    open per record. Deletes append tombstones and the log is compacted
+    once dead records outweigh live ones.
+    """
+
+    def __init__(self, storage_dir: str = "./data", compact_min_bytes: int = 1 << 20):
+        """
+        Initialize packed local storage
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(item, f, indent=2, default=str)
+        Args:
+            storage_dir: Directory to store table logs
+            compact_min_bytes: Dead bytes a table must accumulate before compaction
+        """
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_min_bytes = compact_min_bytes
+        self._tables: Dict[str, _LogTable] = {}
+        self._lock = threading.Lock()
+
+    def _get_table(self, table_name: str) -> _LogTable:
+        """Open (and index) a table's log on first use"""
+        table = self._tables.get(table_name)
+        if table is None:
+            table = _LogTable(self.storage_dir / f"{table_name}.log")
+            self._tables[table_name] = table
+        return table
+
+    def _append(self, table: _LogTable, key_value: str, item: Optional[Dict[str, Any]]):
+        """Append a record (None = tombstone) and compact if mostly dead"""
+        record = orjson.dumps([key_value, item], default=_json_default, option=_ORJSON_OPTIONS) + b"\n"
+        table.append(key_value, record, live=item is not None)
+        if table.dead_bytes > self.compact_min_bytes and table.dead_bytes > table.size - table.dead_bytes:
+            table.compact()
+
+    def _sync_write(self, table_name: str, item: Dict[str, Any]) -> bool:
+        with self._lock:
+            self._append(self._get_table(table_name), str(item["id"]), item)
+        return True
 
+    def _sync_read(self, table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._get_table(table_name).get(str(next(iter(key.values()))))
+
+    def _sync_query(self, table_name: str, key_condition: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = self._get_table(table_name).scan()
+        conditions = tuple(key_condition.items())
+        return [item for item in items if all(item.get(k) == v for k, v in conditions)]
+
+    def _sync_update(self, table_name: str, key: Dict[str, Any], updates: Dict[str, Any]) -> bool:
+        key_value = str(next(iter(key.values())))
+        with self._lock:
+            table = self._get_table(table_name)
+            item = table.get(key_value)
+            if item is None:
+                return False
+            item.update(updates)
+            self._append(table, key_value, item)
         return True
 
-    async def delete(self, table_name: str, key: Dict[str, Any]) -> bool:
-        """Delete an item from local storage"""
-        file_path = self._get_item_path(table_name, key)
+    def _sync_delete(self, table_name: str, key: Dict[str, Any]) -> bool:
+        key_value = str(next(iter(key.values())))
+        with self._lock:
+            table = self._get_table(table_name)
+            if key_value not in table.index:
+                return False
+            self._append(table, key_value, None)
+        return True
 
-        if file_path.exists():
-            file_path.unlink()
-            return True
-        return False
+    def _sync_list_all(self, table_name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._get_table(table_name).scan()
+
+    async def write(self, table_name: str, item: Dict[str, Any]) -> bool:
+        """Write an item to the table log"""
+        if "id" not in item:
+            raise ValueError("Item must have an 'id' field")
+        return await asyncio.to_thread(self._sync_write, table_name, item)
+
+    async def read(self, table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Read an item from the table log"""
+        return await asyncio.to_thread(self._sync_read, table_name, key)
+
+    async def query(
+        self,
+        table_name: str,
+        key_condition: Dict[str, Any],
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Query items from the table log"""
+        return await asyncio.to_thread(self._sync_query, table_name, key_condition)
+
+    async def update(
+        self,
+        table_name: str,
+        key: Dict[str, Any],
+        updates: Dict[str, Any]
+    ) -> bool:
+        """Update an item in the table log"""
+        return await asyncio.to_thread(self._sync_update, table_name, key, updates)
+
+    async def delete(self, table_name: str, key: Dict[str, Any]) -> bool:
+        """Delete an item from the table log"""
+        return await asyncio.to_thread(self._sync_delete, table_name, key)
 
     async def list_all(self, table_name: str) -> List[Dict[str, Any]]:
         """List all items in a table"""
-        table_dir = self._get_table_dir(table_name)
-        items = []
+        return await asyncio.to_thread(self._sync_list_all, table_name)
 
-        for file_path in table_dir.glob("*.json"):
-            with open(file_path, "r", encoding="utf-8") as f:
-                items.append(json.load(f))
+    def close(self):
+        """Release all table mappings"""
+        with self._lock:
+            for table in self._tables.values():
+                table.close()
 
-        return items
 
-
-class LocalObjectStore:
+class LocalObjectStore(ObjectStore):
     """Local file-based object storage (replacement for S3)"""
 
+    MANIFEST_NAME = ".manifest.db"
+
     def __init__(self, storage_dir: str = "./data/objects"):
         """
         Initialize local object storage
@@ -148,14 +451,36 @@ class LocalObjectStore:
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
-    async def upload(
-        self,
-        key: str,
-        content: bytes,
-        content_type: Optional[str] = None,
-        metadata: Optional[dict] = None
-    ) -> bool:
-        """Upload an object to local storage"""
+        # Key manifest so list() is a range query instead of a full directory walk.
+        # Objects written directly into storage_dir (bypassing upload) are not indexed;
+        # delete the manifest file to force a rebuild.
+        manifest_path = self.storage_dir / self.MANIFEST_NAME
+        rebuild = not manifest_path.exists()
+        self._manifest = sqlite3.connect(str(manifest_path), check_same_thread=False)
+        self._manifest_lock = threading.Lock()
+        with self._manifest_lock, self._manifest:
+            self._manifest.execute("CREATE TABLE IF NOT EXISTS objects (key TEXT PRIMARY KEY)")
+            if rebuild:
+                self._manifest.executemany(
+                    "INSERT OR IGNORE INTO objects (key) VALUES (?)",
+                    ((key,) for key in self._scan_keys())
+                )
+
+    def _scan_keys(self) -> List[str]:
+        """Walk storage_dir for object keys (used to rebuild the manifest)"""
+        return [
+            p.relative_to(self.storage_dir).as_posix()
+            for p in self.storage_dir.rglob("*")
+            if p.is_file()
+            and not p.name.endswith(".meta.json")
+            and not p.name.startswith(self.MANIFEST_NAME)
+        ]
+
+    def close(self):
+        """Close the manifest database"""
+        self._manifest.close()
+
+    def _sync_upload(self, key: str, content: bytes, metadata: Optional[dict]) -> bool:
         file_path = self.storage_dir / key
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -166,12 +491,14 @@ class LocalObjectStore:
         if metadata:
             meta_path = self.storage_dir / f"{key}.meta.json"
             with open(meta_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+                json.dump(metadata, f, indent=2, default=_json_default)
+
+        with self._manifest_lock, self._manifest:
+            self._manifest.execute("INSERT OR IGNORE INTO objects (key) VALUES (?)", (key,))
 
         return True
 
-    async def download(self, key: str) -> Optional[bytes]:
-        """Download an object from local storage"""
+    def _sync_download(self, key: str) -> Optional[bytes]:
         file_path = self.storage_dir / key
 
         if not file_path.exists():
@@ -180,8 +507,7 @@ class LocalObjectStore:
         with open(file_path, "rb") as f:
             return f.read()
 
-    async def delete(self, key: str) -> bool:
-        """Delete an object from local storage"""
+    def _sync_delete(self, key: str) -> bool:
         file_path = self.storage_dir / key
 
         if file_path.exists():
@@ -190,16 +516,57 @@ class LocalObjectStore:
             meta_path = self.storage_dir / f"{key}.meta.json"
             if meta_path.exists():
                 meta_path.unlink()
+            with self._manifest_lock, self._manifest:
+                self._manifest.execute("DELETE FROM objects WHERE key = ?", (key,))
             return True
         return False
 
+    def _sync_list(self, prefix: Optional[str]) -> list:
+        if prefix and (self.storage_dir / prefix).is_dir():
+            # Directory prefix: everything underneath it
+            prefix = prefix.rstrip("/") + "/"
+
+        with self._manifest_lock:
+            if prefix:
+                # Keys in [prefix, prefix with last char bumped) share the prefix
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                rows = self._manifest.execute(
+                    "SELECT key FROM objects WHERE key >= ? AND key < ? ORDER BY key",
+                    (prefix, upper)
+                ).fetchall()
+            else:
+                rows = self._manifest.execute("SELECT key FROM objects ORDER BY key").fetchall()
+        return [row[0] for row in rows]
+
+    async def upload(
+        self,
+        key: str,
+        content: bytes,
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None
+    ) -> bool:
+        """Upload an object to local storage"""
+        return await asyncio.to_thread(self._sync_upload, key, content, metadata)
+
+    async def download(self, key: str) -> Optional[bytes]:
+        """Download an object from local storage"""
+        return await asyncio.to_thread(self._sync_download, key)
+
+    async def download_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Download several objects with a single worker-thread hop"""
+        return await asyncio.to_thread(lambda: [self._sync_download(key) for key in keys])
+
+    async def download_many_text(self, keys: List[str]) -> List[Optional[str]]:
+        """Download several objects as text, decoding on the worker thread"""
+        def read_all():
+            contents = [self._sync_download(key) for key in keys]
+            return [None if c is None else c.decode("utf-8", errors="replace") for c in contents]
+        return await asyncio.to_thread(read_all)
+
+    async def delete(self, key: str) -> bool:
+        """Delete an object from local storage"""
+        return await asyncio.to_thread(self._sync_delete, key)
+
     async def list(self, prefix: Optional[str] = None) -> list:
         """List objects with optional prefix"""
-        if prefix:
-            search_path = self.storage_dir / prefix
-            if search_path.is_dir():
-                return [str(p.relative_to(self.storage_dir)) for p in search_path.rglob("*") if p.is_file() and not p.name.endswith(".meta.json")]
-            else:
-                return [str(p.relative_to(self.storage_dir)) for p in self.storage_dir.glob(f"{prefix}*") if p.is_file() and not p.name.endswith(".meta.json")]
-        else:
-            return [str(p.relative_to(self.storage_dir)) for p in self.storage_dir.rglob("*") if p.is_file() and not p.name.endswith(".meta.json")]
+        return await asyncio.to_thread(self._sync_list, prefix)
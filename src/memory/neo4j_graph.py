@@ -1,16 +1,24 @@
 """Neo4j implementation of GraphStore"""
 
 import logging
-from typing import List, Optional, Dict, Any, Set
+from typing import List, Optional, Dict, Any, Set, Tuple, AsyncIterator, Awaitable, Callable, Mapping
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-import json
+from functools import lru_cache
+import time
+
+import orjson
 
 try:
     from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncSession
+    from neo4j.exceptions import Neo4jError
 except ImportError:
     AsyncGraphDatabase = None
     AsyncDriver = None
     AsyncSession = None
+    Neo4jError = Exception
 
 from src.memory.graph_store import GraphStore
 from src.models.canon import (
@@ -24,6 +32,176 @@ from src.models.canon import (
 
 logger = logging.getLogger(__name__)
 
+# Every canon node carries the shared :Canon label next to its type label, so
+# id lookups that don't know the node type can still use one index
+SCHEMA_STATEMENTS = (
+    "CREATE CONSTRAINT canon_id IF NOT EXISTS FOR (n:Canon) REQUIRE n.id IS UNIQUE",
+    "CREATE INDEX canon_created_at IF NOT EXISTS FOR (n:Canon) ON (n.created_at)",
+)
+
+# Deleting in fixed-size transactions keeps clear() from holding the whole graph in one tx
+CLEAR_BATCH_SIZE = 10_000
+
+# Keys owned by the store; "properties" is where older versions kept a JSON blob
+RESERVED_KEYS = frozenset({"id", "type", "created_at", "updated_at", "version", "properties", "_json_keys"})
+_NATIVE_SCALARS = (str, bool, int, float)
+
+
+def _is_native(value: Any) -> bool:
+    """Whether Neo4j can store the value as-is (a scalar or homogeneous scalar list)"""
+    if value is None or isinstance(value, _NATIVE_SCALARS):
+        return True
+    if isinstance(value, list):
+        return len({type(v) for v in value}) <= 1 and all(isinstance(v, _NATIVE_SCALARS) for v in value)
+    return False
+
+
+def _to_neo4j_properties(properties: Dict[str, Any]) -> tuple:
+    """
+    Split properties into native Neo4j values
+
+    Returns (values, json_keys): values that Neo4j can't store natively (maps,
+    nested or mixed lists) are JSON-encoded and their keys listed in json_keys.
+    """
+    values = {}
+    json_keys = []
+    for key, value in properties.items():
+        if key in RESERVED_KEYS:
+            raise ValueError(f"Property name '{key}' is reserved")
+        if _is_native(value):
+            values[key] = value
+        else:
+            # Neo4j wants str, orjson returns bytes
+            values[key] = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+            json_keys.append(key)
+    return values, json_keys
+
+
+def _from_neo4j_properties(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Rebuild CanonNode/CanonEdge properties from a node or relationship's values"""
+    legacy = data.get("properties")
+    properties = orjson.loads(legacy) if isinstance(legacy, str) else {}
+    properties.update((k, v) for k, v in data.items() if k not in RESERVED_KEYS)
+    for key in data.get("_json_keys") or ():
+        if key in properties:
+            properties[key] = orjson.loads(properties[key])
+    return properties
+
+
+def _rel_type_names(edge_types) -> Tuple[str, ...]:
+    """Sorted relationship type names, so equal type sets map to one cached query string"""
+    return tuple(sorted({EdgeType(et).value.upper() for et in edge_types}))
+
+
+def _rel_pattern(edge_type_names: Tuple[str, ...]) -> str:
+    """Relationship type part of a pattern (types can't be query parameters)"""
+    return f":{'|'.join(edge_type_names)}" if edge_type_names else ""
+
+
+# Query strings below are built once per shape and reused, so repeat calls skip
+# the formatting and send Neo4j identical text (one plan cache entry per shape)
+
+@lru_cache(maxsize=256)
+def _timeline_cypher(direction: str, edge_type_names: Tuple[str, ...], max_depth: int) -> str:
+    """query_timeline traversal: forward follows outgoing edges, backward incoming"""
+    rel = f"[{_rel_pattern(edge_type_names)}*1..{max_depth}]"
+    if direction == "forward":
+        pattern = f"-{rel}->"
+    elif direction == "backward":
+        pattern = f"<-{rel}-"
+    else:  # both
+        pattern = f"-{rel}-"
+    return f"MATCH (start:Canon {{id: $start_id}}){pattern}(end) RETURN DISTINCT end LIMIT $limit"
+
+
+@lru_cache(maxsize=16)
+def _neighbors_cypher(direction: str, filter_types: bool) -> str:
+    """get_neighbors match; edge types are passed as $edge_types when filtering"""
+    if direction == "out":
+        cypher = "MATCH (n:Canon {id: $node_id})-[r]->(neighbor)"
+    elif direction == "in":
+        cypher = "MATCH (n:Canon {id: $node_id})<-[r]-(neighbor)"
+    else:  # both
+        cypher = "MATCH (n:Canon {id: $node_id})-[r]-(neighbor)"
+    if filter_types:
+        cypher += " WHERE type(r) IN $edge_types"
+    return cypher + " RETURN DISTINCT neighbor"
+
+
+@lru_cache(maxsize=256)
+def _related_cypher(edge_type_names: Tuple[str, ...], max_depth: int) -> str:
+    """get_related_entities traversal in either direction, excluding the start node"""
+    return (
+        f"MATCH (start:Canon {{id: $node_id}})-[{_rel_pattern(edge_type_names)}*1..{max_depth}]-(end) "
+        "WHERE start <> end RETURN DISTINCT end LIMIT $limit"
+    )
+
+
+@lru_cache(maxsize=64)
+def _cycle_cypher(edge_type_names: Tuple[str, ...], max_depth: int) -> str:
+    """Cycle check without APOC: pruning expansion to the reachable set, then a back edge"""
+    rel = _rel_pattern(edge_type_names)
+    return (
+        f"MATCH (start:Canon {{id: $start_id}})-[{rel}*0..{max_depth - 1}]->(m) "
+        f"WITH DISTINCT start, m MATCH (m)-[{rel}]->(start) RETURN true AS cycle LIMIT 1"
+    )
+
+
+async def _collect(nodes: AsyncIterator[CanonNode]) -> List[CanonNode]:
+    """Drain a node stream into a list"""
+    return [node async for node in nodes]
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy a traversal result so cached nodes can't be mutated by callers"""
+    if isinstance(result, list):
+        return [node.model_copy(deep=True) for node in result]
+    return result
+
+
+# Enum lookups for the row decoders: a dict hit instead of Enum.__call__; unknown
+# values come back as None and the row is skipped. Relationship types are stored upper-cased.
+_NODE_TYPE_BY_VALUE = {nt.value: nt for nt in NodeType}
+_EDGE_TYPE_BY_REL_TYPE = {et.value.upper(): et for et in EdgeType}
+
+# Timestamps repeat heavily across rows (bulk-written nodes share them) and
+# datetimes are immutable, so parsed values can be shared. Decoded JSON
+# properties are mutable and are deliberately not cached.
+_parse_datetime = lru_cache(maxsize=4096)(datetime.fromisoformat)
+
+
+def _node_from_record(node: Any) -> Optional[CanonNode]:
+    """Build a CanonNode straight from a driver Node (no intermediate dict copy); None for unknown types"""
+    node_type = _NODE_TYPE_BY_VALUE.get(node["type"])
+    if node_type is None:
+        logger.warning(f"Skipping node {node['id']} with unknown type {node['type']!r}")
+        return None
+    # Rows were validated on the way in, so skip re-validation. model_construct
+    # doesn't apply use_enum_values, hence storing the plain type string.
+    return CanonNode.model_construct(
+        id=node["id"],
+        type=node_type.value,
+        properties=_from_neo4j_properties(node),
+        created_at=_parse_datetime(node["created_at"]),
+        updated_at=_parse_datetime(node["updated_at"]),
+        version=node.get("version", 1)
+    )
+
+
+def _node_row(node: CanonNode) -> Dict[str, Any]:
+    """Flatten a node into the map stored on its Neo4j node"""
+    row, json_keys = _to_neo4j_properties(node.properties)
+    if json_keys:
+        row["_json_keys"] = json_keys
+    row.update(
+        id=node.id,
+        type=NodeType(node.type).value,
+        created_at=node.created_at.isoformat(),
+        updated_at=node.updated_at.isoformat(),
+        version=node.version
+    )
+    return row
+
 
 class Neo4jGraphStore(GraphStore):
     """Neo4j graph store implementation"""
@@ -33,7 +211,16 @@ class Neo4jGraphStore(GraphStore):
         uri: str = "bolt://localhost:7687",
         user: str = "neo4j",
         password: str = "password",
-        database: str = "neo4j"
+        database: str = "neo4j",
+        node_cache_size: int = 10_000,
+        traversal_cache_size: int = 1024,
+        traversal_cache_ttl: float = 30.0,
+        max_traversal_depth: int = 10,
+        max_traversal_results: int = 1000,
+        max_connection_pool_size: int = 100,
+        connection_acquisition_timeout: float = 60.0,
+        max_connection_lifetime: float = 3600,
+        fetch_size: int = 10_000
     ):
         """
         Initialize Neo4j driver
@@ -43,6 +230,19 @@ class Neo4jGraphStore(GraphStore):
             user: Neo4j username
             password: Neo4j password
             database: Database name (default: neo4j)
+            node_cache_size: Max nodes kept in the get_node LRU cache (0 disables it).
+                Disable when other processes write to the same database.
+            traversal_cache_size: Max memoized query_timeline/get_related_entities/
+                check_cycle results (0 disables memoization)
+            traversal_cache_ttl: Seconds a memoized traversal result stays valid
+            max_traversal_depth: Hard cap on hops for variable-length traversals;
+                path counts grow exponentially with depth on dense graphs
+            max_traversal_results: Max nodes returned by get_related_entities
+            max_connection_pool_size: Bolt connections kept open; size it to the
+                number of concurrent graph calls
+            connection_acquisition_timeout: Seconds to wait for a free connection
+            max_connection_lifetime: Seconds before a pooled connection is recycled
+            fetch_size: Records pulled per round trip while streaming results
         """
         if AsyncGraphDatabase is None:
             raise ImportError(
@@ -53,25 +253,152 @@ class Neo4jGraphStore(GraphStore):
         self.user = user
         self.password = password
         self.database = database
+        self.fetch_size = fetch_size
         self.driver: Optional[AsyncDriver] = AsyncGraphDatabase.driver(
-            uri, auth=(user, password)
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=max_connection_pool_size,
+            connection_acquisition_timeout=connection_acquisition_timeout,
+            max_connection_lifetime=max_connection_lifetime
         )
+        self._schema_ready = False
+        self.node_cache_size = node_cache_size
+        self._node_cache: OrderedDict[str, CanonNode] = OrderedDict()
+        self.traversal_cache_size = traversal_cache_size
+        self.traversal_cache_ttl = traversal_cache_ttl
+        # key -> (expires_at, result); _generation is bumped on every graph write
+        self._traversal_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._generation = 0
+        self.max_traversal_depth = max_traversal_depth
+        self.max_traversal_results = max_traversal_results
+        self._apoc_available: Optional[bool] = None
+        # Session or transaction bound by bulk()/transaction() for the current task
+        self._bound: ContextVar = ContextVar(f"neo4j_bound_{id(self)}", default=None)
 
     async def close(self):
         """Close the Neo4j driver connection"""
         if self.driver:
             await self.driver.close()
 
+    async def ensure_schema(self):
+        """Create the id constraint and timeline index (idempotent)"""
+        async with self.driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            # Label nodes written before the :Canon label existed
+            await session.run(
+                "MATCH (n) WHERE n.id IS NOT NULL AND n.type IS NOT NULL AND NOT n:Canon SET n:Canon"
+            )
+            for statement in SCHEMA_STATEMENTS:
+                await session.run(statement)
+        self._schema_ready = True
+
+    async def _ensure_schema_once(self):
+        """Run ensure_schema before the first query; failures only cost speed"""
+        if self._schema_ready:
+            return
+        try:
+            await self.ensure_schema()
+        except Exception as e:
+            logger.warning(f"Failed to create Neo4j schema, queries will scan: {e}")
+            self._schema_ready = True
+
+    def _cache_node(self, node: CanonNode):
+        """Remember a node for get_node, evicting the least recently used"""
+        if self.node_cache_size <= 0:
+            return
+        self._node_cache[node.id] = node
+        self._node_cache.move_to_end(node.id)
+        if len(self._node_cache) > self.node_cache_size:
+            self._node_cache.popitem(last=False)
+
+    def _invalidate_traversals(self):
+        """Forget memoized traversals after a write"""
+        self._generation += 1
+        self._traversal_cache.clear()
+
+    async def _memoized(self, key: tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a memoized traversal result, computing and storing it on a miss"""
+        entry = self._traversal_cache.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._traversal_cache.move_to_end(key)
+                return _copy_result(result)
+            del self._traversal_cache[key]
+
+        generation = self._generation
+        result = await compute()
+        # Skip storing if a write landed while the query was running
+        if self.traversal_cache_size > 0 and generation == self._generation:
+            self._traversal_cache[key] = (time.monotonic() + self.traversal_cache_ttl, _copy_result(result))
+            if len(self._traversal_cache) > self.traversal_cache_size:
+                self._traversal_cache.popitem(last=False)
+        return result
+
     async def _get_session(self) -> AsyncSession:
         """Get an async session"""
-        return self.driver.session(database=self.database)
+        return self.driver.session(database=self.database, fetch_size=self.fetch_size)
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[Any]:
+        """Yield the bound session/transaction, or a fresh session closed on exit"""
+        bound = self._bound.get()
+        if bound is not None:
+            yield bound
+            return
+        await self._ensure_schema_once()
+        async with self.driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            yield session
+
+    @asynccontextmanager
+    async def bulk(self) -> AsyncIterator["Neo4jGraphStore"]:
+        """
+        Reuse one session for every call made inside the block
+
+        Calls still auto-commit individually; only the session (and its
+        pooled connection) is shared. Don't run calls concurrently inside
+        the block - a session is not safe for concurrent use.
+        """
+        if self._bound.get() is not None:
+            yield self
+            return
+        await self._ensure_schema_once()
+        async with self.driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            token = self._bound.set(session)
+            try:
+                yield self
+            finally:
+                self._bound.reset(token)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["Neo4jGraphStore"]:
+        """
+        Run every call made inside the block in one explicit transaction
+
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        if self._bound.get() is not None:
+            yield self
+            return
+        await self._ensure_schema_once()
+        async with self.driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            async with await session.begin_transaction() as tx:
+                token = self._bound.set(tx)
+                try:
+                    yield self
+                except BaseException:
+                    # Writes made in the block are rolled back; so must the caches be
+                    self._node_cache.clear()
+                    self._invalidate_traversals()
+                    raise
+                finally:
+                    self._bound.reset(token)
 
     async def create_node(self, node: CanonNode) -> CanonNode:
         """Create a new node"""
-        async with self.driver.session(database=self.database) as session:
+        async with self._session() as session:
             # Check if node already exists
             result = await session.run(
-                "MATCH (n {id: $id}) RETURN n",
+                "MATCH (n:Canon {id: $id}) RETURN n",
                 id=node.id
             )
             existing = await result.single()
@@ -79,85 +406,101 @@ class Neo4jGraphStore(GraphStore):
                 raise ValueError(f"Node {node.id} already exists")
 
             # Create node with label based on type
-            label = node.type.value.upper()
-            query = f"""
-            CREATE (n:{label} {{
-                id: $id,
-                type: $type,
-                properties: $properties,
-                created_at: $created_at,
-                updated_at: $updated_at,
-                version: $version
-            }})
-            RETURN n
-            """
-            result = await session.run(
-                query,
-                id=node.id,
-                type=node.type.value,
-                properties=json.dumps(node.properties),
-                created_at=node.created_at.isoformat(),
-                updated_at=node.updated_at.isoformat(),
-                version=node.version
-            )
+            label = NodeType(node.type).value.upper()
+            await session.run(f"CREATE (n:{label}:Canon) SET n = $row", row=_node_row(node))
             # Transactions in Neo4j Python driver commit automatically at context exit
             logger.debug(f"Created node {node.id} of type {node.type}")
             return node
 
     async def get_node(self, node_id: str) -> Optional[CanonNode]:
         """Get a node by ID"""
-        async with self.driver.session(database=self.database) as session:
+        cached = self._node_cache.get(node_id)
+        if cached is not None:
+            self._node_cache.move_to_end(node_id)
+            # Callers may mutate properties, so hand out a copy
+            return cached.model_copy(deep=True)
+
+        async with self._session() as session:
             result = await session.run(
-                "MATCH (n {id: $id}) RETURN n",
+                "MATCH (n:Canon {id: $id}) RETURN n",
                 id=node_id
             )
             record = await result.single()
             if not record:
                 return None
 
-            node_data = dict(record["n"])
-            return CanonNode(
-                id=node_data["id"],
-                type=NodeType(node_data["type"]),
-                properties=json.loads(node_data.get("properties", "{}")),
-                created_at=datetime.fromisoformat(node_data["created_at"]),
-                updated_at=datetime.fromisoformat(node_data["updated_at"]),
-                version=node_data.get("version", 1)
+            node = _node_from_record(record["n"])
+        if node is None:
+            return None
+        self._cache_node(node.model_copy(deep=True))
+        return node
+
+    async def get_nodes(self, node_ids: List[str]) -> Dict[str, CanonNode]:
+        """Get several nodes by ID with one UNWIND query for the cache misses"""
+        nodes: Dict[str, CanonNode] = {}
+        missing = []
+        for node_id in dict.fromkeys(node_ids):
+            cached = self._node_cache.get(node_id)
+            if cached is not None:
+                nodes[node_id] = cached.model_copy(deep=True)
+            else:
+                missing.append(node_id)
+        if not missing:
+            return nodes
+
+        async with self._session() as session:
+            result = await session.run(
+                "UNWIND $ids AS id MATCH (n:Canon {id: id}) RETURN n",
+                ids=missing
             )
+            async for record in result:
+                node = _node_from_record(record["n"])
+                if node is None:
+                    continue
+                nodes[node.id] = node
+                self._cache_node(node.model_copy(deep=True))
+        return nodes
 
     async def update_node(self, node_id: str, **properties) -> Optional[CanonNode]:
-        """Update node properties"""
-        node = await self.get_node(node_id)
-        if not node:
-            return None
+        """Update node properties (merge, bump version) in a single round trip"""
+        values, json_keys = _to_neo4j_properties(properties)
 
-        # Update properties
-        node.properties.update(properties)
-        node.updated_at = datetime.utcnow()
-        node.version += 1
-
-        async with self.driver.session(database=self.database) as session:
+        self._node_cache.pop(node_id, None)
+        self._invalidate_traversals()
+        async with self._session() as session:
             query = """
-            MATCH (n {id: $id})
-            SET n.properties = $properties,
+            MATCH (n:Canon {id: $id})
+            SET n += $values,
+                n._json_keys = [k IN coalesce(n._json_keys, []) WHERE NOT k IN $keys] + $json_keys,
                 n.updated_at = $updated_at,
-                n.version = $version
+                n.version = coalesce(n.version, 1) + 1
             RETURN n
             """
-            await session.run(
+            result = await session.run(
                 query,
                 id=node_id,
-                properties=json.dumps(node.properties),
-                updated_at=node.updated_at.isoformat(),
-                version=node.version
+                values=values,
+                keys=list(values),
+                json_keys=json_keys,
+                updated_at=datetime.utcnow().isoformat()
             )
-            return node
+            record = await result.single()
+            if not record:
+                return None
+
+            node = _node_from_record(record["n"])
+        if node is None:
+            return None
+        self._cache_node(node.model_copy(deep=True))
+        return node
 
     async def delete_node(self, node_id: str) -> bool:
         """Delete a node and all its edges"""
-        async with self.driver.session(database=self.database) as session:
+        self._node_cache.pop(node_id, None)
+        self._invalidate_traversals()
+        async with self._session() as session:
             result = await session.run(
-                "MATCH (n {id: $id}) DETACH DELETE n RETURN count(n) as deleted",
+                "MATCH (n:Canon {id: $id}) DETACH DELETE n RETURN count(n) as deleted",
                 id=node_id
             )
             record = await result.single()
@@ -167,64 +510,157 @@ class Neo4jGraphStore(GraphStore):
             return deleted > 0
 
     async def create_edge(self, edge: CanonEdge) -> CanonEdge:
-        """Create a new edge"""
-        # Validate nodes exist
-        source = await self.get_node(edge.source_id)
-        target = await self.get_node(edge.target_id)
-        if not source:
+        """Create a new edge (or update the properties of an existing one)"""
+        edge_type = EdgeType(edge.type).value.upper()
+        # Endpoint validation and the upsert run as one statement; FOREACH only
+        # writes when both endpoints matched
+        query = f"""
+        OPTIONAL MATCH (a:Canon {{id: $source_id}})
+        OPTIONAL MATCH (b:Canon {{id: $target_id}})
+        FOREACH (_ IN CASE WHEN a IS NOT NULL AND b IS NOT NULL THEN [1] ELSE [] END |
+            MERGE (a)-[r:{edge_type}]->(b)
+            ON CREATE SET r.created_at = $created_at
+            SET r += $values,
+                r._json_keys = [k IN coalesce(r._json_keys, []) WHERE NOT k IN $keys] + $json_keys
+        )
+        RETURN a IS NOT NULL AS source_exists, b IS NOT NULL AS target_exists
+        """
+        values, json_keys = _to_neo4j_properties(edge.properties)
+        self._invalidate_traversals()
+        async with self._session() as session:
+            result = await session.run(
+                query,
+                source_id=edge.source_id,
+                target_id=edge.target_id,
+                values=values,
+                keys=list(values),
+                json_keys=json_keys,
+                created_at=edge.created_at.isoformat()
+            )
+            record = await result.single()
+
+        if not record or not record["source_exists"]:
             raise ValueError(f"Source node {edge.source_id} does not exist")
-        if not target:
+        if not record["target_exists"]:
             raise ValueError(f"Target node {edge.target_id} does not exist")
 
-        async with self.driver.session(database=self.database) as session:
-            # Check if edge already exists
+        logger.debug(f"Created edge {edge.type} from {edge.source_id} to {edge.target_id}")
+        return edge
+
+    async def create_nodes_batch(self, nodes: List[CanonNode]) -> List[CanonNode]:
+        """Create many nodes with one existence check and one UNWIND per label"""
+        if not nodes:
+            return []
+
+        rows_by_label: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for node in nodes:
+            row = _node_row(node)
+            rows_by_label[row["type"].upper()].append(row)
+
+        async with self._session() as session:
+            result = await session.run(
+                "UNWIND $ids AS id MATCH (n:Canon {id: id}) RETURN collect(n.id) AS existing",
+                ids=[node.id for node in nodes]
+            )
+            record = await result.single()
+            existing = record["existing"] if record else []
+            if existing:
+                raise ValueError(f"Nodes already exist: {', '.join(existing)}")
+
+            for label, rows in rows_by_label.items():
+                # Labels come from the NodeType enum, so interpolating them is safe
+                await session.run(f"UNWIND $rows AS row CREATE (n:{label}:Canon) SET n = row", rows=rows)
+
+        logger.debug(f"Created {len(nodes)} nodes in {len(rows_by_label)} batches")
+        return nodes
+
+    async def update_nodes(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, CanonNode]:
+        """Update many nodes (merge, bump version) with one UNWIND; missing nodes are left out"""
+        if not updates:
+            return {}
+
+        rows = []
+        for node_id, properties in updates.items():
+            values, json_keys = _to_neo4j_properties(properties)
+            rows.append({"id": node_id, "values": values, "keys": list(values), "json_keys": json_keys})
+            self._node_cache.pop(node_id, None)
+        self._invalidate_traversals()
+
+        nodes: Dict[str, CanonNode] = {}
+        async with self._session() as session:
             result = await session.run(
                 """
-                MATCH (a {id: $source_id})-[r]->(b {id: $target_id})
-                WHERE type(r) = $edge_type
-                RETURN r
+                UNWIND $rows AS row
+                MATCH (n:Canon {id: row.id})
+                SET n += row.values,
+                    n._json_keys = [k IN coalesce(n._json_keys, []) WHERE NOT k IN row.keys] + row.json_keys,
+                    n.updated_at = $updated_at,
+                    n.version = coalesce(n.version, 1) + 1
+                RETURN n
                 """,
-                source_id=edge.source_id,
-                target_id=edge.target_id,
-                edge_type=edge.type.value.upper()
+                rows=rows,
+                updated_at=datetime.utcnow().isoformat()
             )
-            existing = await result.single()
-            if existing:
-                # Update existing edge
+            async for record in result:
+                node = _node_from_record(record["n"])
+                if node is None:
+                    continue
+                nodes[node.id] = node
+                self._cache_node(node.model_copy(deep=True))
+        return nodes
+
+    async def create_edges_batch(self, edges: List[CanonEdge]) -> List[CanonEdge]:
+        """Create or update many edges with one endpoint check and one UNWIND per type"""
+        if not edges:
+            return []
+
+        rows_by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        endpoint_ids: Set[str] = set()
+        for edge in edges:
+            values, json_keys = _to_neo4j_properties(edge.properties)
+            rows_by_type[EdgeType(edge.type).value.upper()].append({
+                "source_id": edge.source_id,
+                "target_id": edge.target_id,
+                "values": values,
+                "keys": list(values),
+                "json_keys": json_keys,
+                "created_at": edge.created_at.isoformat()
+            })
+            endpoint_ids.add(edge.source_id)
+            endpoint_ids.add(edge.target_id)
+
+        self._invalidate_traversals()
+        async with self._session() as session:
+            result = await session.run(
+                """
+                UNWIND $ids AS id
+                OPTIONAL MATCH (n:Canon {id: id})
+                WITH id, n WHERE n IS NULL
+                RETURN collect(id) AS missing
+                """,
+                ids=list(endpoint_ids)
+            )
+            record = await result.single()
+            missing = record["missing"] if record else []
+            if missing:
+                raise ValueError(f"Edge endpoints do not exist: {', '.join(sorted(missing))}")
+
+            for edge_type, rows in rows_by_type.items():
+                # Relationship types come from the EdgeType enum, so interpolating them is safe
                 await session.run(
-                    """
-                    MATCH (a {id: $source_id})-[r]->(b {id: $target_id})
-                    WHERE type(r) = $edge_type
-                    SET r.properties = $properties
+                    f"""
+                    UNWIND $rows AS row
+                    MATCH (a:Canon {{id: row.source_id}}), (b:Canon {{id: row.target_id}})
+                    MERGE (a)-[r:{edge_type}]->(b)
+                    ON CREATE SET r.created_at = row.created_at
+                    SET r += row.values,
+                        r._json_keys = [k IN coalesce(r._json_keys, []) WHERE NOT k IN row.keys] + row.json_keys
                     """,
-                    source_id=edge.source_id,
-                    target_id=edge.target_id,
-                    edge_type=edge.type.value.upper(),
-                    properties=json.dumps(edge.properties)
+                    rows=rows
                 )
-                await session.commit()
-                return edge
-
-            # Create new edge
-            edge_type = edge.type.value.upper()
-            query = f"""
-            MATCH (a {{id: $source_id}}), (b {{id: $target_id}})
-            CREATE (a)-[r:{edge_type} {{
-                properties: $properties,
-                created_at: $created_at
-            }}]->(b)
-            RETURN r
-            """
-            await session.run(
-                query,
-                source_id=edge.source_id,
-                target_id=edge.target_id,
-                properties=json.dumps(edge.properties),
-                created_at=edge.created_at.isoformat()
-            )
-            await session.commit()
-            logger.debug(f"Created edge {edge.type} from {edge.source_id} to {edge.target_id}")
-            return edge
+
+        logger.debug(f"Created {len(edges)} edges in {len(rows_by_type)} batches")
+        return edges
 
     async def get_edges(
         self,
@@ -233,51 +669,51 @@ class Neo4jGraphStore(GraphStore):
         edge_type: Optional[EdgeType] = None
     ) -> List[CanonEdge]:
         """Get edges matching criteria"""
-        async with self.driver.session(database=self.database) as session:
+        async with self._session() as session:
             if source_id and target_id:
                 query = """
-                MATCH (a {id: $source_id})-[r]->(b {id: $target_id})
+                MATCH (a:Canon {id: $source_id})-[r]->(b:Canon {id: $target_id})
                 """
                 params = {"source_id": source_id, "target_id": target_id}
             elif source_id:
-                query = "MATCH (a {id: $source_id})-[r]->(b)"
+                query = "MATCH (a:Canon {id: $source_id})-[r]->(b)"
                 params = {"source_id": source_id}
             elif target_id:
-                query = "MATCH (a)-[r]->(b {id: $target_id})"
+                query = "MATCH (a)-[r]->(b:Canon {id: $target_id})"
                 params = {"target_id": target_id}
             else:
                 query = "MATCH (a)-[r]->(b)"
                 params = {}
 
             if edge_type:
-                query += f" WHERE type(r) = '{edge_type.value.upper()}'"
+                query += " WHERE type(r) = $edge_type"
+                params["edge_type"] = EdgeType(edge_type).value.upper()
 
-            query += " RETURN a.id as source_id, b.id as target_id, type(r) as edge_type, r.properties as properties, r.created_at as created_at"
+            query += " RETURN a.id as source_id, b.id as target_id, type(r) as edge_type, properties(r) as properties, r.created_at as created_at"
 
             result = await session.run(query, **params)
             edges = []
             async for record in result:
-                edge_type_str = record["edge_type"].lower()
-                try:
-                    edge_type_enum = EdgeType(edge_type_str)
-                except ValueError:
+                edge_type_enum = _EDGE_TYPE_BY_REL_TYPE.get(record["edge_type"])
+                if edge_type_enum is None:
                     continue  # Skip unknown edge types
 
-                edges.append(CanonEdge(
+                edges.append(CanonEdge.model_construct(
                     source_id=record["source_id"],
                     target_id=record["target_id"],
-                    type=edge_type_enum,
-                    properties=json.loads(record["properties"] or "{}"),
-                    created_at=datetime.fromisoformat(record["created_at"]) if record["created_at"] else datetime.utcnow()
+                    type=edge_type_enum.value,
+                    properties=_from_neo4j_properties(record["properties"]),
+                    created_at=_parse_datetime(record["created_at"]) if record["created_at"] else datetime.utcnow()
                 ))
             return edges
 
     async def delete_edge(self, source_id: str, target_id: str, edge_type: EdgeType) -> bool:
         """Delete an edge"""
-        async with self.driver.session(database=self.database) as session:
+        self._invalidate_traversals()
+        async with self._session() as session:
             result = await session.run(
                 """
-                MATCH (a {id: $source_id})-[r]->(b {id: $target_id})
+                MATCH (a:Canon {id: $source_id})-[r]->(b:Canon {id: $target_id})
                 WHERE type(r) = $edge_type
                 DELETE r
                 RETURN count(r) as deleted
@@ -292,104 +728,84 @@ class Neo4jGraphStore(GraphStore):
                 logger.debug(f"Deleted edge {edge_type} from {source_id} to {target_id}")
             return deleted > 0
 
-    async def query_nodes(self, query: CanonQuery) -> List[CanonNode]:
-        """Query nodes with filters"""
-        async with self.driver.session(database=self.database) as session:
-            cypher = "MATCH (n)"
-            params = {}
-            conditions = []
-
-            if query.node_id:
-                conditions.append("n.id = $node_id")
-                params["node_id"] = query.node_id
-
-            if query.node_type:
-                label = query.node_type.value.upper()
-                cypher = f"MATCH (n:{label})"
-
-            if query.properties_filter:
-                for key, value in query.properties_filter.items():
-                    # Properties are stored as JSON string, so we need to parse
-                    # This is a simplified approach - in production, you might want to index properties
-                    conditions.append(f"n.properties CONTAINS $prop_{key}")
-                    params[f"prop_{key}"] = json.dumps({key: value})
-
-            if conditions:
-                cypher += " WHERE " + " AND ".join(conditions)
-
-            cypher += f" RETURN n LIMIT {query.limit}"
-
+    async def _stream_nodes(self, cypher: str, params: Dict[str, Any], kind: str) -> AsyncIterator[CanonNode]:
+        """Run a query returning one node per row and yield nodes as records arrive"""
+        async with self._session() as session:
             result = await session.run(cypher, **params)
-            nodes = []
             async for record in result:
-                node_data = dict(record["n"])
                 try:
-                    node = CanonNode(
-                        id=node_data["id"],
-                        type=NodeType(node_data["type"]),
-                        properties=json.loads(node_data.get("properties", "{}")),
-                        created_at=datetime.fromisoformat(node_data["created_at"]),
-                        updated_at=datetime.fromisoformat(node_data["updated_at"]),
-                        version=node_data.get("version", 1)
-                    )
-                    nodes.append(node)
+                    node = _node_from_record(record[0])
                 except Exception as e:
-                    logger.warning(f"Failed to parse node: {e}")
+                    logger.warning(f"Failed to parse {kind}: {e}")
                     continue
-            return nodes
+                if node is not None:
+                    yield node
+
+    def iter_query_nodes(self, query: CanonQuery) -> AsyncIterator[CanonNode]:
+        """Stream query_nodes results without materializing a list"""
+        cypher = "MATCH (n:Canon)"
+        params = {}
+        conditions = []
+
+        if query.node_id:
+            conditions.append("n.id = $node_id")
+            params["node_id"] = query.node_id
+
+        if query.node_type:
+            label = query.node_type.value.upper()
+            cypher = f"MATCH (n:{label}:Canon)"
+
+        if query.properties_filter:
+            # Compare against the stored representation so property indexes can be used
+            values, _ = _to_neo4j_properties(query.properties_filter)
+            for i, (key, value) in enumerate(values.items()):
+                escaped = key.replace("`", "``")
+                conditions.append(f"n.`{escaped}` = $prop_{i}")
+                params[f"prop_{i}"] = value
+
+        if conditions:
+            cypher += " WHERE " + " AND ".join(conditions)
+
+        cypher += " RETURN n LIMIT $limit"
+        params["limit"] = query.limit
+        return self._stream_nodes(cypher, params, "node")
+
+    async def query_nodes(self, query: CanonQuery) -> List[CanonNode]:
+        """Query nodes with filters"""
+        return [node async for node in self.iter_query_nodes(query)]
+
+    def iter_query_timeline(self, query: TimelineQuery) -> AsyncIterator[CanonNode]:
+        """Stream query_timeline results (not memoized)"""
+        edge_types = query.edge_types or [EdgeType.BEFORE, EdgeType.AFTER]
+        cypher = _timeline_cypher(
+            query.direction,
+            _rel_type_names(edge_types),
+            min(query.max_depth, self.max_traversal_depth)
+        )
+        params = {"start_id": query.start_node_id, "limit": query.limit}
+        return self._stream_nodes(cypher, params, "timeline node")
 
     async def query_timeline(self, query: TimelineQuery) -> List[CanonNode]:
         """Query timeline (before/after traversal)"""
         edge_types = query.edge_types or [EdgeType.BEFORE, EdgeType.AFTER]
-        edge_type_names = [et.value.upper() for et in edge_types]
-
-        async with self.driver.session(database=self.database) as session:
-            # Build Cypher query for traversal
-            if query.direction == "forward":
-                # Follow AFTER edges forward
-                cypher = f"""
-                MATCH path = (start {{id: $start_id}})-[:{'|:'.join(edge_type_names)}*1..{query.max_depth}]->(end)
-                WHERE ALL(r in relationships(path) WHERE type(r) IN {edge_type_names})
-                RETURN DISTINCT end
-                """
-            elif query.direction == "backward":
-                # Follow BEFORE edges backward
-                cypher = f"""
-                MATCH path = (start {{id: $start_id}})<-[:{'|:'.join(edge_type_names)}*1..{query.max_depth}]-(end)
-                WHERE ALL(r in relationships(path) WHERE type(r) IN {edge_type_names})
-                RETURN DISTINCT end
-                """
-            else:  # both
-                cypher = f"""
-                MATCH path = (start {{id: $start_id}})-[:{'|:'.join(edge_type_names)}*1..{query.max_depth}]-(end)
-                WHERE ALL(r in relationships(path) WHERE type(r) IN {edge_type_names})
-                RETURN DISTINCT end
-                """
-
-            result = await session.run(cypher, start_id=query.start_node_id)
-            nodes = []
-            visited = set()
-            async for record in result:
-                node_data = dict(record["end"])
-                node_id = node_data["id"]
-                if node_id in visited:
-                    continue
-                visited.add(node_id)
+        key = (
+            "timeline", query.start_node_id, query.direction, query.max_depth, query.limit,
+            tuple(sorted(EdgeType(et).value for et in edge_types))
+        )
+        return await self._memoized(key, lambda: _collect(self.iter_query_timeline(query)))
 
-                try:
-                    node = CanonNode(
-                        id=node_data["id"],
-                        type=NodeType(node_data["type"]),
-                        properties=json.loads(node_data.get("properties", "{}")),
-                        created_at=datetime.fromisoformat(node_data["created_at"]),
-                        updated_at=datetime.fromisoformat(node_data["updated_at"]),
-                        version=node_data.get("version", 1)
-                    )
-                    nodes.append(node)
-                except Exception as e:
-                    logger.warning(f"Failed to parse timeline node: {e}")
-                    continue
-            return nodes
+    def iter_neighbors(
+        self,
+        node_id: str,
+        edge_types: Optional[List[EdgeType]] = None,
+        direction: str = "both"
+    ) -> AsyncIterator[CanonNode]:
+        """Stream get_neighbors results without materializing a list"""
+        cypher = _neighbors_cypher(direction, bool(edge_types))
+        params = {"node_id": node_id}
+        if edge_types:
+            params["edge_types"] = list(_rel_type_names(edge_types))
+        return self._stream_nodes(cypher, params, "neighbor node")
 
     async def get_neighbors(
         self,
@@ -398,38 +814,18 @@ class Neo4jGraphStore(GraphStore):
         direction: str = "both"
     ) -> List[CanonNode]:
         """Get neighboring nodes"""
-        async with self.driver.session(database=self.database) as session:
-            if direction == "out":
-                cypher = "MATCH (n {id: $node_id})-[r]->(neighbor)"
-            elif direction == "in":
-                cypher = "MATCH (n {id: $node_id})<-[r]-(neighbor)"
-            else:  # both
-                cypher = "MATCH (n {id: $node_id})-[r]-(neighbor)"
-
-            if edge_types:
-                edge_type_names = [et.value.upper() for et in edge_types]
-                cypher += f" WHERE type(r) IN {edge_type_names}"
-
-            cypher += " RETURN DISTINCT neighbor"
-
-            result = await session.run(cypher, node_id=node_id)
-            nodes = []
-            async for record in result:
-                node_data = dict(record["neighbor"])
-                try:
-                    node = CanonNode(
-                        id=node_data["id"],
-                        type=NodeType(node_data["type"]),
-                        properties=json.loads(node_data.get("properties", "{}")),
-                        created_at=datetime.fromisoformat(node_data["created_at"]),
-                        updated_at=datetime.fromisoformat(node_data["updated_at"]),
-                        version=node_data.get("version", 1)
-                    )
-                    nodes.append(node)
-                except Exception as e:
-                    logger.warning(f"Failed to parse neighbor node: {e}")
-                    continue
-            return nodes
+        return [node async for node in self.iter_neighbors(node_id, edge_types, direction)]
+
+    def iter_related_entities(
+        self,
+        node_id: str,
+        max_depth: int = 2,
+        edge_types: Optional[List[EdgeType]] = None
+    ) -> AsyncIterator[CanonNode]:
+        """Stream get_related_entities results (not memoized)"""
+        cypher = _related_cypher(_rel_type_names(edge_types or ()), min(max_depth, self.max_traversal_depth))
+        params = {"node_id": node_id, "limit": self.max_traversal_results}
+        return self._stream_nodes(cypher, params, "related node")
 
     async def get_related_entities(
         self,
@@ -438,69 +834,84 @@ class Neo4jGraphStore(GraphStore):
         edge_types: Optional[List[EdgeType]] = None
     ) -> List[CanonNode]:
         """Get related entities within max_depth hops"""
-        async with self.driver.session(database=self.database) as session:
-            if edge_types:
-                edge_type_names = [et.value.upper() for et in edge_types]
-                cypher = f"""
-                MATCH path = (start {{id: $node_id}})-[:{'|:'.join(edge_type_names)}*1..{max_depth}]-(end)
-                WHERE ALL(r in relationships(path) WHERE type(r) IN {edge_type_names})
-                AND start <> end
-                RETURN DISTINCT end
-                """
-            else:
-                cypher = f"""
-                MATCH path = (start {{id: $node_id}})-[*1..{max_depth}]-(end)
-                WHERE start <> end
-                RETURN DISTINCT end
-                """
-
-            result = await session.run(cypher, node_id=node_id)
-            nodes = []
-            visited = set()
-            async for record in result:
-                node_data = dict(record["end"])
-                node_id_found = node_data["id"]
-                if node_id_found in visited:
-                    continue
-                visited.add(node_id_found)
-
-                try:
-                    node = CanonNode(
-                        id=node_data["id"],
-                        type=NodeType(node_data["type"]),
-                        properties=json.loads(node_data.get("properties", "{}")),
-                        created_at=datetime.fromisoformat(node_data["created_at"]),
-                        updated_at=datetime.fromisoformat(node_data["updated_at"]),
-                        version=node_data.get("version", 1)
-                    )
-                    nodes.append(node)
-                except Exception as e:
-                    logger.warning(f"Failed to parse related node: {e}")
-                    continue
-            return nodes
+        key = ("related", node_id, max_depth, tuple(sorted(EdgeType(et).value for et in edge_types or ())))
+        return await self._memoized(key, lambda: _collect(self.iter_related_entities(node_id, max_depth, edge_types)))
 
     async def check_cycle(self, start_node_id: str, edge_types: Optional[List[EdgeType]] = None) -> bool:
         """Check if there's a cycle in the graph"""
-        async with self.driver.session(database=self.database) as session:
-            if edge_types:
-                edge_type_names = [et.value.upper() for et in edge_types]
-                cypher = f"""
-                MATCH path = (start {{id: $start_id}})-[:{'|:'.join(edge_type_names)}*]->(start)
-                WHERE ALL(r in relationships(path) WHERE type(r) IN {edge_type_names})
-                RETURN path LIMIT 1
-                """
-            else:
-                cypher = """
-                MATCH path = (start {id: $start_id})-[*]->(start)
-                RETURN path LIMIT 1
-                """
+        key = ("cycle", start_node_id, tuple(sorted(EdgeType(et).value for et in edge_types or ())))
+        return await self._memoized(key, lambda: self._fetch_cycle(start_node_id, edge_types))
+
+    async def _fetch_cycle(self, start_node_id: str, edge_types: Optional[List[EdgeType]]) -> bool:
+        """
+        Look for a cycle through the start node
 
+        A cycle exists iff some node reachable from start has an edge back to
+        it, so instead of enumerating paths (exponential in depth) this finds
+        the reachable set once and checks for a back edge. APOC's
+        subgraphNodes does that with no depth limit; without APOC a pruning
+        DISTINCT expansion is used, bounded by max_traversal_depth.
+        """
+        edge_type_names = _rel_type_names(edge_types or ())
+        async with self._session() as session:
+            # A failed probe would abort a bound transaction, so only probe for APOC outside one
+            if self._apoc_available or (self._apoc_available is None and self._bound.get() is None):
+                try:
+                    result = await session.run(
+                        """
+                        MATCH (start:Canon {id: $start_id})
+                        CALL apoc.path.subgraphNodes(start, {
+                            relationshipFilter: $relationship_filter,
+                            uniqueness: 'NODE_GLOBAL'
+                        }) YIELD node
+                        MATCH (node)-[r]->(start)
+                        WHERE size($edge_types) = 0 OR type(r) IN $edge_types
+                        RETURN true AS cycle LIMIT 1
+                        """,
+                        start_id=start_node_id,
+                        relationship_filter="|".join(f"{name}>" for name in edge_type_names) or ">",
+                        edge_types=list(edge_type_names)
+                    )
+                    record = await result.single()
+                    self._apoc_available = True
+                    return record is not None
+                except Neo4jError as e:
+                    if self._apoc_available:
+                        raise
+                    logger.debug(f"APOC unavailable, using Cypher cycle check: {e}")
+                    self._apoc_available = False
+
+            cypher = _cycle_cypher(edge_type_names, self.max_traversal_depth)
             result = await session.run(cypher, start_id=start_node_id)
             record = await result.single()
             return record is not None
 
     async def clear(self):
         """Clear all nodes and edges"""
-        async with self.driver.session(database=self.database) as session:
-            await session.run("MATCH (n) DETACH DELETE n")
+        self._node_cache.clear()
+        self._invalidate_traversals()
+        async with self._session() as session:
+            # CALL ... IN TRANSACTIONS needs an auto-commit query (Neo4j 4.4+)
+            if self._bound.get() is None:
+                try:
+                    result = await session.run(
+                        f"""
+                        MATCH (n)
+                        CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {CLEAR_BATCH_SIZE} ROWS
+                        """
+                    )
+                    await result.consume()
+                    logger.debug("Cleared Neo4j graph store")
+                    return
+                except Neo4jError as e:
+                    logger.debug(f"Batched clear unavailable, deleting in a loop: {e}")
+
+            while True:
+                result = await session.run(
+                    "MATCH (n) WITH n LIMIT $batch DETACH DELETE n RETURN count(n) AS deleted",
+                    batch=CLEAR_BATCH_SIZE
+                )
+                record = await result.single()
+                if not record or record["deleted"] == 0:
+                    break
             logger.debug("Cleared Neo4j graph store")
@@ -1,8 +1,12 @@
 """S3 interface for object storage"""
 
-from typing import Optional, BinaryIO
+import asyncio
+from typing import List, Optional, BinaryIO, AsyncIterator
 from abc import ABC, abstractmethod
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
@@ -30,20 +34,65 @@ class ObjectStore(ABC):
         """Delete an object"""
         pass
 
+    async def download_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Download several objects concurrently; missing keys come back as None"""
+        return list(await asyncio.gather(*(self.download(key) for key in keys)))
+
+    async def download_text(self, key: str) -> Optional[str]:
+        """Download an object as UTF-8 text (invalid bytes are replaced)"""
+        return (await self.download_many_text([key]))[0]
+
+    async def download_many_text(self, keys: List[str]) -> List[Optional[str]]:
+        """Download several objects as UTF-8 text; missing keys come back as None"""
+        return [
+            None if content is None else content.decode("utf-8", errors="replace")
+            for content in await self.download_many(keys)
+        ]
+
+    async def upload_fileobj(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None
+    ) -> bool:
+        """Upload an object from a file-like object"""
+        return await self.upload(key, fileobj.read(), content_type=content_type, metadata=metadata)
+
+    async def download_stream(self, key: str, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+        """Download an object in chunks (yields nothing if it doesn't exist)"""
+        content = await self.download(key)
+        if content is None:
+            return
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
     @abstractmethod
     async def list(self, prefix: Optional[str] = None) -> list:
         """List objects with optional prefix"""
         pass
 
+    async def list_iter(self, prefix: Optional[str] = None) -> AsyncIterator[str]:
+        """Iterate over object keys with optional prefix"""
+        for key in await self.list(prefix):
+            yield key
+
 
 class S3ObjectStore(ObjectStore):
-    """S3 implementation of object storage"""
+    """
+    S3 implementation of object storage
+
+    boto3 is blocking, so every call runs on a worker thread via
+    asyncio.to_thread; the client is thread-safe and its connection pool is
+    shared by all in-flight requests.
+    """
 
     def __init__(
         self,
         bucket: str,
         region: str = "us-east-1",
-        endpoint_url: Optional[str] = None
+        endpoint_url: Optional[str] = None,
+        max_pool_connections: int = 50
     ):
         """
         Initialize S3 client
@@ -52,6 +101,7 @@ class S3ObjectStore(ObjectStore):
             bucket: S3 bucket name
             region: AWS region
             endpoint_url: S3 endpoint (None for production, localstack URL for testing)
+            max_pool_connections: HTTP connections kept for concurrent requests
         """
         self.bucket = bucket
         self.region = region
@@ -60,7 +110,13 @@ class S3ObjectStore(ObjectStore):
         self.client = boto3.client(
             's3',
             region_name=region,
-            endpoint_url=endpoint_url
+            endpoint_url=endpoint_url,
+            config=Config(max_pool_connections=max_pool_connections)
+        )
+        # Large uploads go multipart with parts sent in parallel
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            max_concurrency=10
         )
 
     async def upload(
@@ -78,7 +134,8 @@ class S3ObjectStore(ObjectStore):
             extra_args["Metadata"] = metadata
 
         try:
-            self.client.put_object(
+            await asyncio.to_thread(
+                self.client.put_object,
                 Bucket=self.bucket,
                 Key=key,
                 Body=content,
@@ -88,33 +145,92 @@ class S3ObjectStore(ObjectStore):
         except ClientError as e:
             raise RuntimeError(f"S3 upload error: {str(e)}") from e
 
+    def _sync_download(self, key: str) -> bytes:
+        """Fetch and read an object (runs on a worker thread)"""
+        response = self.client.get_object(Bucket=self.bucket, Key=key)
+        return response["Body"].read()
+
     async def download(self, key: str) -> Optional[bytes]:
         """Download an object from S3"""
         try:
-            response = self.client.get_object(Bucket=self.bucket, Key=key)
-            return response["Body"].read()
+            return await asyncio.to_thread(self._sync_download, key)
         except ClientError as e:
             if e.response["Error"]["Code"] == "NoSuchKey":
                 return None
             raise RuntimeError(f"S3 download error: {str(e)}") from e
 
+    async def upload_fileobj(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None
+    ) -> bool:
+        """Upload a file-like object to S3, multipart above 8 MB"""
+        extra_args = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if metadata:
+            extra_args["Metadata"] = metadata
+
+        try:
+            await asyncio.to_thread(
+                self.client.upload_fileobj,
+                fileobj,
+                self.bucket,
+                key,
+                ExtraArgs=extra_args or None,
+                Config=self.transfer_config
+            )
+            return True
+        except (ClientError, S3UploadFailedError) as e:
+            raise RuntimeError(f"S3 upload error: {str(e)}") from e
+
+    async def download_stream(self, key: str, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+        """Download an object from S3 in chunks of at most chunk_size bytes"""
+        try:
+            response = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                return
+            raise RuntimeError(f"S3 download error: {str(e)}") from e
+
+        body = response["Body"]
+        chunks = body.iter_chunks(chunk_size)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
     async def delete(self, key: str) -> bool:
         """Delete an object from S3"""
         try:
-            self.client.delete_object(Bucket=self.bucket, Key=key)
+            await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
             return True
         except ClientError as e:
             raise RuntimeError(f"S3 delete error: {str(e)}") from e
 
-    async def list(self, prefix: Optional[str] = None) -> list:
-        """List objects in S3 with optional prefix"""
-        try:
-            kwargs = {"Bucket": self.bucket}
-            if prefix:
-                kwargs["Prefix"] = prefix
+    async def list_iter(self, prefix: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield object keys page by page (S3 returns at most 1000 per page)"""
+        kwargs = {"Bucket": self.bucket}
+        if prefix:
+            kwargs["Prefix"] = prefix
 
-            response = self.client.list_objects_v2(**kwargs)
-            objects = response.get("Contents", [])
-            return [obj["Key"] for obj in objects]
+        try:
+            pages = iter(self.client.get_paginator("list_objects_v2").paginate(**kwargs))
+            while True:
+                page = await asyncio.to_thread(next, pages, None)
+                if page is None:
+                    break
+                for obj in page.get("Contents", []):
+                    yield obj["Key"]
         except ClientError as e:
             raise RuntimeError(f"S3 list error: {str(e)}") from e
+
+    async def list(self, prefix: Optional[str] = None) -> list:
+        """List objects in S3 with optional prefix"""
+        return [key async for key in self.list_iter(prefix)]
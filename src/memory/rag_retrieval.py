@@ -1,14 +1,49 @@
 """Hybrid RAG Retrieval - Combines vector search with graph enrichment"""
 
+import asyncio
+import copy
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Callable
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable, Sequence
 from src.memory.vector_store import VectorStore
 from src.memory.graph_store import GraphStore
 from src.memory.object_store import ObjectStore
+from src.memory.semantic_cache import SemanticQueryCache
 from src.models.canon import CanonNode, EdgeType
 
 logger = logging.getLogger(__name__)
 
+# Node types whose enrichment includes a timeline fact
+TIMELINE_NODE_TYPES = frozenset({"event", "scene", "chapter"})
+
+# Result keys filled in by graph/blob enrichment
+ENRICHMENT_FIELDS = ("canon_node", "canon_facts", "relationships", "full_content")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) without splitting the text"""
+    return max(1, len(text) // 4)
+
+
+def first_of(mapping: Dict[str, Any], *keys: str, default: Any = "") -> Any:
+    """Value of the first key present (and not None) in mapping, else default"""
+    for key in keys:
+        value = mapping.get(key)
+        if value is not None:
+            return value
+    return default
+
+
+def _entity_line(result: Dict[str, Any]) -> str:
+    """The build_context line summarising a search hit"""
+    payload = result["payload"]
+    name = payload.get("name", result["id"])
+    summary = first_of(payload, "summary", "content")
+    entity_type = payload.get("type", "unknown")
+    return f"[{entity_type}] {name}: {summary}"
+
 
 class HybridRAGRetrieval:
     """Hybrid retrieval combining vector search, graph queries, and blob storage"""
@@ -18,7 +53,12 @@ class HybridRAGRetrieval:
         vector_store: VectorStore,
         graph_store: Optional[GraphStore] = None,
         object_store: Optional[ObjectStore] = None,
-        collection_name: str = "multiwriter-embeddings"
+        collection_name: str = "multiwriter-embeddings",
+        query_cache: Optional[SemanticQueryCache] = None,
+        graph_cache_size: int = 4096,
+        graph_cache_ttl: float = 60.0,
+        embedding_cache_size: int = 1024,
+        payload_fields: Optional[Sequence[str]] = None
     ):
         """
         Initialize hybrid RAG retrieval
@@ -28,11 +68,114 @@ class HybridRAGRetrieval:
             graph_store: Optional graph store for canon enrichment
             object_store: Optional object store for full content chunks
             collection_name: Vector collection name
+            query_cache: Optional semantic cache that short-circuits repeat or
+                near-identical queries
+            graph_cache_size: Max entities whose canon node and neighbors are cached
+                for enrichment (0 disables the cache)
+            graph_cache_ttl: Seconds a cached node or neighbor list stays valid
+            embedding_cache_size: Max query embeddings reused for identical query text
+                (0 disables). Assumes one embedding model per instance.
+            payload_fields: Payload keys to fetch and keep on results, e.g.
+                ("name", "summary", "type"); None keeps the whole payload
         """
         self.vector_store = vector_store
         self.graph_store = graph_store
         self.object_store = object_store
         self.collection_name = collection_name
+        self.query_cache = query_cache
+        self.graph_cache_size = graph_cache_size
+        self.graph_cache_ttl = graph_cache_ttl
+        # entity_id -> (expires_at, node); (entity_id, direction) -> (expires_at, node version, neighbors)
+        self._node_cache: OrderedDict[str, tuple] = OrderedDict()
+        self._neighbor_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self.embedding_cache_size = embedding_cache_size
+        self.payload_fields = list(payload_fields) if payload_fields else None
+        # blake2b(query text) -> embedding
+        self._embedding_cache: OrderedDict[bytes, List[float]] = OrderedDict()
+
+    async def _embed(self, queries: List[str], embedding_fn: Callable[[str], List[float]]) -> List[List[float]]:
+        """Embed queries, reusing cached vectors for text seen before and embedding misses concurrently"""
+        keys = [hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest() for query in queries]
+        embeddings: List[Optional[List[float]]] = []
+        for key in keys:
+            embedding = self._embedding_cache.get(key)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(key)
+            embeddings.append(embedding)
+
+        # First index of each distinct uncached text
+        misses: Dict[bytes, int] = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                misses.setdefault(keys[i], i)
+        if misses:
+            computed = await asyncio.gather(*(embedding_fn(queries[i]) for i in misses.values()))
+            fresh = dict(zip(misses, computed))
+            embeddings = [fresh[key] if embedding is None else embedding for key, embedding in zip(keys, embeddings)]
+            if self.embedding_cache_size > 0:
+                for key, embedding in fresh.items():
+                    self._embedding_cache[key] = embedding
+                    if len(self._embedding_cache) > self.embedding_cache_size:
+                        self._embedding_cache.popitem(last=False)
+        return embeddings
+
+    def invalidate(self, entity_id: Optional[str] = None):
+        """
+        Drop cached graph data for an entity (or everything when no ID is given)
+
+        Call this after writing a node, and for both endpoints after writing an edge.
+        """
+        if entity_id is None:
+            self._node_cache.clear()
+            self._neighbor_cache.clear()
+            return
+        self._node_cache.pop(entity_id, None)
+        for direction in ("in", "out", "both"):
+            self._neighbor_cache.pop((entity_id, direction), None)
+
+    def _cache_put(self, cache: OrderedDict, key: Any, value: tuple):
+        """Insert into an LRU cache, evicting the oldest entry when full"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.graph_cache_size:
+            cache.popitem(last=False)
+
+    async def _get_nodes(self, entity_ids: List[str]) -> Dict[str, CanonNode]:
+        """Fetch canon nodes, serving fresh cache entries and batching the misses"""
+        now = time.monotonic()
+        nodes: Dict[str, CanonNode] = {}
+        missing = []
+        for entity_id in entity_ids:
+            entry = self._node_cache.get(entity_id)
+            if entry is not None and entry[0] > now:
+                self._node_cache.move_to_end(entity_id)
+                nodes[entity_id] = entry[1]
+            else:
+                missing.append(entity_id)
+
+        if missing:
+            fetched = await self.graph_store.get_nodes(missing)
+            if self.graph_cache_size > 0:
+                expires_at = time.monotonic() + self.graph_cache_ttl
+                for node_id, node in fetched.items():
+                    self._cache_put(self._node_cache, node_id, (expires_at, node))
+            nodes.update(fetched)
+        return nodes
+
+    async def _get_neighbors(self, node: CanonNode, direction: str = "both") -> List[CanonNode]:
+        """Fetch a node's neighbors, reusing a cached list taken at the same node version"""
+        key = (node.id, direction)
+        entry = self._neighbor_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == node.version:
+            self._neighbor_cache.move_to_end(key)
+            return entry[2]
+
+        neighbors = await self.graph_store.get_neighbors(node.id, direction=direction)
+        if self.graph_cache_size > 0:
+            self._cache_put(
+                self._neighbor_cache, key, (time.monotonic() + self.graph_cache_ttl, node.version, neighbors)
+            )
+        return neighbors
 
     async def retrieve(
         self,
@@ -41,7 +184,8 @@ class HybridRAGRetrieval:
         top_k: int = 10,
         entity_type: Optional[str] = None,
         enrich_with_canon: bool = True,
-        include_full_content: bool = False
+        include_full_content: bool = False,
+        token_budget: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Hybrid retrieval: vector search + graph enrichment + blob content
@@ -53,12 +197,27 @@ class HybridRAGRetrieval:
             entity_type: Optional entity type filter
             enrich_with_canon: Whether to enrich with canon facts
             include_full_content: Whether to fetch full content from blob storage
+            token_budget: If set, drop (before enriching) the hits whose entity
+                lines would not fit in a build_context of this many tokens
 
         Returns:
             List of enriched results with metadata
         """
         # Step 1: Vector search (semantic match)
-        query_embedding = await embedding_fn(query)
+        query_embedding = (await self._embed([query], embedding_fn))[0]
+
+        cache_key = (
+            self.collection_name, top_k, entity_type, enrich_with_canon, include_full_content, token_budget
+        )
+        if self.query_cache is not None:
+            cached = self.query_cache.lookup(
+                query_embedding, key=cache_key, generation=self.vector_store.generation
+            )
+            if cached is not None:
+                logger.debug("Semantic cache hit")
+                return cached
+            # Read before searching so a write that lands mid-retrieval invalidates this entry
+            generation = self.vector_store.generation
 
         filter_dict = None
         if entity_type:
@@ -68,82 +227,91 @@ class HybridRAGRetrieval:
             collection_name=self.collection_name,
             query_vector=query_embedding,
             limit=top_k,
-            filter=filter_dict
+            filter=filter_dict,
+            payload_fields=self.payload_fields
         )
 
         logger.debug(f"Vector search returned {len(vector_results)} results")
 
+        if token_budget is not None:
+            vector_results = self._fit_budget(vector_results, token_budget)
+
+        enriched_results = [self._new_result(result) for result in vector_results]
+
         # Step 2: Enrich with canon facts from graph
-        enriched_results = []
-        for result in vector_results:
-            enriched = {
-                "id": result["id"],
-                "score": result["score"],
-                "payload": result["payload"].copy(),
-                "canon_facts": [],
-                "relationships": [],
-                "full_content": None
-            }
+        if enrich_with_canon and self.graph_store:
+            await self._enrich_with_canon(enriched_results, relationship_limit=5, timeline=True)
 
-            entity_id = result["id"]
-
-            # Enrich with graph facts if available
-            if enrich_with_canon and self.graph_store:
-                try:
-                    node = await self.graph_store.get_node(entity_id)
-                    if node:
-                        # Add canon metadata
-                        enriched["canon_node"] = {
-                            "id": node.id,
-                            "type": node.type,
-                            "properties": node.properties,
-                            "version": node.version
-                        }
-
-                        # Get relationships
-                        neighbors = await self.graph_store.get_neighbors(
-                            entity_id,
-                            direction="both"
-                        )
-                        enriched["relationships"] = [
-                            {
-                                "id": n.id,
-                                "type": n.type,
-                                "name": n.properties.get("name", n.id)
-                            }
-                            for n in neighbors[:5]  # Limit to 5 relationships
-                        ]
-
-                        # Get timeline context (if event)
-                        if node.type.value in ("event", "scene", "chapter"):
-                            timeline_edges = await self.graph_store.get_edges(
-                                source_id=entity_id,
-                                edge_type=EdgeType.BEFORE
-                            )
-                            enriched["canon_facts"].append({
-                                "type": "timeline",
-                                "before_events": len(timeline_edges)
-                            })
-                except Exception as e:
-                    logger.warning(f"Failed to enrich {entity_id} with canon: {e}")
-
-            # Step 3: Fetch full content from blob storage if requested
-            if include_full_content and self.object_store:
-                try:
-                    # Try to fetch full content chunk
-                    content_key = f"entities/{entity_id}/content.txt"
-                    content = await self.object_store.download(content_key)
-                    if content:
-                        enriched["full_content"] = content.decode("utf-8") if isinstance(content, bytes) else content
-                except Exception as e:
-                    logger.debug(f"Could not fetch full content for {entity_id}: {e}")
-                    # Fallback to payload content
-                    enriched["full_content"] = result["payload"].get("content", result["payload"].get("summary", ""))
-
-            enriched_results.append(enriched)
+        # Step 3: Fetch full content from blob storage if requested
+        if include_full_content and self.object_store:
+            await self._attach_full_content(enriched_results)
 
+        if self.query_cache is not None:
+            self.query_cache.update(query_embedding, enriched_results, key=cache_key, generation=generation)
         return enriched_results
 
+    async def retrieve_batch(
+        self,
+        queries: List[str],
+        embedding_fn: Callable[[str], List[float]],
+        top_k: int = 10,
+        entity_type: Optional[str] = None,
+        enrich_with_canon: bool = True,
+        include_full_content: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Hybrid retrieval for several queries with a single vector search request
+
+        Entities returned for more than one query are enriched once.
+
+        Args:
+            queries: Query strings
+            embedding_fn: Function to generate embeddings
+            top_k: Number of results per query
+            entity_type: Optional entity type filter
+            enrich_with_canon: Whether to enrich with canon facts
+            include_full_content: Whether to fetch full content from blob storage
+
+        Returns:
+            One list of enriched results per query, in query order
+        """
+        embeddings = await self._embed(queries, embedding_fn)
+
+        filter_dict = None
+        if entity_type:
+            filter_dict = {"type": entity_type}
+
+        vector_batches = await self.vector_store.batch_search(
+            collection_name=self.collection_name,
+            query_vectors=embeddings,
+            limit=top_k,
+            filter=filter_dict,
+            payload_fields=self.payload_fields
+        )
+        batches = [[self._new_result(result) for result in results] for results in vector_batches]
+
+        unique: Dict[Any, Dict[str, Any]] = {}
+        for results in batches:
+            for enriched in results:
+                unique.setdefault(enriched["id"], enriched)
+        representatives = list(unique.values())
+
+        if enrich_with_canon and self.graph_store:
+            await self._enrich_with_canon(representatives, relationship_limit=5, timeline=True)
+        if include_full_content and self.object_store:
+            await self._attach_full_content(representatives)
+
+        # Copy the shared enrichment onto repeat hits
+        for results in batches:
+            for enriched in results:
+                representative = unique[enriched["id"]]
+                if representative is not enriched:
+                    for field in ENRICHMENT_FIELDS:
+                        if field in representative:
+                            enriched[field] = copy.deepcopy(representative[field])
+
+        return batches
+
     async def retrieve_by_ids(
         self,
         entity_ids: List[str],
@@ -161,68 +329,142 @@ class HybridRAGRetrieval:
         Returns:
             List of enriched entity data
         """
-        results = []
-
         # Get from vector store (by ID)
         vector_data = await self.vector_store.retrieve_by_ids(
             collection_name=self.collection_name,
-            entity_ids=entity_ids
+            entity_ids=entity_ids,
+            payload_fields=self.payload_fields
         )
 
-        # Enrich each result
-        for data in vector_data:
-            entity_id = data["id"]
-            enriched = {
-                "id": entity_id,
-                "payload": data["payload"].copy(),
+        results = [
+            {
+                "id": data["id"],
+                "payload": self._project(data["payload"]),
                 "canon_facts": [],
                 "relationships": [],
                 "full_content": None
             }
+            for data in vector_data
+        ]
 
-            # Enrich with graph
-            if enrich_with_canon and self.graph_store:
-                try:
-                    node = await self.graph_store.get_node(entity_id)
-                    if node:
-                        enriched["canon_node"] = {
-                            "id": node.id,
-                            "type": node.type,
-                            "properties": node.properties,
-                            "version": node.version
-                        }
-
-                        # Get relationships
-                        neighbors = await self.graph_store.get_neighbors(
-                            entity_id,
-                            direction="both"
-                        )
-                        enriched["relationships"] = [
-                            {
-                                "id": n.id,
-                                "type": n.type,
-                                "name": n.properties.get("name", n.id)
-                            }
-                            for n in neighbors
-                        ]
-                except Exception as e:
-                    logger.warning(f"Failed to enrich {entity_id} with canon: {e}")
-
-            # Fetch full content if requested
-            if include_full_content and self.object_store:
-                try:
-                    content_key = f"entities/{entity_id}/content.txt"
-                    content = await self.object_store.download(content_key)
-                    if content:
-                        enriched["full_content"] = content.decode("utf-8") if isinstance(content, bytes) else content
-                except Exception as e:
-                    logger.debug(f"Could not fetch full content for {entity_id}: {e}")
-                    enriched["full_content"] = data["payload"].get("content", data["payload"].get("summary", ""))
-
-            results.append(enriched)
+        # Enrich with graph
+        if enrich_with_canon and self.graph_store:
+            await self._enrich_with_canon(results)
+
+        # Fetch full content if requested
+        if include_full_content and self.object_store:
+            await self._attach_full_content(results)
 
         return results
 
+    @staticmethod
+    def _fit_budget(hits: List[Dict[str, Any]], token_budget: int) -> List[Dict[str, Any]]:
+        """
+        Keep the leading hits whose entity lines fit in the budget
+
+        Canon and relationship lines only ever add tokens, so build_context can
+        never reach a hit past this prefix and enriching it would be wasted.
+        """
+        token_count = 0
+        for i, hit in enumerate(hits):
+            token_count += estimate_tokens(_entity_line(hit))
+            if token_count > token_budget:
+                return hits[:i]
+        return hits
+
+    def _project(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy the configured payload fields (or the whole payload)"""
+        if self.payload_fields is None:
+            return payload.copy()
+        return {k: payload[k] for k in self.payload_fields if k in payload}
+
+    def _new_result(self, hit: Dict[str, Any]) -> Dict[str, Any]:
+        """Start an enriched result from a vector search hit"""
+        return {
+            "id": hit["id"],
+            "score": hit["score"],
+            "payload": self._project(hit["payload"]),
+            "canon_facts": [],
+            "relationships": [],
+            "full_content": None
+        }
+
+    async def _enrich_with_canon(
+        self,
+        results: List[Dict[str, Any]],
+        relationship_limit: Optional[int] = None,
+        timeline: bool = False
+    ):
+        """Attach canon nodes, relationships and timeline facts, issuing graph calls concurrently"""
+        try:
+            nodes = await self._get_nodes([r["id"] for r in results])
+        except Exception as e:
+            logger.warning(f"Failed to enrich results with canon: {e}")
+            return
+
+        found = [r for r in results if r["id"] in nodes]
+        for enriched in found:
+            node = nodes[enriched["id"]]
+            enriched["canon_node"] = {
+                "id": node.id,
+                "type": node.type,
+                "properties": node.properties,
+                "version": node.version
+            }
+
+        timeline_results = []
+        if timeline:
+            timeline_results = [r for r in found if nodes[r["id"]].type in TIMELINE_NODE_TYPES]
+
+        neighbor_lists, timeline_edges = await asyncio.gather(
+            asyncio.gather(
+                *(self._get_neighbors(nodes[r["id"]], direction="both") for r in found),
+                return_exceptions=True
+            ),
+            asyncio.gather(
+                *(self.graph_store.get_edges(source_id=r["id"], edge_type=EdgeType.BEFORE) for r in timeline_results),
+                return_exceptions=True
+            )
+        )
+
+        for enriched, neighbors in zip(found, neighbor_lists):
+            if isinstance(neighbors, Exception):
+                logger.warning(f"Failed to enrich {enriched['id']} with canon: {neighbors}")
+                continue
+            enriched["relationships"] = [
+                {
+                    "id": n.id,
+                    "type": n.type,
+                    "name": n.properties.get("name", n.id)
+                }
+                for n in neighbors[:relationship_limit]
+            ]
+
+        for enriched, edges in zip(timeline_results, timeline_edges):
+            if isinstance(edges, Exception):
+                logger.warning(f"Failed to enrich {enriched['id']} with canon: {edges}")
+                continue
+            enriched["canon_facts"].append({
+                "type": "timeline",
+                "before_events": len(edges)
+            })
+
+    async def _attach_full_content(self, results: List[Dict[str, Any]]):
+        """Download full content chunks in one batch, falling back to the payload text"""
+        try:
+            contents = await self.object_store.download_many_text(
+                [f"entities/{r['id']}/content.txt" for r in results]
+            )
+        except Exception as e:
+            logger.debug(f"Could not fetch full content: {e}")
+            for enriched in results:
+                enriched["full_content"] = first_of(enriched["payload"], "content", "summary")
+            return
+
+        for enriched, content in zip(results, contents):
+            if content:
+                enriched["full_content"] = content
+
     async def build_context(
         self,
         query: str,
@@ -247,21 +489,17 @@ class HybridRAGRetrieval:
             embedding_fn=embedding_fn,
             top_k=top_k,
             enrich_with_canon=True,
-            include_full_content=False  # Use summaries for context
+            include_full_content=False,  # Use summaries for context
+            token_budget=max_tokens
         )
 
         context_parts = []
         token_count = 0
 
         for result in results:
-            payload = result["payload"]
-            name = payload.get("name", result["id"])
-            summary = payload.get("summary", payload.get("content", ""))
-            entity_type = payload.get("type", "unknown")
-
             # Add entity summary
-            entity_text = f"[{entity_type}] {name}: {summary}"
-            entity_tokens = len(entity_text.split())  # Rough estimate
+            entity_text = _entity_line(result)
+            entity_tokens = estimate_tokens(entity_text)
 
             if token_count + entity_tokens > max_tokens:
                 break
@@ -273,7 +511,7 @@ class HybridRAGRetrieval:
             if result.get("canon_node"):
                 canon = result["canon_node"]
                 canon_text = f"  Canon: {canon['type']} (v{canon['version']})"
-                canon_tokens = len(canon_text.split())
+                canon_tokens = estimate_tokens(canon_text)
                 if token_count + canon_tokens <= max_tokens:
                     context_parts.append(canon_text)
                     token_count += canon_tokens
@@ -283,7 +521,7 @@ class HybridRAGRetrieval:
                 rels = result["relationships"][:3]  # Limit to 3
                 rel_names = [r["name"] for r in rels]
                 rel_text = f"  Related: {', '.join(rel_names)}"
-                rel_tokens = len(rel_text.split())
+                rel_tokens = estimate_tokens(rel_text)
                 if token_count + rel_tokens <= max_tokens:
                     context_parts.append(rel_text)
                     token_count += rel_tokens
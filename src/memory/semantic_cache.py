@@ -0,0 +1,180 @@
+"""Semantic query cache - reuses retrieval results for near-identical query embeddings"""
+
+import copy
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticQueryCache:
+    """Bounded LRU cache of retrieval results, matched by cosine similarity of query embeddings"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        threshold: float = 0.97,
+        ttl: float = 300.0,
+        quantize: bool = False
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Max cached queries; the least recently used is evicted first
+            threshold: Min cosine similarity between query embeddings for a hit
+            ttl: Seconds a cached result stays valid
+            quantize: Store embeddings as per-row int8 (4x less memory); scores
+                shift by ~0.01 at most, so keep the threshold a little loose
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if not -1.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be between -1 and 1")
+
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.quantize = quantize
+        self._lock = threading.RLock()
+
+        # Struct-of-arrays: row i of every array describes slot i. The embedding
+        # matrix is allocated on the first insert, once the dimension is known.
+        self._matrix: Optional[np.ndarray] = None
+        self._scales = np.zeros(max_entries, dtype=np.float32)  # int8 row scales when quantized
+        self._valid = np.zeros(max_entries, dtype=bool)
+        self._key_codes = np.zeros(max_entries, dtype=np.int64)
+        self._generations = np.zeros(max_entries, dtype=np.int64)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._results: List[Any] = [None] * max_entries
+        self._len = 0  # slots written so far
+        self._clock = 0  # LRU clock, bumped on every insert and hit
+        # Keys are compared as small ints so the whole match is one vectorized mask
+        self._key_index: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return int(self._valid[:self._len].sum())
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """L2-normalize an embedding as float32, or None for a zero vector"""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    @staticmethod
+    def _quantize(vector: np.ndarray) -> tuple:
+        """Symmetric int8 quantization: returns (int8 vector, scale)"""
+        scale = float(np.abs(vector).max()) / 127.0
+        return np.round(vector / scale).astype(np.int8), scale
+
+    def _scores(self, query: np.ndarray, n: int) -> np.ndarray:
+        """Cosine similarity of the query against the first n rows"""
+        if not self.quantize:
+            return self._matrix[:n] @ query
+        q_query, q_scale = self._quantize(query)
+        raw = self._matrix[:n] @ q_query.astype(np.int32)
+        return raw * (self._scales[:n] * q_scale)
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def lookup(
+        self,
+        embedding: Sequence[float],
+        key: Hashable = None,
+        generation: int = 0
+    ) -> Optional[List[Any]]:
+        """
+        Find cached results for a similar query
+
+        Args:
+            embedding: Query embedding
+            key: Retrieval parameters that must match exactly (e.g. top_k, filters)
+            generation: Current data generation; entries from older generations miss
+
+        Returns:
+            A copy of the cached results, or None on a miss
+        """
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            code = self._key_index.get(key)
+            n = self._len
+            if code is None or n == 0 or self._matrix.shape[1] != query.shape[0]:
+                return None
+
+            live = (
+                self._valid[:n]
+                & (self._key_codes[:n] == code)
+                & (self._generations[:n] == generation)
+                & (self._expires[:n] > time.monotonic())
+            )
+            if not live.any():
+                return None
+
+            scores = self._scores(query, n)
+            scores[~live] = -np.inf
+            row = int(np.argmax(scores))
+            if scores[row] < self.threshold:
+                return None
+            self._last_used[row] = self._tick()
+            return copy.deepcopy(self._results[row])
+
+    def _free_slot(self, generation: int) -> int:
+        """Pick a slot to write: unused, then dead (expired/stale), then least recently used"""
+        if self._len < self.max_entries:
+            self._len += 1
+            return self._len - 1
+        dead = np.flatnonzero(
+            ~self._valid | (self._expires <= time.monotonic()) | (self._generations != generation)
+        )
+        if len(dead):
+            return int(dead[0])
+        return int(np.argmin(self._last_used))
+
+    def update(
+        self,
+        embedding: Sequence[float],
+        results: List[Any],
+        key: Hashable = None,
+        generation: int = 0
+    ):
+        """Store results for a query, evicting the least recently used entry when full"""
+        query = self._normalize(embedding)
+        if query is None:
+            return
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                # First insert, or the embedding model changed: start over at the new size
+                self.clear()
+                dtype = np.int8 if self.quantize else np.float32
+                self._matrix = np.empty((self.max_entries, query.shape[0]), dtype=dtype)
+
+            slot = self._free_slot(generation)
+            if self.quantize:
+                self._matrix[slot], self._scales[slot] = self._quantize(query)
+            else:
+                self._matrix[slot] = query
+            self._valid[slot] = True
+            self._key_codes[slot] = self._key_index.setdefault(key, len(self._key_index))
+            self._generations[slot] = generation
+            self._expires[slot] = time.monotonic() + self.ttl
+            self._last_used[slot] = self._tick()
+            self._results[slot] = copy.deepcopy(results)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._valid[:] = False
+            self._results = [None] * self.max_entries
+            self._len = 0
+            self._key_index.clear()
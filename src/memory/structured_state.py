@@ -1,12 +1,103 @@
 """DynamoDB interface for structured state"""
 
+import asyncio
 import json
-from typing import Dict, Any, Optional, List
+import logging
+import time
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
+from decimal import Decimal
 from abc import ABC, abstractmethod
 import boto3
+from boto3.dynamodb.conditions import ConditionExpressionBuilder, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 
+logger = logging.getLogger(__name__)
+
+# batch_get_item accepts at most this many keys per request
+BATCH_GET_LIMIT = 100
+
+# key_condition suffixes mapped to Key() comparisons; a bare attribute name means equality
+_KEY_OPERATORS = {
+    "begins_with": lambda key, value: key.begins_with(value),
+    "between": lambda key, value: key.between(*value),
+    "lt": lambda key, value: key.lt(value),
+    "lte": lambda key, value: key.lte(value),
+    "gt": lambda key, value: key.gt(value),
+    "gte": lambda key, value: key.gte(value),
+}
+
+
+class _NativeSerializer(TypeSerializer):
+    """TypeSerializer that also accepts floats, datetimes and tuples; other values are stored as JSON"""
+
+    def serialize(self, value):
+        if isinstance(value, float):
+            value = Decimal(str(value))
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, tuple):
+            value = list(value)
+        try:
+            return super().serialize(value)
+        except TypeError:
+            return {"S": json.dumps(value, default=str)}
+
+
+class _NativeDeserializer(TypeDeserializer):
+    """TypeDeserializer that returns int/float instead of Decimal"""
+
+    def _deserialize_n(self, value):
+        return float(value) if any(c in value for c in ".eE") else int(value)
+
+
+# Attribute value expressions (over a local ``v``) for the types compile_serializer specializes
+_FIELD_SERIALIZERS = {
+    str: '{"S": v}',
+    bool: '{"BOOL": v}',
+    int: '{"N": str(v)}',
+    float: '{"N": str(Decimal(str(v)))}',
+    datetime: '{"S": v.isoformat()}',
+}
+
+
+def _compile_item_serializer(schema: Dict[str, type], fallback: Callable[[Any], Any]) -> Callable:
+    """Generate an item serializer with the per-field type dispatch resolved up front"""
+    lines = ["def serialize(item):", "    out = {}"]
+    for i, (field, field_type) in enumerate(schema.items()):
+        expression = _FIELD_SERIALIZERS.get(field_type)
+        if expression is None:
+            raise ValueError(f"Unsupported schema type for {field!r}: {field_type!r}")
+        lines += [
+            f"    v = item.get({field!r}, _MISSING)",
+            "    if v is not _MISSING:",
+            f"        out[{field!r}] = _NULL if v is None else {expression}",
+        ]
+    # Fields outside the schema use the generic path; schema fields must hold their declared type
+    lines += [
+        "    if len(out) != len(item):",
+        "        for k, v in item.items():",
+        "            if k not in out:",
+        "                out[k] = _fallback(v)",
+        "    return out",
+    ]
+    namespace = {"_MISSING": object(), "_NULL": {"NULL": True}, "_fallback": fallback, "Decimal": Decimal}
+    exec("\n".join(lines), namespace)
+    return namespace["serialize"]
+
+
+def _key_condition_expression(key_condition: Dict[str, Any]):
+    """Build a Key() condition from {"pk": v, "sk__begins_with": prefix, ...}"""
+    condition = None
+    for name, value in key_condition.items():
+        attribute, _, operator = name.partition("__")
+        if operator and operator not in _KEY_OPERATORS:
+            raise ValueError(f"Unsupported key condition operator: {operator}")
+        clause = _KEY_OPERATORS[operator](Key(attribute), value) if operator else Key(attribute).eq(value)
+        condition = clause if condition is None else condition & clause
+    return condition
+
 
 class StructuredState(ABC):
     """Abstract interface for structured state storage"""
@@ -31,6 +122,11 @@ class StructuredState(ABC):
         """Query items from the table"""
         pass
 
+    async def batch_read(self, table_name: str, keys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Read several items by key; missing items are left out"""
+        items = [await self.read(table_name, key) for key in keys]
+        return [item for item in items if item is not None]
+
     @abstractmethod
     async def update(
         self,
@@ -70,118 +166,180 @@ class DynamoDBState(StructuredState):
             endpoint_url=endpoint_url
         )
 
-        # Resource for higher-level operations
-        self.resource = boto3.resource(
-            'dynamodb',
-            region_name=region,
-            endpoint_url=endpoint_url
-        )
+        self._serializer = _NativeSerializer()
+        self._deserializer = _NativeDeserializer()
+        self._update_expr_cache: Dict[frozenset, tuple] = {}
+        # table name -> serializer generated by register_schema
+        self._item_serializers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
 
     def _get_table_name(self, table_name: str) -> str:
         """Get full table name with prefix"""
         return f"{self.table_prefix}{table_name}" if self.table_prefix else table_name
 
-    def _serialize_value(self, value: Any) -> Any:
-        """Serialize value for DynamoDB"""
-        if isinstance(value, str):
-            return {"S": value}
-        elif isinstance(value, (int, float)):
-            return {"N": str(value)}
-        elif isinstance(value, bool):
-            return {"BOOL": value}
-        elif isinstance(value, dict):
-            return {"M": {k: self._serialize_value(v) for k, v in value.items()}}
-        elif isinstance(value, list):
-            return {"L": [self._serialize_value(item) for item in value]}
-        elif isinstance(value, datetime):
-            return {"S": value.isoformat()}
-        elif value is None:
-            return {"NULL": True}
-        else:
-            # Try to serialize as JSON string
-            return {"S": json.dumps(value)}
-
-    def _deserialize_value(self, value: Dict[str, Any]) -> Any:
-        """Deserialize value from DynamoDB"""
-        if "S" in value:
-            return value["S"]
-        elif "N" in value:
-            num_str = value["N"]
-            # Try int first, then float
-            try:
-                if "." in num_str:
-                    return float(num_str)
-                return int(num_str)
-            except ValueError:
-                return num_str
-        elif "BOOL" in value:
-            return value["BOOL"]
-        elif "M" in value:
-            return {k: self._deserialize_value(v) for k, v in value["M"].items()}
-        elif "L" in value:
-            return [self._deserialize_value(item) for item in value["L"]]
-        elif "NULL" in value:
-            return None
-        else:
-            return value
+    def _serialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a regular dict to a low-level client item"""
+        return {k: self._serializer.serialize(v) for k, v in item.items()}
 
-    def _item_to_dict(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert DynamoDB item to regular dict"""
-        return {k: self._deserialize_value(v) for k, v in item.items()}
+    def compile_serializer(self, schema: Dict[str, type]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Generate an item serializer specialized for a fixed schema
 
-    async def write(self, table_name: str, item: Dict[str, Any]) -> bool:
-        """Write an item to DynamoDB"""
-        table = self.resource.Table(self._get_table_name(table_name))
+        Args:
+            schema: Field name -> type (str, bool, int, float or datetime). Fields
+                not in the schema still go through the generic serializer.
+        """
+        return _compile_item_serializer(schema, self._serializer.serialize)
 
-        # Convert values to DynamoDB format
-        dynamodb_item = {}
-        for k, v in item.items():
-            dynamodb_item[k] = self._serialize_value(v)
+    def register_schema(self, table_name: str, schema: Dict[str, type]):
+        """Serialize items written to table_name with a serializer compiled for schema"""
+        self._item_serializers[table_name] = self.compile_serializer(schema)
 
+    async def write(self, table_name: str, item: Dict[str, Any]) -> bool:
+        """Write an item to DynamoDB"""
+        serialize = self._item_serializers.get(table_name, self._serialize_item)
         try:
-            table.put_item(Item=dynamodb_item)
+            self.client.put_item(
+                TableName=self._get_table_name(table_name),
+                Item=serialize(item)
+            )
             return True
         except ClientError as e:
             raise RuntimeError(f"DynamoDB write error: {str(e)}") from e
 
     async def read(self, table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Read an item from DynamoDB"""
-        table = self.resource.Table(self._get_table_name(table_name))
-
-        # Convert key to DynamoDB format
-        dynamodb_key = {}
-        for k, v in key.items():
-            dynamodb_key[k] = self._serialize_value(v)
-
         try:
-            response = table.get_item(Key=dynamodb_key)
+            response = self.client.get_item(
+                TableName=self._get_table_name(table_name),
+                Key=self._serialize_item(key)
+            )
             if "Item" in response:
-                return self._item_to_dict(response["Item"])
+                return self._deserialize_item(response["Item"])
             return None
         except ClientError as e:
             raise RuntimeError(f"DynamoDB read error: {str(e)}") from e
 
+    def _deserialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a low-level client item to a regular dict"""
+        return {k: self._deserializer.deserialize(v) for k, v in item.items()}
+
+    def _sync_query(
+        self,
+        table_name: str,
+        key_condition: Dict[str, Any],
+        limit: Optional[int] = None,
+        index_name: Optional[str] = None,
+        scan_forward: bool = True,
+        scan: bool = False
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {"TableName": self._get_table_name(table_name)}
+        if key_condition:
+            built = ConditionExpressionBuilder().build_expression(
+                _key_condition_expression(key_condition), is_key_condition=not scan
+            )
+            params["KeyConditionExpression" if not scan else "FilterExpression"] = built.condition_expression
+            params["ExpressionAttributeNames"] = built.attribute_name_placeholders
+            params["ExpressionAttributeValues"] = {
+                k: self._serializer.serialize(v) for k, v in built.attribute_value_placeholders.items()
+            }
+        if not scan:
+            params["ScanIndexForward"] = scan_forward
+        if index_name:
+            params["IndexName"] = index_name
+        operation = self.client.scan if scan else self.client.query
+        # Limit caps items evaluated, not matched, so it only applies without a filter
+        page_limit = limit if not (scan and key_condition) else None
+
+        items: List[Dict[str, Any]] = []
+        while True:
+            if page_limit is not None:
+                params["Limit"] = page_limit - len(items)
+            response = operation(**params)
+            items.extend(self._deserialize_item(item) for item in response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key or (limit is not None and len(items) >= limit):
+                return items[:limit] if limit is not None else items
+            params["ExclusiveStartKey"] = last_key
+
     async def query(
         self,
         table_name: str,
         key_condition: Dict[str, Any],
         **kwargs
     ) -> List[Dict[str, Any]]:
-        """Query items from DynamoDB"""
-        table = self.resource.Table(self._get_table_name(table_name))
+        """
+        Query items from DynamoDB
+
+        key_condition maps attribute names to values for equality; suffix a name
+        with __begins_with, __between, __lt, __lte, __gt or __gte for range
+        conditions on the sort key. An empty condition, or one on non-key
+        attributes, falls back to a filtered scan.
 
-        # Build query parameters
-        # Note: This is a simplified version; full implementation would support
-        # KeyConditionExpression, FilterExpression, etc.
+        Args:
+            table_name: Table to query
+            key_condition: Key condition as described above
+            **kwargs: limit, index_name and scan_forward
+        """
+        options = {
+            "limit": kwargs.get("limit"),
+            "index_name": kwargs.get("index_name"),
+            "scan_forward": kwargs.get("scan_forward", True),
+        }
         try:
-            # For now, use scan (inefficient but simple)
-            # In production, this should use proper query with KeyConditionExpression
-            response = table.scan()
-            items = response.get("Items", [])
-            return [self._item_to_dict(item) for item in items]
+            if key_condition:
+                try:
+                    return await asyncio.to_thread(self._sync_query, table_name, key_condition, **options)
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ValidationException":
+                        raise
+                    logger.warning(f"Query on {table_name} is not keyed on {list(key_condition)}; scanning instead")
+            return await asyncio.to_thread(self._sync_query, table_name, key_condition, scan=True, **options)
         except ClientError as e:
             raise RuntimeError(f"DynamoDB query error: {str(e)}") from e
 
+    def _sync_batch_read(self, table_name: str, keys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        full_name = self._get_table_name(table_name)
+        items: List[Dict[str, Any]] = []
+        for start in range(0, len(keys), BATCH_GET_LIMIT):
+            pending = [
+                self._serialize_item(key) for key in keys[start:start + BATCH_GET_LIMIT]
+            ]
+            attempt = 0
+            while pending:
+                response = self.client.batch_get_item(RequestItems={full_name: {"Keys": pending}})
+                items.extend(
+                    self._deserialize_item(item) for item in response.get("Responses", {}).get(full_name, [])
+                )
+                # Throttled keys come back as UnprocessedKeys; retry them with backoff
+                pending = response.get("UnprocessedKeys", {}).get(full_name, {}).get("Keys", [])
+                if pending:
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+                    attempt += 1
+        return items
+
+    async def batch_read(self, table_name: str, keys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Read items by key with batch_get_item, 100 keys per request (order not preserved)"""
+        try:
+            return await asyncio.to_thread(self._sync_batch_read, table_name, keys)
+        except ClientError as e:
+            raise RuntimeError(f"DynamoDB batch_read error: {str(e)}") from e
+
+    def _update_expression(self, updates: Dict[str, Any]) -> tuple:
+        """
+        Return (UpdateExpression, ExpressionAttributeNames, field order) for a set of fields
+
+        Names go through #n placeholders so reserved words like "status" work; the
+        result is cached per field set since callers update the same few shapes.
+        """
+        field_set = frozenset(updates)
+        cached = self._update_expr_cache.get(field_set)
+        if cached is None:
+            fields = tuple(updates)
+            expr = "SET " + ", ".join(f"#n{i} = :v{i}" for i in range(len(fields)))
+            names = {f"#n{i}": field for i, field in enumerate(fields)}
+            cached = self._update_expr_cache[field_set] = (expr, names, fields)
+        return cached
+
     async def update(
         self,
         table_name: str,
@@ -189,21 +347,15 @@ class DynamoDBState(StructuredState):
         updates: Dict[str, Any]
     ) -> bool:
         """Update an item in DynamoDB"""
-        table = self.resource.Table(self._get_table_name(table_name))
-
-        # Convert key
-        dynamodb_key = {}
-        for k, v in key.items():
-            dynamodb_key[k] = self._serialize_value(v)
-
-        # Build update expression
-        update_expr = "SET " + ", ".join([f"{k} = :{k}" for k in updates.keys()])
-        expr_values = {f":{k}": self._serialize_value(v) for k, v in updates.items()}
+        update_expr, expr_names, fields = self._update_expression(updates)
+        expr_values = {f":v{i}": self._serializer.serialize(updates[field]) for i, field in enumerate(fields)}
 
         try:
-            table.update_item(
-                Key=dynamodb_key,
+            self.client.update_item(
+                TableName=self._get_table_name(table_name),
+                Key=self._serialize_item(key),
                 UpdateExpression=update_expr,
+                ExpressionAttributeNames=expr_names,
                 ExpressionAttributeValues=expr_values
             )
             return True
@@ -1,7 +1,16 @@
 """Qdrant interface for vector embeddings"""
 
-from typing import List, Optional, Dict, Any, Callable, TYPE_CHECKING
-from abc import ABC, abstractmethod
+import asyncio
+import copy
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, AsyncIterator, Callable, Protocol, Tuple, Union, TYPE_CHECKING, runtime_checkable
+
+import numpy as np
+
+from src.models.entity import EntityType
 
 if TYPE_CHECKING:
     from src.models import EntityRegistry
@@ -13,13 +22,108 @@ from qdrant_client.models import (
     Filter,
     FieldCondition,
     MatchValue,
+    QueryRequest,
+    HnswConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    ProductQuantization,
+    ProductQuantizationConfig,
+    CompressionRatio,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CollectionStatus,
+    SearchParams,
+    QuantizationSearchParams,
+    Datatype,
 )
 
+logger = logging.getLogger(__name__)
+
+# Ping idle gRPC channels so proxies and load balancers keep them open
+GRPC_OPTIONS = {"grpc.keepalive_time_ms": 30_000}
+
+# Cap on distinct cached filters; the cache is reset when it fills
+FILTER_CACHE_SIZE = 1024
+
+# index_entities embeds this many texts per slice, with at most
+# EMBED_CONCURRENCY embedding requests in flight
+EMBED_BATCH_SIZE = 64
+EMBED_CONCURRENCY = 16
+
+# Embedded batches index_entities may buffer ahead of the upserts
+INDEX_QUEUE_SIZE = 4
+
+# Point IDs per retrieve when checking which entities are already indexed
+HASH_LOOKUP_BATCH_SIZE = 1000
+
+# Collection quantization modes -> default search oversampling. Binary codes are
+# the coarsest, so they need more candidates rescored to keep recall.
+QUANTIZATION_OVERSAMPLING = {"none": None, "scalar": 2.0, "product": 2.0, "binary": 4.0}
+
+
+def _new_client(host: str, port: int, grpc_port: int, prefer_grpc: bool, use_async: bool) -> Any:
+    """Create a Qdrant client"""
+    client_cls = AsyncQdrantClient if use_async else QdrantClient
+    return client_cls(
+        host=host,
+        port=port,
+        grpc_port=grpc_port,
+        prefer_grpc=prefer_grpc,
+        # Keep the long-lived gRPC channel from being dropped while idle
+        grpc_options=GRPC_OPTIONS if prefer_grpc else None
+    )
+
+
+# One client per server: stores on the same endpoint multiplex over its pool
+SHARED_CLIENT_LIMIT = 8
+_shared_clients: "OrderedDict[tuple, Any]" = OrderedDict()
+
+
+def _close_client(client: Any):
+    """Close an evicted client; async clients are closed on the running loop if there is one"""
+    closing = client.close()
+    if asyncio.iscoroutine(closing):
+        try:
+            asyncio.get_running_loop().create_task(closing)
+        except RuntimeError:
+            closing.close()  # No loop to run it on
+
+
+def _get_client(host: str, port: int, grpc_port: int, prefer_grpc: bool, use_async: bool) -> Any:
+    """Shared client for a server, closing the least recently used one past SHARED_CLIENT_LIMIT"""
+    key = (host, port, grpc_port, prefer_grpc, use_async)
+    client = _shared_clients.get(key)
+    if client is not None:
+        _shared_clients.move_to_end(key)
+        return client
+    client = _shared_clients[key] = _new_client(*key)
+    if len(_shared_clients) > SHARED_CLIENT_LIMIT:
+        _close_client(_shared_clients.popitem(last=False)[1])
+    return client
+
 
-class VectorStore(ABC):
-    """Abstract interface for vector storage"""
+def _content_hash(entity: Any, full_content: str, embedding_key: str = "") -> str:
+    """Digest of everything index_entities stores for an entity, and of how its vector was made"""
+    fields = (
+        entity.name, entity.entity_type_str, entity.summary, full_content,
+        "\x1e".join(entity.tags), entity.source_doc or "", embedding_key
+    )
+    return hashlib.blake2b("\x1f".join(fields).encode("utf-8"), digest_size=16).hexdigest()
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """
+    Interface for vector storage
+
+    Structural: backends only need matching methods. Subclassing it explicitly
+    also inherits the default batch_search.
+    """
+
+    # Bumped by implementations on every write so callers can invalidate cached searches
+    generation: int = 0
 
-    @abstractmethod
     async def create_collection(
         self,
         collection_name: str,
@@ -27,39 +131,57 @@ class VectorStore(ABC):
         distance: str = "Cosine"
     ) -> bool:
         """Create a vector collection"""
-        pass
+        ...
 
-    @abstractmethod
     async def upsert(
         self,
         collection_name: str,
         points: List[Dict[str, Any]]
     ) -> bool:
         """Upsert vectors into the collection"""
-        pass
+        ...
 
-    @abstractmethod
     async def search(
         self,
         collection_name: str,
         query_vector: List[float],
         limit: int = 10,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        payload_fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors"""
-        pass
+        """Search for similar vectors, returning only payload_fields when given"""
+        ...
+
+    async def batch_search(
+        self,
+        collection_name: str,
+        query_vectors: List[List[float]],
+        limit: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        payload_fields: Optional[List[str]] = None,
+        filters: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query vectors; backends override this with a single request
+
+        filters, when given, holds one filter per query vector and replaces filter
+        """
+        per_query = filters if filters is not None else [filter] * len(query_vectors)
+        return list(await asyncio.gather(*(
+            self.search(collection_name, vector, limit=limit, filter=query_filter, payload_fields=payload_fields)
+            for vector, query_filter in zip(query_vectors, per_query)
+        )))
 
-    @abstractmethod
     async def delete(
         self,
         collection_name: str,
         point_ids: List[str]
     ) -> bool:
         """Delete vectors by IDs"""
-        pass
+        ...
 
 
-class QdrantVectorStore(VectorStore):
+class QdrantVectorStore:
     """Qdrant implementation of vector storage"""
 
     def __init__(
@@ -67,49 +189,209 @@ class QdrantVectorStore(VectorStore):
         host: str = "localhost",
         port: int = 6333,
         collection_name: str = "multiwriter-embeddings",
-        vector_size: int = 768
+        vector_size: int = 768,
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        use_async: bool = True,
+        shared_client: Optional[bool] = None,
+        normalize: bool = True,
+        upsert_batch_size: int = 256,
+        upsert_concurrency: int = 4,
+        hnsw_m: int = 24,
+        ef_construction: int = 128,
+        quantization: str = "scalar",
+        vector_datatype: str = "float32",
+        ef_search: int = 100,
+        oversampling: Optional[float] = None,
+        retrieve_cache_size: int = 1000,
+        retrieve_cache_ttl: float = 300.0,
+        embedding_cache_size: int = 4096
     ):
         """
         Initialize Qdrant client
 
         Args:
             host: Qdrant host
-            port: Qdrant port
+            port: Qdrant HTTP port
             collection_name: Default collection name
             vector_size: Default vector dimension
+            prefer_grpc: Talk to Qdrant over gRPC, which has lower per-request overhead
+            grpc_port: Qdrant gRPC port
+            use_async: Use AsyncQdrantClient; False falls back to the sync client,
+                run on worker threads so the event loop is never blocked
+            shared_client: Reuse one client (and its connection pool) across stores
+                pointing at the same server. Defaults to True for sync clients only: a
+                shared async client stays bound to the event loop it first ran on, so
+                only share one when every store lives on the same loop
+            normalize: L2-normalize stored and query vectors client-side, which lets
+                "Cosine" collections be created with Qdrant's cheaper DOT distance.
+                Keep it on for any collection created that way. "Euclidean" and "Dot"
+                collections are never normalized; collections this store hasn't
+                created (or re-created) are assumed to be "Cosine" ones.
+            upsert_batch_size: Points per upsert request; all but the last batch are
+                sent without waiting for indexing
+            upsert_concurrency: Max upsert requests in flight at once
+            hnsw_m: HNSW edges per node for new collections
+            ef_construction: HNSW build-time candidate list size for new collections
+            quantization: Compressed in-RAM copy of vectors for new collections; the
+                originals stay for rescoring. "scalar" (int8, 4x smaller), "product"
+                (PQ, 32x smaller, lower recall), "binary" (1 bit per dim, best on
+                high-dim embeddings trained for it) or "none"
+            vector_datatype: Storage type of the original vectors in new collections,
+                "float32" or "float16" (half the size, ~3 significant digits)
+            ef_search: HNSW candidate list size per query; higher trades speed for recall
+            oversampling: With quantization, fetch limit * oversampling candidates from
+                the quantized index and rescore them against the original vectors;
+                defaults to 4 for binary quantization and 2 otherwise
+            retrieve_cache_size: Max retrieve_related results kept (0 disables)
+            retrieve_cache_ttl: Seconds a cached retrieve_related result stays valid;
+                writes through this store invalidate it immediately
+            embedding_cache_size: Max query embeddings reused by retrieve_related for
+                identical query text (0 disables). Assumes one embedding model per store.
         """
         self.host = host
         self.port = port
         self.collection_name = collection_name
         self.vector_size = vector_size
+        self.use_async = use_async
+        self.normalize = normalize
+        # Collection -> whether its vectors are normalized, recorded by create_collection
+        self._normalized_collections: Dict[str, bool] = {}
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_concurrency = upsert_concurrency
+        # Bumped on every write so callers can invalidate cached searches
+        self.generation = 0
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        if quantization not in QUANTIZATION_OVERSAMPLING:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        self.quantization = quantization
+        if oversampling is None:
+            oversampling = QUANTIZATION_OVERSAMPLING[quantization]
+        if vector_datatype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported vector_datatype: {vector_datatype}")
+        self.vector_datatype = Datatype(vector_datatype)
+        self.search_params = SearchParams(
+            hnsw_ef=ef_search,
+            quantization=QuantizationSearchParams(rescore=True, oversampling=oversampling) if oversampling else None
+        )
+        self.retrieve_cache_size = retrieve_cache_size
+        self.retrieve_cache_ttl = retrieve_cache_ttl
+        self.embedding_cache_size = embedding_cache_size
+        # (collection, query digest, top_k, entity_type) -> (expires_at, generation, results)
+        self._retrieve_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        # query digest -> embedding
+        self._embedding_cache: OrderedDict[bytes, Any] = OrderedDict()
+
+        if shared_client is None:
+            shared_client = not use_async
+        client_factory = _get_client if shared_client else _new_client
+        self.client = client_factory(host, port, grpc_port, prefer_grpc, use_async)
+        # frozenset(filter.items()) -> Filter; payload filters repeat a handful of values
+        self._filter_cache: Dict[frozenset, Filter] = {}
+        # Filters for retrieve_related's entity_type, built once up front
+        self._type_filters: Dict[str, Filter] = {
+            t.value: self._equality_filter({"type": t.value}) for t in EntityType
+        }
 
-        # Initialize async client
-        url = f"http://{host}:{port}"
-        self.client = AsyncQdrantClient(url=url)
+    async def _call(self, method: str, **kwargs) -> Any:
+        """Invoke a client method without blocking the event loop"""
+        if self.use_async:
+            return await getattr(self.client, method)(**kwargs)
+        return await asyncio.to_thread(getattr(self.client, method), **kwargs)
 
     def _get_distance(self, distance: str) -> Distance:
         """Convert distance string to Qdrant Distance enum"""
         distance_map = {
-            "Cosine": Distance.COSINE,
+            # On unit vectors cosine and dot product agree, without Qdrant's norm step
+            "Cosine": Distance.DOT if self.normalize else Distance.COSINE,
             "Euclidean": Distance.EUCLID,
             "Dot": Distance.DOT,
         }
-        return distance_map.get(distance, Distance.COSINE)
+        return distance_map.get(distance, distance_map["Cosine"])
+
+    def _normalizes(self, collection_name: str) -> bool:
+        """Whether vectors for the collection are L2-normalized client-side"""
+        return self._normalized_collections.get(collection_name, self.normalize)
+
+    def _prepare_vectors(self, collection_name: str, vectors: List[List[float]]) -> List[List[float]]:
+        """L2-normalize vectors (as one float32 batch) for collections that normalize"""
+        if not vectors or not self._normalizes(collection_name):
+            return vectors
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return (matrix / np.maximum(norms, 1e-12)).tolist()
+
+    @staticmethod
+    def _equality_filter(filter: Dict[str, Any]) -> Filter:
+        """Qdrant Filter matching every field of filter exactly"""
+        return Filter(must=[
+            FieldCondition(key=field, match=MatchValue(value=value))
+            for field, value in filter.items()
+        ])
+
+    def _type_filter(self, entity_type: Optional[str]) -> Optional[Filter]:
+        """Filter on payload type, precompiled for entity types"""
+        if not entity_type:
+            return None
+        return self._type_filters.get(entity_type) or self._build_filter({"type": entity_type})
+
+    def _build_filter(self, filter: Optional[Union[Dict[str, Any], Filter]]) -> Optional[Filter]:
+        """Convert an equality filter dict to a Qdrant Filter, reusing previously built ones"""
+        if not filter:
+            return None
+        if isinstance(filter, Filter):
+            return filter
+        key = frozenset(filter.items())
+        qdrant_filter = self._filter_cache.get(key)
+        if qdrant_filter is None:
+            qdrant_filter = self._equality_filter(filter)
+            if len(self._filter_cache) >= FILTER_CACHE_SIZE:
+                self._filter_cache.clear()
+            self._filter_cache[key] = qdrant_filter
+        return qdrant_filter
+
+    @staticmethod
+    def _quantization_config(mode: str) -> Any:
+        """Qdrant quantization config for a quantization mode"""
+        if mode == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+            )
+        if mode == "product":
+            return ProductQuantization(
+                product=ProductQuantizationConfig(compression=CompressionRatio.X32, always_ram=True)
+            )
+        if mode == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
 
     async def create_collection(
         self,
         collection_name: str,
         vector_size: int,
-        distance: str = "Cosine"
+        distance: str = "Cosine",
+        quantization: Optional[str] = None
     ) -> bool:
-        """Create a vector collection in Qdrant"""
+        """Create a vector collection in Qdrant, quantized per the store's mode unless overridden"""
+        mode = quantization or self.quantization
+        if mode not in QUANTIZATION_OVERSAMPLING:
+            raise ValueError(f"Unsupported quantization: {mode}")
+        # Only Cosine collections (also the fallback for unknown names) are normalized;
+        # Euclidean and Dot scores depend on vector magnitude
+        self._normalized_collections[collection_name] = (
+            self.normalize and distance not in ("Euclidean", "Dot")
+        )
         try:
-            await self.client.create_collection(
+            await self._call("create_collection",
                 collection_name=collection_name,
                 vectors_config=VectorParams(
                     size=vector_size,
-                    distance=self._get_distance(distance)
-                )
+                    distance=self._get_distance(distance),
+                    datatype=self.vector_datatype
+                ),
+                hnsw_config=HnswConfigDiff(m=self.hnsw_m, ef_construct=self.ef_construction),
+                quantization_config=self._quantization_config(mode)
             )
             return True
         except Exception as e:
@@ -125,28 +407,34 @@ class QdrantVectorStore(VectorStore):
     ) -> bool:
         """Upsert vectors into Qdrant"""
         try:
-            qdrant_points = []
-            for point in points:
-                point_id = point.get("id")
-                vector = point.get("vector")
-                payload = point.get("payload", {})
-
-                if point_id is None or vector is None:
-                    continue
-
-                qdrant_points.append(
-                    PointStruct(
-                        id=point_id,
-                        vector=vector,
-                        payload=payload
-                    )
+            valid = [p for p in points if p.get("id") is not None and p.get("vector") is not None]
+            vectors = self._prepare_vectors(collection_name, [p["vector"] for p in valid])
+            qdrant_points = [
+                PointStruct(
+                    id=point["id"],
+                    vector=vector,
+                    payload=point.get("payload", {})
                 )
+                for point, vector in zip(valid, vectors)
+            ]
 
             if qdrant_points:
-                await self.client.upsert(
-                    collection_name=collection_name,
-                    points=qdrant_points
-                )
+                batch_size = max(1, self.upsert_batch_size)
+                chunks = [
+                    qdrant_points[start:start + batch_size]
+                    for start in range(0, len(qdrant_points), batch_size)
+                ]
+                semaphore = asyncio.Semaphore(max(1, self.upsert_concurrency))
+
+                async def send(chunk: List[PointStruct], wait: bool):
+                    async with semaphore:
+                        await self._call("upsert", collection_name=collection_name, points=chunk, wait=wait)
+
+                await asyncio.gather(*(send(chunk, False) for chunk in chunks[:-1]))
+                # Updates apply in order of arrival, so sending the final batch after the
+                # others are acknowledged and waiting on it makes all of them visible
+                await send(chunks[-1], True)
+                self.generation += 1
             return True
         except Exception as e:
             raise RuntimeError(f"Qdrant upsert error: {str(e)}") from e
@@ -156,39 +444,76 @@ class QdrantVectorStore(VectorStore):
         collection_name: str,
         query_vector: List[float],
         limit: int = 10,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Union[Dict[str, Any], Filter]] = None,
+        payload_fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors in Qdrant"""
+        """Search for similar vectors in Qdrant (filter may be a prebuilt Filter)"""
         try:
-            # Build filter if provided
-            qdrant_filter = None
-            if filter:
-                conditions = []
-                for key, value in filter.items():
-                    conditions.append(
-                        FieldCondition(key=key, match=MatchValue(value=value))
-                    )
-                if conditions:
-                    qdrant_filter = Filter(must=conditions)
-
-            results = await self.client.search(
+            response = await self._call("query_points",
                 collection_name=collection_name,
-                query_vector=query_vector,
+                query=self._prepare_vectors(collection_name, [query_vector])[0],
                 limit=limit,
-                query_filter=qdrant_filter
+                query_filter=self._build_filter(filter),
+                search_params=self.search_params,
+                with_payload=list(payload_fields) if payload_fields else True
             )
 
             return [
                 {
-                    "id": result.id,
-                    "score": result.score,
-                    "payload": result.payload
+                    "id": point.id,
+                    "score": point.score,
+                    "payload": point.payload
                 }
-                for result in results
+                for point in response.points
             ]
         except Exception as e:
             raise RuntimeError(f"Qdrant search error: {str(e)}") from e
 
+    async def batch_search(
+        self,
+        collection_name: str,
+        query_vectors: List[List[float]],
+        limit: int = 10,
+        filter: Optional[Union[Dict[str, Any], Filter]] = None,
+        payload_fields: Optional[List[str]] = None,
+        filters: Optional[List[Optional[Union[Dict[str, Any], Filter]]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several query vectors in one Qdrant request"""
+        if not query_vectors:
+            return []
+        if filters is not None and len(filters) != len(query_vectors):
+            raise ValueError("filters must have one entry per query vector")
+        try:
+            per_query = filters if filters is not None else [filter] * len(query_vectors)
+            with_payload = list(payload_fields) if payload_fields else True
+            responses = await self._call("query_batch_points",
+                collection_name=collection_name,
+                requests=[
+                    QueryRequest(
+                        query=vector,
+                        limit=limit,
+                        filter=self._build_filter(query_filter),
+                        params=self.search_params,
+                        with_payload=with_payload
+                    )
+                    for vector, query_filter in zip(self._prepare_vectors(collection_name, query_vectors), per_query)
+                ]
+            )
+
+            return [
+                [
+                    {
+                        "id": point.id,
+                        "score": point.score,
+                        "payload": point.payload
+                    }
+                    for point in response.points
+                ]
+                for response in responses
+            ]
+        except Exception as e:
+            raise RuntimeError(f"Qdrant batch_search error: {str(e)}") from e
+
     async def delete(
         self,
         collection_name: str,
@@ -196,10 +521,11 @@ class QdrantVectorStore(VectorStore):
     ) -> bool:
         """Delete vectors by IDs from Qdrant"""
         try:
-            await self.client.delete(
+            await self._call("delete",
                 collection_name=collection_name,
                 points_selector=point_ids
             )
+            self.generation += 1
             return True
         except Exception as e:
             raise RuntimeError(f"Qdrant delete error: {str(e)}") from e
@@ -207,24 +533,24 @@ class QdrantVectorStore(VectorStore):
     async def retrieve_by_ids(
         self,
         collection_name: str,
-        entity_ids: List[str]
+        entity_ids: List[str],
+        payload_fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """Retrieve entities by their IDs (deterministic)"""
         try:
-            results = []
-            # Qdrant retrieve method
-            retrieved = await self.client.retrieve(
+            retrieved = await self._call("retrieve",
                 collection_name=collection_name,
-                ids=entity_ids
+                ids=entity_ids,
+                with_payload=list(payload_fields) if payload_fields else True
             )
 
-            for point in retrieved:
-                results.append({
-                    "id": str(point.id),
+            return [
+                {
+                    "id": point.id if isinstance(point.id, str) else str(point.id),
                     "payload": point.payload
-                })
-
-            return results
+                }
+                for point in retrieved
+            ]
         except Exception as e:
             raise RuntimeError(f"Qdrant retrieve_by_ids error: {str(e)}") from e
 
@@ -237,50 +563,342 @@ class QdrantVectorStore(VectorStore):
         entity_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Retrieve semantically related entities"""
-        # Generate embedding
-        query_embedding = await embedding_fn(query)
+        digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+        cache_key = (collection_name, digest, top_k, entity_type)
+        cached = self._cached_results(cache_key)
+        if cached is not None:
+            return cached
 
-        # Build filter if entity_type specified
-        filter_dict = None
-        if entity_type:
-            filter_dict = {"type": entity_type}
+        query_embedding = await self._embed_query(digest, query, embedding_fn)
 
-        return await self.search(
+        generation = self.generation
+        results = await self.search(
             collection_name=collection_name,
             query_vector=query_embedding,
             limit=top_k,
-            filter=filter_dict
+            filter=self._type_filter(entity_type)
         )
+        self._store_results(cache_key, generation, results)
+        return results
+
+    async def retrieve_related_batch(
+        self,
+        collection_name: str,
+        queries: List[str],
+        embedding_fn: Callable[[str], Any],
+        top_k: int = 10,
+        entity_types: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve related entities for several queries with one batched search
+
+        Args:
+            collection_name: Collection to search
+            queries: Query texts
+            embedding_fn: Async function returning the embedding of one text
+            top_k: Results per query
+            entity_types: Optional type filter per query (same length as queries)
+
+        Returns:
+            One result list per query, in order
+        """
+        if entity_types is not None and len(entity_types) != len(queries):
+            raise ValueError("entity_types must have one entry per query")
+        types = entity_types or [None] * len(queries)
+
+        results: List[Optional[List[Dict[str, Any]]]] = []
+        misses = []  # (index, cache key, digest)
+        for i, (query, entity_type) in enumerate(zip(queries, types)):
+            digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+            cache_key = (collection_name, digest, top_k, entity_type)
+            results.append(self._cached_results(cache_key))
+            if results[i] is None:
+                misses.append((i, cache_key, digest))
+        if not misses:
+            return results
+
+        embeddings = await asyncio.gather(*(
+            self._embed_query(digest, queries[i], embedding_fn) for i, _, digest in misses
+        ))
+        generation = self.generation
+        searched = await self.batch_search(
+            collection_name=collection_name,
+            query_vectors=list(embeddings),
+            limit=top_k,
+            filters=[self._type_filter(types[i]) for i, _, _ in misses]
+        )
+        for (i, cache_key, _), hits in zip(misses, searched):
+            self._store_results(cache_key, generation, hits)
+            results[i] = hits
+        return results
+
+    async def _embed_query(self, digest: bytes, query: str, embedding_fn: Callable[[str], Any]) -> Any:
+        """Embed a query, reusing the cached vector for text seen before"""
+        embedding = self._embedding_cache.get(digest)
+        if embedding is not None:
+            self._embedding_cache.move_to_end(digest)
+            return embedding
+        embedding = await embedding_fn(query)
+        if self.embedding_cache_size > 0:
+            self._cache_put(self._embedding_cache, digest, embedding, self.embedding_cache_size)
+        return embedding
+
+    def _cached_results(self, cache_key: tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of live cached retrieve results, or None"""
+        entry = self._retrieve_cache.get(cache_key)
+        if entry is None or entry[0] <= time.monotonic() or entry[1] != self.generation:
+            return None
+        self._retrieve_cache.move_to_end(cache_key)
+        # Copies, so callers can't mutate the cached payloads
+        return copy.deepcopy(entry[2])
+
+    def _store_results(self, cache_key: tuple, generation: int, results: List[Dict[str, Any]]):
+        """Cache retrieve results computed at the given store generation"""
+        if self.retrieve_cache_size > 0:
+            self._cache_put(
+                self._retrieve_cache,
+                cache_key,
+                (time.monotonic() + self.retrieve_cache_ttl, generation, copy.deepcopy(results)),
+                self.retrieve_cache_size
+            )
+
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key: Any, value: Any, max_size: int):
+        """Insert into an LRU cache, evicting the oldest entry when full"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+    async def bulk_reindex(
+        self,
+        collection_name: str,
+        registry: 'EntityRegistry',
+        full_content_map: Dict[str, str],
+        embedding_fn: Callable[[str], Any],
+        skip_unchanged: bool = True,
+        embedding_key: str = "",
+        wait_for_index: bool = True,
+        poll_interval: float = 0.5,
+        timeout: float = 300.0
+    ) -> bool:
+        """
+        Index a whole registry with HNSW construction deferred until the upload is done
+
+        Meant for initial loads: the whole collection's graph is dropped and rebuilt,
+        so use index_entities for incremental updates.
+
+        Args:
+            collection_name: Collection to index into
+            registry: Entities to index
+            full_content_map: Entity ID -> full content to embed
+            embedding_fn: Async function returning the embedding of one text
+            skip_unchanged: Don't re-embed entities whose stored content hash matches
+            embedding_key: Identifies the embedding model (e.g. "name:dims"); changing it
+                re-embeds every entity even when skip_unchanged is on
+            wait_for_index: Poll until the collection is green (index rebuilt)
+            poll_interval: Seconds between status polls
+            timeout: Max seconds to wait for the index
+        """
+        entries = await self._pending_entries(
+            collection_name, registry, full_content_map, skip_unchanged, embedding_key
+        )
+        if not entries:
+            return True
+
+        try:
+            # m=0 disables the graph, so points are stored without per-upsert HNSW work
+            await self._call("update_collection",
+                collection_name=collection_name,
+                hnsw_config=HnswConfigDiff(m=0)
+            )
+        except Exception as e:
+            raise RuntimeError(f"Qdrant update_collection error: {str(e)}") from e
+
+        try:
+            await self._index_entries(collection_name, registry, entries, embedding_fn)
+        except BaseException:
+            # Put the graph back, but let the indexing failure be what surfaces
+            try:
+                await self._restore_hnsw(collection_name)
+            except Exception as e:
+                logger.error(f"Failed to restore HNSW config on {collection_name}: {e}")
+            raise
+
+        try:
+            await self._restore_hnsw(collection_name)
+            if wait_for_index:
+                await self._wait_until_green(collection_name, poll_interval, timeout)
+        except Exception as e:
+            raise RuntimeError(f"Qdrant index rebuild error: {str(e)}") from e
+        return True
+
+    async def _restore_hnsw(self, collection_name: str):
+        """Re-enable the HNSW graph with the configured parameters"""
+        await self._call("update_collection",
+            collection_name=collection_name,
+            hnsw_config=HnswConfigDiff(m=self.hnsw_m, ef_construct=self.ef_construction)
+        )
+
+    async def _wait_until_green(self, collection_name: str, poll_interval: float, timeout: float):
+        """Poll collection status until optimization (index build) finishes"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            info = await self._call("get_collection", collection_name=collection_name)
+            if info.status == CollectionStatus.GREEN:
+                return
+            if asyncio.get_running_loop().time() >= deadline:
+                raise TimeoutError(f"Index for {collection_name} not ready after {timeout}s")
+            await asyncio.sleep(poll_interval)
+
+    async def snapshot(self, collection_name: str) -> str:
+        """Snapshot a collection (points, HNSW graph, quantization data) and return its name"""
+        try:
+            description = await self._call("create_snapshot", collection_name=collection_name, wait=True)
+            return description.name
+        except Exception as e:
+            raise RuntimeError(f"Qdrant snapshot error: {str(e)}") from e
+
+    async def restore(self, collection_name: str, location: str) -> bool:
+        """
+        Restore a collection from a snapshot instead of re-embedding and rebuilding it
+
+        Args:
+            collection_name: Collection to restore into (created if missing)
+            location: Snapshot URL as seen by the Qdrant server, e.g.
+                file:///qdrant/snapshots/<collection>/<name> or an http(s) URL
+        """
+        try:
+            await self._call("recover_snapshot", collection_name=collection_name, location=location, wait=True)
+            self.generation += 1
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Qdrant restore error: {str(e)}") from e
+
+    async def _stored_hashes(self, collection_name: str, entity_ids: List[str]) -> Dict[str, str]:
+        """content_hash payloads of the given points that are already stored"""
+        hashes = {}
+        for start in range(0, len(entity_ids), HASH_LOOKUP_BATCH_SIZE):
+            points = await self.retrieve_by_ids(
+                collection_name, entity_ids[start:start + HASH_LOOKUP_BATCH_SIZE], payload_fields=["content_hash"]
+            )
+            for point in points:
+                content_hash = (point["payload"] or {}).get("content_hash")
+                if content_hash:
+                    hashes[point["id"]] = content_hash
+        return hashes
+
+    async def _iter_points(
+        self,
+        registry: 'EntityRegistry',
+        entries: List[Tuple[str, str, str]],
+        embedding_fn: Callable[[str], Any],
+        batch_size: int = EMBED_BATCH_SIZE
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield embedded points for (entity_id, full_content, content_hash) entries, batch_size at a time"""
+        # Similar-length texts per slice keep batched embedding backends from padding
+        entries = sorted(entries, key=lambda entry: len(entry[1]), reverse=True)
+
+        semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+        async def embed(text: str) -> Any:
+            async with semaphore:
+                return await embedding_fn(text)
+
+        for start in range(0, len(entries), batch_size):
+            batch = entries[start:start + batch_size]
+            embeddings = await asyncio.gather(*(embed(content) for _, content, _ in batch))
+
+            points = []
+            for (entity_id, full_content, content_hash), embedding in zip(batch, embeddings):
+                entity = registry.entities[entity_id]
+                points.append({
+                    "id": entity_id,
+                    "vector": embedding,
+                    "payload": {
+                        "name": entity.name,
+                        "type": entity.entity_type_str,
+                        "summary": entity.summary,
+                        "content": full_content,
+                        "tags": entity.tags,
+                        "source_doc": entity.source_doc,
+                        "content_hash": content_hash
+                    }
+                })
+            yield points
 
     async def index_entities(
         self,
         collection_name: str,
         registry: 'EntityRegistry',
         full_content_map: Dict[str, str],
-        embedding_fn: Callable[[str], Any]
+        embedding_fn: Callable[[str], Any],
+        skip_unchanged: bool = True,
+        embedding_key: str = ""
     ) -> bool:
-        """Index all entities with their full content for retrieval"""
-        points = []
+        """
+        Index all entities with their full content for retrieval
 
+        Args:
+            collection_name: Collection to index into
+            registry: Entities to index
+            full_content_map: Entity ID -> full content to embed (defaults to the summary)
+            embedding_fn: Async function returning the embedding of one text
+            skip_unchanged: Don't re-embed entities whose stored content hash matches
+            embedding_key: Identifies the embedding model (e.g. "name:dims"); changing it
+                re-embeds every entity even when skip_unchanged is on
+        """
+        entries = await self._pending_entries(
+            collection_name, registry, full_content_map, skip_unchanged, embedding_key
+        )
+        await self._index_entries(collection_name, registry, entries, embedding_fn)
+        return True
+
+    async def _pending_entries(
+        self,
+        collection_name: str,
+        registry: 'EntityRegistry',
+        full_content_map: Dict[str, str],
+        skip_unchanged: bool,
+        embedding_key: str
+    ) -> List[Tuple[str, str, str]]:
+        """(entity_id, full_content, content_hash) for entities that need embedding"""
+        # Client-side normalization changes the stored vector too
+        embedding_key = f"{embedding_key}|normalize={self._normalizes(collection_name)}"
+        entries = []
         for entity_id, entity in registry.entities.items():
             full_content = full_content_map.get(entity_id, entity.summary)
+            entries.append((entity_id, full_content, _content_hash(entity, full_content, embedding_key)))
+        if skip_unchanged and entries:
+            stored = await self._stored_hashes(collection_name, [entity_id for entity_id, _, _ in entries])
+            entries = [entry for entry in entries if stored.get(entry[0]) != entry[2]]
+        return entries
 
-            # Generate embedding
-            embedding = await embedding_fn(full_content)
-
-            # entity_type may be an enum or string (depending on use_enum_values config)
-            entity_type_str = entity.entity_type.value if hasattr(entity.entity_type, 'value') else str(entity.entity_type)
-            points.append({
-                "id": entity_id,
-                "vector": embedding,
-                "payload": {
-                    "name": entity.name,
-                    "type": entity_type_str,
-                    "summary": entity.summary,
-                    "content": full_content,
-                    "tags": entity.tags,
-                    "source_doc": entity.source_doc
-                }
-            })
+    async def _index_entries(
+        self,
+        collection_name: str,
+        registry: 'EntityRegistry',
+        entries: List[Tuple[str, str, str]],
+        embedding_fn: Callable[[str], Any]
+    ):
+        """Embed and upsert (entity_id, full_content, content_hash) entries"""
+        # Embedding and upload run side by side; the bounded queue stops embedding
+        # from running more than INDEX_QUEUE_SIZE batches ahead of the upserts
+        queue: asyncio.Queue = asyncio.Queue(maxsize=INDEX_QUEUE_SIZE)
+
+        async def produce():
+            async for points in self._iter_points(registry, entries, embedding_fn):
+                await queue.put(points)
+            await queue.put(None)
 
-        return await self.upsert(collection_name, points)
+        async def consume():
+            while (points := await queue.get()) is not None:
+                await self.upsert(collection_name, points)
+
+        try:
+            async with asyncio.TaskGroup() as tasks:
+                tasks.create_task(produce())
+                tasks.create_task(consume())
+        except ExceptionGroup as group:
+            # Surface the failure itself (e.g. the upsert RuntimeError), not the group
+            raise group.exceptions[0]
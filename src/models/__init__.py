@@ -13,6 +13,7 @@ from .canon import (
     CanonEdge,
     CanonQuery,
     TimelineQuery,
+    Mutation,
     ValidationResult,
     NodeType,
     EdgeType
@@ -54,6 +55,7 @@ __all__ = [
     "CanonEdge",
     "CanonQuery",
     "TimelineQuery",
+    "Mutation",
     "ValidationResult",
     "NodeType",
     "EdgeType",
@@ -1,10 +1,10 @@
 """Canon Store schemas for GraphDB nodes and edges"""
 
 from enum import Enum
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Literal
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
-import uuid
+from .ids import new_id
 
 
 class NodeType(str, Enum):
@@ -60,7 +60,11 @@ class EdgeType(str, Enum):
 
 class CanonNode(BaseModel):
     """A node in the Canon Store graph"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Pydantic keeps field values in __dict__ and can't slot them; an empty __slots__
+    # still drops the per-instance __weakref__ slot for these high-cardinality objects
+    __slots__ = ()
+
+    id: str = Field(default_factory=new_id)
     type: NodeType
     properties: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -78,6 +82,8 @@ class CanonNode(BaseModel):
 
 class CanonEdge(BaseModel):
     """An edge in the Canon Store graph"""
+    __slots__ = ()
+
     source_id: str
     target_id: str
     type: EdgeType
@@ -108,6 +114,16 @@ class TimelineQuery(BaseModel):
     direction: str = Field(default="forward", pattern="^(forward|backward|both)$")
     max_depth: int = Field(default=10, ge=1, le=100)
     edge_types: Optional[List[EdgeType]] = None  # Default: [BEFORE, AFTER]
+    limit: int = Field(default=1000, ge=1)
+
+
+class Mutation(BaseModel):
+    """Shape of a proposed canon mutation, checked before semantic validation"""
+    type: Literal["node", "edge"]
+    operation: Literal["create", "update", "delete"]
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
 
 class ValidationResult(BaseModel):
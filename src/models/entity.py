@@ -2,8 +2,8 @@
 
 from enum import Enum
 from typing import List, Dict, Optional, Set
-from pydantic import BaseModel, Field, ConfigDict
-import uuid
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
+from .ids import new_id
 
 
 class EntityType(str, Enum):
@@ -20,25 +20,65 @@ class EntityType(str, Enum):
 
 class EntitySummary(BaseModel):
     """Compact entity reference for registry (~50 tokens max)"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Frozen: change an entity with model_copy(update=...) and re-add it. The empty
+    # __slots__ drops __weakref__, as on CanonNode.
+    __slots__ = ()
+
+    id: str = Field(default_factory=new_id)
     name: str = Field(..., description="Entity name")
     entity_type: EntityType = Field(..., description="Type of entity")
     summary: str = Field(..., max_length=200, description="1-2 sentence summary")
     tags: List[str] = Field(default_factory=list, description="Tags for categorization")
     source_doc: Optional[str] = Field(default=None, description="Source document")
 
-    model_config = ConfigDict(use_enum_values=True)
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+
+    _entity_type_str: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def entity_type_str(self) -> str:
+        """entity_type as a plain string, computed on first access"""
+        if self._entity_type_str is None:
+            # entity_type may be an enum or string (depending on use_enum_values config)
+            entity_type = self.entity_type
+            self._entity_type_str = entity_type.value if isinstance(entity_type, Enum) else str(entity_type)
+        return self._entity_type_str
+
+    def model_copy(self, *, update: Optional[Dict] = None, deep: bool = False) -> "EntitySummary":
+        copied = super().model_copy(update=update, deep=deep)
+        if update and "entity_type" in update:
+            copied._entity_type_str = None
+        return copied
 
 
 class EntityRegistry(BaseModel):
     """Compact registry of all entities (~8K tokens max)"""
     entities: Dict[str, EntitySummary] = Field(default_factory=dict, description="All entities by ID")
 
+    # entity_type_str -> ordered set (dict keys) of entity IDs; kept in sync by add/remove,
+    # so mutate entities through those rather than the dict directly
+    _type_index: Dict[str, Dict[str, None]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        for entity in self.entities.values():
+            self._type_index.setdefault(entity.entity_type_str, {})[entity.id] = None
+
     def add(self, entity: EntitySummary) -> str:
         """Add entity and return its ID"""
+        previous = self.entities.get(entity.id)
+        if previous is not None:
+            self._type_index.get(previous.entity_type_str, {}).pop(entity.id, None)
         self.entities[entity.id] = entity
+        self._type_index.setdefault(entity.entity_type_str, {})[entity.id] = None
         return entity.id
 
+    def remove(self, entity_id: str) -> Optional[EntitySummary]:
+        """Remove an entity by ID, returning it if it was present"""
+        entity = self.entities.pop(entity_id, None)
+        if entity is not None:
+            self._type_index.get(entity.entity_type_str, {}).pop(entity_id, None)
+        return entity
+
     def get(self, entity_id: str) -> Optional[EntitySummary]:
         """Get entity by ID"""
         return self.entities.get(entity_id)
@@ -47,7 +87,7 @@ class EntityRegistry(BaseModel):
         """Get all entities of a specific type"""
         # Handle both enum and string comparisons (due to use_enum_values=True)
         type_value = entity_type.value if isinstance(entity_type, EntityType) else str(entity_type)
-        return [e for e in self.entities.values() if (e.entity_type == entity_type or str(e.entity_type) == type_value)]
+        return [self.entities[entity_id] for entity_id in self._type_index.get(type_value, ())]
 
     def get_all_ids(self) -> Set[str]:
         """Get all entity IDs"""
@@ -59,19 +99,21 @@ class EntityRegistry(BaseModel):
         TOKENS_PER_CHAR = 4
         max_chars = max_tokens * TOKENS_PER_CHAR
 
+        # Length of "[" "] " ": " " - " around the fields, plus the newline
+        LINE_OVERHEAD = 9
+
         lines = []
         current_length = 0
         for entity in self.entities.values():
-            # entity_type may be an enum or string (depending on use_enum_values config)
-            entity_type_str = entity.entity_type.value if hasattr(entity.entity_type, 'value') else str(entity.entity_type)
-            line = f"[{entity.id}] {entity_type_str}: {entity.name} - {entity.summary}"
-            line_length = len(line) + 1  # +1 for newline
+            type_str = entity.entity_type_str
+            # Exact line length from the field lengths, so lines that won't fit are never formatted
+            line_length = LINE_OVERHEAD + len(entity.id) + len(type_str) + len(entity.name) + len(entity.summary)
 
             if current_length + line_length > max_chars:
                 lines.append("... (truncated)")
                 break
 
-            lines.append(line)
+            lines.append(f"[{entity.id}] {type_str}: {entity.name} - {entity.summary}")
             current_length += line_length
 
         return "\n".join(lines)
@@ -0,0 +1,19 @@
+"""Identifier generation for models"""
+
+import os
+import time
+
+_VERSION_MASK = ~(0xF << 76 | 0x3 << 62)
+_VERSION_BITS = 0x7 << 76 | 0x2 << 62  # version 7, RFC 9562 variant
+
+
+def new_id() -> str:
+    """
+    New time-ordered UUIDv7 string (RFC 9562)
+
+    The leading 48 bits are the Unix time in milliseconds, so IDs created together
+    sort together, which keeps index inserts local. The rest is random.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    hex_id = f"{value & _VERSION_MASK | _VERSION_BITS:032x}"
+    return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
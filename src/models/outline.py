@@ -2,8 +2,8 @@
 
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, field_serializer
-import uuid
+from pydantic import BaseModel, Field
+from .ids import new_id
 
 from .input import NovelInput
 from .theme import ThemeStatement
@@ -16,7 +16,7 @@ from .entity import EntityRegistry
 
 class NovelOutline(BaseModel):
     """Complete novel outline container"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     input: Optional[NovelInput] = None
 
     # Core components
@@ -39,8 +39,3 @@ class NovelOutline(BaseModel):
 
     # Additional metadata
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
-
-    @field_serializer('created_at', 'updated_at')
-    def serialize_datetime(self, value: datetime) -> str:
-        """Serialize datetime to ISO format"""
-        return value.isoformat() if value else None
@@ -2,7 +2,7 @@
 
 from enum import Enum
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
 
 
 class StoryStructure(str, Enum):
@@ -19,6 +19,8 @@ class StoryStructure(str, Enum):
 
 class PlotBeat(BaseModel):
     """A single plot beat"""
+    __slots__ = ()
+
     beat_number: int = Field(..., description="Beat number in sequence")
     beat_name: str = Field(..., description="Name of the beat")
     description: str = Field(..., description="What happens in this beat")
@@ -28,11 +30,16 @@ class PlotBeat(BaseModel):
     character_focus: Optional[str] = Field(default=None, description="Primary character for this beat")
     location: Optional[str] = Field(default=None, description="Location where beat occurs")
 
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
 
 class PlotStructure(BaseModel):
     """Overall plot structure"""
     structure_type: StoryStructure = Field(default=StoryStructure.THREE_ACT)
     beats: List[PlotBeat] = Field(default_factory=list, description="Plot beats in order")
-    acts: Optional[List[Dict[str, Any]]] = Field(default=None, description="Act structure if applicable")
+    # Free-form LLM output: SkipValidation passes it through without walking every value
+    acts: Optional[SkipValidation[List[Dict[str, Any]]]] = Field(default=None, description="Act structure if applicable")
     midpoint: Optional[str] = Field(default=None, description="Midpoint description")
     reversals: Optional[List[str]] = Field(default=None, description="Key plot reversals")
+
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
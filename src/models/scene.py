@@ -2,7 +2,7 @@
 
 from enum import Enum
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SceneType(str, Enum):
@@ -27,13 +27,19 @@ class SequelType(str, Enum):
 
 class SceneBeat(BaseModel):
     """A beat within a scene"""
+    __slots__ = ()
+
     beat_number: int = Field(..., description="Beat number in scene")
     description: str = Field(..., description="What happens in this beat")
     purpose: Optional[str] = Field(default=None, description="Purpose of this beat")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class SceneOutline(BaseModel):
     """Scene outline"""
+    __slots__ = ()
+
     scene_id: str = Field(..., description="Unique scene ID")
     scene_number: int = Field(..., description="Scene number in sequence")
     title: Optional[str] = Field(default=None, description="Scene title")
@@ -64,3 +70,7 @@ class SceneOutline(BaseModel):
     
     # Metadata
     notes: Optional[str] = Field(default=None, description="Additional notes")
+
+    # Built per scene from LLM output, which may carry extra keys: no forbid, and
+    # no defer_build so the first scene of a run does not pay for the schema build
+    model_config = ConfigDict(frozen=True)
@@ -1,7 +1,7 @@
 """Theme and premise models"""
 
 from typing import List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ThemeStatement(BaseModel):
@@ -10,3 +10,5 @@ class ThemeStatement(BaseModel):
     theme_question: str = Field(..., description="The thematic question the novel explores")
     moral_argument: str = Field(..., description="The moral argument/answer to the theme question")
     thematic_constraints: List[str] = Field(default_factory=list, description="Constraints to maintain thematic coherence")
+
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
@@ -1,7 +1,7 @@
 """Worldbuilding models"""
 
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
 
 
 class WorldRule(BaseModel):
@@ -11,6 +11,8 @@ class WorldRule(BaseModel):
     explanation: Optional[str] = Field(default=None, description="Explanation of the rule")
     importance: str = Field(default="medium", description="Importance: critical, high, medium, low")
 
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
 
 class MagicSystem(BaseModel):
     """Magic or technology system"""
@@ -20,6 +22,8 @@ class MagicSystem(BaseModel):
     limitations: List[str] = Field(default_factory=list, description="Limitations/constraints")
     rules: List[str] = Field(default_factory=list, description="Specific rules")
 
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
 
 class Location(BaseModel):
     """A location in the world"""
@@ -29,6 +33,8 @@ class Location(BaseModel):
     notable_features: List[str] = Field(default_factory=list, description="Notable features")
     significance: Optional[str] = Field(default=None, description="Significance to the story")
 
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
 
 class TimelineEvent(BaseModel):
     """A historical event"""
@@ -37,6 +43,8 @@ class TimelineEvent(BaseModel):
     description: str = Field(..., description="What happened")
     significance: Optional[str] = Field(default=None, description="Significance to current story")
 
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
 
 class WorldBuilding(BaseModel):
     """Complete worldbuilding information"""
@@ -45,7 +53,10 @@ class WorldBuilding(BaseModel):
     magic_systems: List[MagicSystem] = Field(default_factory=list, description="Magic/tech systems")
     locations: List[Location] = Field(default_factory=list, description="Locations")
     timeline: List[TimelineEvent] = Field(default_factory=list, description="Historical timeline")
-    cultures: Dict[str, Any] = Field(default_factory=dict, description="Cultural information")
-    political_systems: Dict[str, Any] = Field(default_factory=dict, description="Political systems")
-    economic_systems: Dict[str, Any] = Field(default_factory=dict, description="Economic systems")
+    # Free-form dicts: SkipValidation passes them through without walking every value
+    cultures: SkipValidation[Dict[str, Any]] = Field(default_factory=dict, description="Cultural information")
+    political_systems: SkipValidation[Dict[str, Any]] = Field(default_factory=dict, description="Political systems")
+    economic_systems: SkipValidation[Dict[str, Any]] = Field(default_factory=dict, description="Economic systems")
     consistency_constraints: List[str] = Field(default_factory=list, description="Constraints for consistency")
+
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
@@ -1,14 +1,25 @@
 """Orchestration logic for multi-agent workflows"""
 
-from .document_orchestrator import IterativeDocumentOrchestrator
-from .central_manager import CentralManager, AgentTask, AgentStatus
-from .planning_loop import PlanningLoop, QualityGate
-from .observability_manager import ObservabilityManager, Alert
-from .user_interaction_manager import UserInteractionManager, ApprovalRequest
-from .version_manager import VersionManager
+import importlib
+
+# Exports are imported on first access (PEP 562), so importing one submodule such as
+# canon_sync doesn't load every orchestrator and the agents and stores behind them
+_LAZY = {
+    "IterativeDocumentOrchestrator": ".document_orchestrator",
+    "CentralManager": ".central_manager",
+    "AgentTask": ".central_manager",
+    "AgentStatus": ".central_manager",
+    "PlanningLoop": ".planning_loop",
+    "QualityGate": ".planning_loop",
+    "ObservabilityManager": ".observability_manager",
+    "Alert": ".observability_manager",
+    "UserInteractionManager": ".user_interaction_manager",
+    "ApprovalRequest": ".user_interaction_manager",
+    "VersionManager": ".version_manager",
+}
 
 # Alias for compatibility
-DocumentOrchestrator = IterativeDocumentOrchestrator
+_ALIASES = {"DocumentOrchestrator": "IterativeDocumentOrchestrator"}
 
 __all__ = [
     "DocumentOrchestrator",
@@ -24,3 +35,16 @@ __all__ = [
     "ApprovalRequest",
     "VersionManager",
 ]
+
+
+def __getattr__(name):
+    target = _ALIASES.get(name, name)
+    if target not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[target], __name__), target)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,29 +1,77 @@
 """Outline ↔ Canon Sync Manager - Maintains consistency between outline and canon"""
 
 import logging
+import time
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 from src.memory.graph_store import GraphStore
 from src.validation.continuity import ContinuityValidationService
 from src.models.canon import CanonNode, CanonEdge, NodeType, EdgeType, ValidationResult
 from src.models.outline import NovelOutline
 from src.models.scene import SceneOutline
-from src.models.entity import EntityRegistry
+from src.models.entity import EntityRegistry, EntityType
 
 logger = logging.getLogger(__name__)
 
-# Map EntityRegistry entity_type to canon NodeType (for seed and sync)
-ENTITY_TYPE_TO_NODE_TYPE = {
-    "character": NodeType.CHARACTER,
-    "location": NodeType.LOCATION,
-    "organization": NodeType.ORGANIZATION,
-    "item": NodeType.OBJECT,
-    "event": NodeType.EVENT,
-    "rule": NodeType.RULE,
+# Map EntityRegistry entity_type to canon NodeType (for seed and sync). Keyed by the
+# str-enum members, so plain strings and EntityType members both look up directly.
+ENTITY_TYPE_TO_NODE_TYPE: Dict[EntityType, NodeType] = {
+    EntityType.CHARACTER: NodeType.CHARACTER,
+    EntityType.LOCATION: NodeType.LOCATION,
+    EntityType.ORGANIZATION: NodeType.ORGANIZATION,
+    EntityType.ITEM: NodeType.OBJECT,
+    EntityType.EVENT: NodeType.EVENT,
+    EntityType.RULE: NodeType.RULE,
 }
 
 
+def iso_now() -> str:
+    """Current UTC time as ISO-8601 text, to the second"""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def ns_to_iso(timestamp_ns: int) -> str:
+    """ISO-8601 text for a time.time_ns() timestamp, such as a change log entry's"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def _node_mutation(node_id: str, node_type: NodeType, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Create-node mutation in the shape validate_mutation expects"""
+    return {"type": "node", "operation": "create", "data": {"id": node_id, "type": node_type, "properties": properties}}
+
+
+def _scene_mutation(scene_node_id: str, scene: SceneOutline) -> Dict[str, Any]:
+    """Mutation creating the canon node for a scene"""
+    return _node_mutation(scene_node_id, NodeType.SCENE, {
+        "title": scene.title,
+        "scene_number": scene.scene_number,
+        "goal": scene.goal,
+        "conflict": scene.conflict,
+        "outcome": scene.outcome,
+        "stakes": scene.stakes,
+        "scene_type": scene.scene_type.value if scene.scene_type is not None else None,
+        "tension_start": scene.tension_start,
+        "tension_end": scene.tension_end
+    })
+
+
+def _entity_mutations(registry: EntityRegistry) -> List[Dict[str, Any]]:
+    """Mutations creating canon nodes for registry entities of mapped types"""
+    mutations = []
+    for entity_id, entity in registry.entities.items():
+        node_type = ENTITY_TYPE_TO_NODE_TYPE.get(entity.entity_type)
+        if not node_type:
+            continue  # Skip unmapped types
+        mutations.append(_node_mutation(entity_id, node_type, {
+            "name": entity.name,
+            "summary": entity.summary,
+            "tags": entity.tags or [],
+            "source_doc": entity.source_doc
+        }))
+    return mutations
+
+
 class CanonSyncManager:
     """Manages bidirectional sync between Outline and Canon Store"""
 
@@ -60,45 +108,9 @@ class CanonSyncManager:
             "violations": [],
             "warnings": [],
         }
-        for entity_id, entity in registry.entities.items():
-            entity_type_val = (
-                entity.entity_type.value
-                if hasattr(entity.entity_type, "value")
-                else str(entity.entity_type)
-            )
-            node_type = ENTITY_TYPE_TO_NODE_TYPE.get(entity_type_val)
-            if not node_type:
-                continue
-            mutation = {
-                "type": "node",
-                "operation": "create",
-                "data": {
-                    "id": entity_id,
-                    "type": node_type,
-                    "properties": {
-                        "name": entity.name,
-                        "summary": entity.summary,
-                        "tags": entity.tags or [],
-                        "source_doc": entity.source_doc,
-                    },
-                },
-            }
-            validation = await self.validation_service.validate_mutation(mutation)
-            if not validation.is_valid:
-                result["violations"].extend(validation.violations)
-                continue
-            node = CanonNode(
-                id=entity_id,
-                type=node_type,
-                properties=mutation["data"]["properties"],
-            )
-            existing = await self.graph_store.get_node(entity_id)
-            if existing:
-                await self.graph_store.update_node(entity_id, **node.properties)
-                result["nodes_updated"] += 1
-            else:
-                await self.graph_store.create_node(node)
-                result["nodes_created"] += 1
+        mutations = _entity_mutations(registry)
+        accepted = await self._validate_all(mutations, result)
+        await self._write_nodes(accepted, result)
         if result["violations"]:
             logger.warning(f"Seed registry: {len(result['violations'])} validation violations")
         logger.info(f"Seed registry to canon: {result['nodes_created']} created, {result['nodes_updated']} updated")
@@ -128,135 +140,107 @@ class CanonSyncManager:
             "dry_run": dry_run
         }
 
-        # Sync scenes as events
+        # Scenes become scene nodes, registry entities become typed nodes
+        mutations = []
+        scenes_by_node_id: Dict[str, SceneOutline] = {}
         for scene in outline.scenes:
             scene_node_id = f"scene_{scene.scene_number or 'unknown'}"
-
-            # Create/update scene node
-            mutation = {
-                "type": "node",
-                "operation": "create",
-                "data": {
-                    "id": scene_node_id,
-                    "type": NodeType.SCENE,
-                    "properties": {
-                        "title": scene.title,
-                        "scene_number": scene.scene_number,
-                        "goal": scene.goal,
-                        "conflict": scene.conflict,
-                        "outcome": scene.outcome,
-                        "stakes": scene.stakes,
-                        "scene_type": scene.scene_type.value if scene.scene_type else None,
-                        "tension_start": scene.tension_start,
-                        "tension_end": scene.tension_end
-                    }
-                }
-            }
-
-            validation = await self.validation_service.validate_mutation(mutation)
-            if not validation.is_valid:
-                result["violations"].extend(validation.violations)
-                logger.warning(f"Scene {scene_node_id} validation failed: {validation.violations}")
-                continue
-
-            if not dry_run:
-                # Create scene node
-                scene_node = CanonNode(
-                    id=scene_node_id,
-                    type=NodeType.SCENE,
-                    properties=mutation["data"]["properties"]
-                )
-                existing = await self.graph_store.get_node(scene_node_id)
-                if existing:
-                    await self.graph_store.update_node(scene_node_id, **scene_node.properties)
-                    result["nodes_updated"] += 1
-                else:
-                    await self.graph_store.create_node(scene_node)
-                    result["nodes_created"] += 1
+            scenes_by_node_id.setdefault(scene_node_id, scene)
+            mutations.append(_scene_mutation(scene_node_id, scene))
+        if outline.entity_registry:
+            mutations.extend(_entity_mutations(outline.entity_registry))
+
+        accepted = await self._validate_all(mutations, result)
+        if not dry_run:
+            # All nodes go in before any edge, so scene edges can point at entities synced alongside
+            await self._write_nodes(accepted, result)
+
+            # Edge rows are (source_id, target_id, type, properties), deduplicated on the
+            # first three so a repeated cast member doesn't cost a second write
+            appears_in, located_in = EdgeType.APPEARS_IN.value, EdgeType.LOCATED_IN.value
+            edge_rows = {}
+            for mutation in accepted:
+                scene_node_id = mutation["data"]["id"]
+                scene = scenes_by_node_id.get(scene_node_id)
+                if scene is None:
+                    continue
+                pov = scene.pov_character
 
                 # Create edges for characters
-                if scene.pov_character:
-                    char_edge = CanonEdge(
-                        source_id=scene_node_id,
-                        target_id=scene.pov_character,
-                        type=EdgeType.APPEARS_IN,
-                        properties={"pov": True}
-                    )
-                    await self.graph_store.create_edge(char_edge)
-                    result["edges_created"] += 1
-
-                if scene.characters_present:
-                    for char_id in scene.characters_present:
-                        if char_id != scene.pov_character:
-                            char_edge = CanonEdge(
-                                source_id=scene_node_id,
-                                target_id=char_id,
-                                type=EdgeType.APPEARS_IN,
-                                properties={"pov": False}
-                            )
-                            await self.graph_store.create_edge(char_edge)
-                            result["edges_created"] += 1
+                if pov:
+                    edge_rows.setdefault((scene_node_id, pov, appears_in), {"pov": True})
+
+                others = scene.characters_present
+                if pov and pov in others:
+                    others = [char_id for char_id in others if char_id != pov]
+                for char_id in others:
+                    edge_rows.setdefault((scene_node_id, char_id, appears_in), {"pov": False})
 
                 # Create edge for location
                 if scene.location_id:
-                    loc_edge = CanonEdge(
-                        source_id=scene_node_id,
-                        target_id=scene.location_id,
-                        type=EdgeType.LOCATED_IN
-                    )
-                    await self.graph_store.create_edge(loc_edge)
-                    result["edges_created"] += 1
-
-        # Sync entity registry to canon
-        if outline.entity_registry:
-            for entity_id, entity in outline.entity_registry.entities.items():
-                entity_type_val = (
-                    entity.entity_type.value
-                    if hasattr(entity.entity_type, "value")
-                    else str(entity.entity_type)
-                )
-                node_type = ENTITY_TYPE_TO_NODE_TYPE.get(entity_type_val)
-                if not node_type:
-                    continue  # Skip unmapped types
-
-                mutation = {
-                    "type": "node",
-                    "operation": "create",
-                    "data": {
-                        "id": entity_id,
-                        "type": node_type,
-                        "properties": {
-                            "name": entity.name,
-                            "summary": entity.summary,
-                            "tags": entity.tags,
-                            "source_doc": entity.source_doc
-                        }
-                    }
-                }
-
-                validation = await self.validation_service.validate_mutation(mutation)
-                if not validation.is_valid:
-                    result["violations"].extend(validation.violations)
-                    continue
+                    edge_rows.setdefault((scene_node_id, scene.location_id, located_in), {})
+
+            if edge_rows:
+                # model_construct: every field comes from accepted mutations or validated
+                # SceneOutlines. use_enum_values is skipped too, hence the .value types above.
+                make_edge = CanonEdge.model_construct
+                edges = [
+                    make_edge(source_id=source_id, target_id=target_id, type=edge_type, properties=properties)
+                    for (source_id, target_id, edge_type), properties in edge_rows.items()
+                ]
+                await self.graph_store.create_edges_batch(edges)
+                result["edges_created"] += len(edges)
 
-                if not dry_run:
-                    node = CanonNode(
-                        id=entity_id,
-                        type=node_type,
-                        properties=mutation["data"]["properties"]
-                    )
-                    existing = await self.graph_store.get_node(entity_id)
-                    if existing:
-                        await self.graph_store.update_node(entity_id, **node.properties)
-                        result["nodes_updated"] += 1
-                    else:
-                        await self.graph_store.create_node(node)
-                        result["nodes_created"] += 1
-
-        result["warnings"].extend(validation.warnings if validation else [])
         logger.info(f"Synced outline to canon: {result['nodes_created']} created, {result['nodes_updated']} updated, {result['edges_created']} edges")
         return result
 
+    async def _validate_all(
+        self,
+        mutations: List[Dict[str, Any]],
+        result: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Validate node mutations in one pass, recording issues in result; returns the accepted ones"""
+        validations = await self.validation_service.validate_mutations(mutations)
+        accepted = []
+        seen = set()
+        for mutation, validation in zip(mutations, validations):
+            node_id = mutation["data"]["id"]
+            result["warnings"].extend(validation.warnings)
+            if validation.is_valid and node_id in seen:
+                # Validated together, so a repeated ID isn't caught against the store
+                validation = ValidationResult(is_valid=True)
+                validation.add_violation("duplicate_id", f"Node {node_id} already exists")
+            if not validation.is_valid:
+                result["violations"].extend(validation.violations)
+                logger.warning(f"Node {node_id} validation failed: {validation.violations}")
+                continue
+            seen.add(node_id)
+            accepted.append(mutation)
+        return accepted
+
+    async def _write_nodes(self, mutations: List[Dict[str, Any]], result: Dict[str, Any]):
+        """Create or update the nodes for accepted mutations with one bulk call each"""
+        if not mutations:
+            return
+        existing = await self.graph_store.get_nodes([m["data"]["id"] for m in mutations])
+        new_nodes = []
+        updates = {}
+        for mutation in mutations:
+            data = mutation["data"]
+            if data["id"] in existing:
+                updates[data["id"]] = data["properties"]
+            else:
+                # Trusted input: the mutation already passed validate_mutation
+                new_nodes.append(CanonNode.model_construct(
+                    id=data["id"], type=NodeType(data["type"]).value, properties=data["properties"]
+                ))
+
+        # Sequential: inside a bound Neo4j session/transaction both calls share one session
+        await self.graph_store.create_nodes_batch(new_nodes)
+        await self.graph_store.update_nodes(updates)
+        result["nodes_created"] += len(new_nodes)
+        result["nodes_updated"] += len(updates)
+
     async def sync_canon_to_outline(
         self,
         outline: NovelOutline
@@ -281,14 +265,11 @@ class CanonSyncManager:
             return result
 
         try:
-            # Get all character nodes from canon
+            # Get all character and location nodes from canon. Not gathered: inside a bound
+            # Neo4j session/transaction both queries would share one session.
             from src.models.canon import CanonQuery, NodeType
-            character_query = CanonQuery(node_type=NodeType.CHARACTER)
-            canon_characters = await self.graph_store.query_nodes(character_query)
-
-            # Get all location nodes from canon
-            location_query = CanonQuery(node_type=NodeType.LOCATION)
-            canon_locations = await self.graph_store.query_nodes(location_query)
+            canon_characters = await self.graph_store.query_nodes(CanonQuery(node_type=NodeType.CHARACTER))
+            canon_locations = await self.graph_store.query_nodes(CanonQuery(node_type=NodeType.LOCATION))
 
             # Update outline with canonical states
             updated_scenes = []
@@ -335,7 +316,7 @@ class CanonSyncManager:
 
             # Update outline metadata
             if result["updated"] > 0:
-                outline["last_canon_sync"] = datetime.utcnow().isoformat()
+                outline["last_canon_sync"] = iso_now()
                 outline["canon_sync_version"] = outline.get("canon_sync_version", 0) + 1
 
             logger.info(f"Canon-to-outline sync: Updated {result['updated']} scenes")
@@ -352,11 +333,11 @@ class CanonSyncManager:
         changes: Dict[str, Any],
         agent: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create a change log entry"""
+        """Create a change log entry; format timestamp_ns with ns_to_iso when text is needed"""
         return {
             "operation": operation,
             "changes": changes,
             "agent": agent,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "outline_id": None  # Would be set by caller
         }
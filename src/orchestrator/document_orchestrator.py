@@ -120,7 +120,7 @@ class IterativeDocumentOrchestrator:
         # Index entities in vector store
         if self.vector_store:
             try:
-                await self._index_entities(registry, worldbuilding_path, characters_path, scenes_path)
+                await self._index_entities(registry, worldbuilding_path, characters_path, scenes_path, initial=True)
                 logger.info("  Entities indexed in vector store")
             except Exception as e:
                 logger.warning(f"  Failed to index entities in vector store: {e}")
@@ -237,9 +237,16 @@ class IterativeDocumentOrchestrator:
         registry: EntityRegistry,
         worldbuilding_path: Optional[Path],
         characters_path: Optional[Path],
-        scenes_path: Optional[Path]
+        scenes_path: Optional[Path],
+        initial: bool = False
     ):
-        """Index entities in vector store for RAG retrieval"""
+        """
+        Index entities in vector store for RAG retrieval
+
+        Args:
+            initial: First load of the run; uses the store's bulk path (HNSW build
+                deferred) when it has one. Later re-indexes are incremental.
+        """
         if not self.vector_store or not hasattr(self.llm_provider, 'get_embedding'):
             return
 
@@ -288,11 +295,17 @@ class IterativeDocumentOrchestrator:
         async def get_embedding(text: str) -> list[float]:
             return await self.llm_provider.get_embedding(text, model=embedding_model)
 
-        await self.vector_store.index_entities(
+        index = self.vector_store.index_entities
+        if initial:
+            # Whole-registry load: defer HNSW construction until every point is in
+            index = getattr(self.vector_store, "bulk_reindex", index)
+        await index(
             collection_name=collection_name,
             registry=registry,
             full_content_map=full_content_map,
-            embedding_fn=get_embedding
+            embedding_fn=get_embedding,
+            # Part of each entity's content hash, so a model change re-embeds everything
+            embedding_key=f"{embedding_model}:{vector_size}"
         )
 
     async def _index_arcs(self, arc_plan: Dict[str, Any]):
@@ -2,7 +2,7 @@
 
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-import uuid
+from src.models.ids import new_id
 
 from .document_parser import DocumentParser, ParsedSection
 from src.models import EntitySummary, EntityType, EntityRegistry
@@ -64,7 +64,7 @@ class EntityExtractor:
         tags = self._extract_tags(section.title, section.content)
 
         return EntitySummary(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             name=section.title,
             entity_type=entity_type,
             summary=summary,
@@ -1,14 +1,18 @@
 """Continuity Validation Service - Validates canon mutations before commit"""
 
+import asyncio
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from pydantic import TypeAdapter, ValidationError
+
 from src.memory.graph_store import GraphStore
 from src.models.canon import (
     CanonNode,
     CanonEdge,
+    Mutation,
     ValidationResult,
     NodeType,
     EdgeType
@@ -16,6 +20,9 @@ from src.models.canon import (
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; constructing a TypeAdapter compiles its validator
+_MUTATION_LIST_ADAPTER = TypeAdapter(List[Mutation])
+
 
 class ContinuityValidationService:
     """Validates canon mutations for contradictions and violations"""
@@ -87,6 +94,36 @@ class ContinuityValidationService:
 
         return result
 
+    async def validate_mutations(
+        self,
+        mutations: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[ValidationResult]:
+        """
+        Validate several mutations concurrently; results are in input order
+
+        The shape of every mutation is checked in a single pass first; malformed
+        ones fail with invalid_mutation and skip the store-backed checks.
+        """
+        malformed: Dict[int, ValidationResult] = {}
+        try:
+            _MUTATION_LIST_ADAPTER.validate_python(mutations)
+        except ValidationError as e:
+            for error in e.errors():
+                index, *field = error["loc"]
+                result = malformed.setdefault(index, ValidationResult(is_valid=True))
+                result.add_violation(
+                    "invalid_mutation",
+                    f"{'.'.join(map(str, field)) or 'mutation'}: {error['msg']}"
+                )
+
+        checked = await asyncio.gather(*(
+            self.validate_mutation(mutation, context)
+            for i, mutation in enumerate(mutations) if i not in malformed
+        ))
+        checked = iter(checked)
+        return [malformed[i] if i in malformed else next(checked) for i in range(len(mutations))]
+
     async def _validate_node_mutation(
         self,
         result: ValidationResult,
@@ -0,0 +1,86 @@
+"""Tests for outline -> canon sync"""
+
+import pytest
+
+from src.memory import InMemoryGraphStore
+from src.models import EntityRegistry, EntitySummary, EntityType, NovelOutline, SceneOutline
+from src.models.canon import EdgeType
+from src.orchestrator.canon_sync import CanonSyncManager
+from src.validation import ContinuityValidationService
+
+
+def make_scene(number, **kwargs):
+    return SceneOutline(
+        scene_id=f"s{number}", scene_number=number, goal="g", conflict="c", outcome="o", stakes="s", **kwargs
+    )
+
+
+class TestSyncOutlineToCanon:
+    """Test batched outline sync"""
+
+    @pytest.fixture
+    def outline(self):
+        registry = EntityRegistry()
+        registry.add(EntitySummary(id="alice", name="Alice", entity_type=EntityType.CHARACTER, summary="hero"))
+        registry.add(EntitySummary(id="castle", name="Castle", entity_type=EntityType.LOCATION, summary="keep"))
+        return NovelOutline(
+            scenes=[
+                make_scene(1, pov_character="alice", characters_present=["alice"], location_id="castle"),
+                make_scene(2, characters_present=["alice"]),
+            ],
+            entity_registry=registry,
+        )
+
+    @pytest.mark.asyncio
+    async def test_scene_edges_reach_entities_synced_alongside(self, outline):
+        """Nodes are written before edges, so scenes can link to entities from the same outline"""
+        graph = InMemoryGraphStore()
+        sync = CanonSyncManager(graph, ContinuityValidationService(graph))
+
+        result = await sync.sync_outline_to_canon(outline)
+        assert (result["nodes_created"], result["edges_created"], result["violations"]) == (4, 3, [])
+        pov = await graph.get_edges(source_id="scene_1", target_id="alice", edge_type=EdgeType.APPEARS_IN)
+        assert pov[0].properties == {"pov": True}
+        assert [e.target_id for e in await graph.get_edges(source_id="scene_1", edge_type=EdgeType.LOCATED_IN)] == ["castle"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_cast_members_make_one_edge(self, outline):
+        """A character listed twice in a scene gets a single APPEARS_IN edge"""
+        graph = InMemoryGraphStore()
+        sync = CanonSyncManager(graph, ContinuityValidationService(graph))
+        outline.scenes[1] = make_scene(2, characters_present=["alice", "alice"])
+
+        result = await sync.sync_outline_to_canon(outline)
+        assert result["edges_created"] == 3
+        assert len(await graph.get_edges(source_id="scene_2", target_id="alice")) == 1
+
+    @pytest.mark.asyncio
+    async def test_dry_run_and_duplicate_ids(self, outline):
+        """Dry runs write nothing; a repeated node ID in one outline is a violation"""
+        graph = InMemoryGraphStore()
+        sync = CanonSyncManager(graph, ContinuityValidationService(graph))
+        outline.scenes.append(make_scene(1))
+
+        result = await sync.sync_outline_to_canon(outline, dry_run=True)
+        assert result["nodes_created"] == 0 and await graph.get_nodes(["scene_1", "alice"]) == {}
+        assert [v["type"] for v in result["violations"]] == ["duplicate_id"]
+
+
+class TestValidateMutations:
+    """Test bulk mutation validation"""
+
+    @pytest.mark.asyncio
+    async def test_malformed_mutations_fail_in_place(self):
+        """Malformed mutations get invalid_mutation; well-formed ones are still checked, in order"""
+        graph = InMemoryGraphStore()
+        service = ContinuityValidationService(graph)
+        mutations = [
+            {"type": "node", "operation": "create", "data": {"id": "a", "type": "character"}},
+            {"type": "node", "operation": "rename", "data": {}, "extra": 1},
+            {"type": "edge", "operation": "create"},
+        ]
+
+        results = await service.validate_mutations(mutations)
+        assert [r.is_valid for r in results] == [True, False, False]
+        assert {v["type"] for v in results[1].violations} == {"invalid_mutation"}
+        assert len(results[1].violations) == 2
@@ -0,0 +1,33 @@
+"""Tests for the entity registry"""
+
+from src.models import EntityRegistry, EntitySummary, EntityType
+
+
+def make(entity_id, entity_type, name="x"):
+    return EntitySummary(id=entity_id, name=name, entity_type=entity_type, summary="s")
+
+
+class TestTypeIndex:
+    """Test get_by_type lookups through the type index"""
+
+    def test_get_by_type_tracks_add_and_remove(self):
+        """Lookups follow adds, re-typed re-adds and removals, in insertion order"""
+        registry = EntityRegistry(entities={"c1": make("c1", EntityType.CHARACTER)})
+        registry.add(make("l1", EntityType.LOCATION))
+        registry.add(make("c2", EntityType.CHARACTER))
+        assert [e.id for e in registry.get_by_type(EntityType.CHARACTER)] == ["c1", "c2"]
+
+        registry.add(make("c1", EntityType.LOCATION))
+        assert [e.id for e in registry.get_by_type("character")] == ["c2"]
+        assert [e.id for e in registry.get_by_type(EntityType.LOCATION)] == ["l1", "c1"]
+
+        assert registry.remove("l1").id == "l1"
+        assert registry.remove("l1") is None
+        assert [e.id for e in registry.get_by_type(EntityType.LOCATION)] == ["c1"]
+
+    def test_index_survives_serialization(self):
+        """Registries loaded from JSON rebuild the index"""
+        registry = EntityRegistry()
+        registry.add(make("c1", EntityType.CHARACTER))
+        loaded = EntityRegistry.model_validate_json(registry.model_dump_json())
+        assert [e.id for e in loaded.get_by_type(EntityType.CHARACTER)] == ["c1"]
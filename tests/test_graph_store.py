@@ -0,0 +1,218 @@
+"""Tests for the in-memory graph store"""
+
+import pytest
+
+from src.memory import InMemoryGraphStore
+from src.models.canon import CanonNode, CanonEdge, CanonQuery, TimelineQuery, NodeType, EdgeType
+
+
+@pytest.fixture
+async def graph_store():
+    """Small graph: two characters, one location, one scene"""
+    store = InMemoryGraphStore()
+    await store.create_node(CanonNode(id="char1", type=NodeType.CHARACTER, properties={"name": "Alice"}))
+    await store.create_node(CanonNode(id="char2", type=NodeType.CHARACTER, properties={"name": "Bob"}))
+    await store.create_node(CanonNode(id="loc1", type=NodeType.LOCATION, properties={"name": "Castle"}))
+    await store.create_node(CanonNode(id="scene_1", type=NodeType.SCENE, properties={"title": "Opening"}))
+    await store.create_edge(CanonEdge(source_id="scene_1", target_id="char1", type=EdgeType.APPEARS_IN))
+    await store.create_edge(CanonEdge(source_id="scene_1", target_id="loc1", type=EdgeType.LOCATED_IN))
+    return store
+
+
+class TestQueryNodes:
+    """Test query_nodes filtering"""
+
+    @pytest.mark.asyncio
+    async def test_query_by_type(self, graph_store):
+        """Type queries only return nodes of that type"""
+        nodes = await graph_store.query_nodes(CanonQuery(node_type=NodeType.CHARACTER))
+        assert {n.id for n in nodes} == {"char1", "char2"}
+
+    @pytest.mark.asyncio
+    async def test_query_by_id(self, graph_store):
+        """ID queries honour the type filter as well"""
+        nodes = await graph_store.query_nodes(CanonQuery(node_id="loc1"))
+        assert [n.id for n in nodes] == ["loc1"]
+
+        nodes = await graph_store.query_nodes(CanonQuery(node_id="loc1", node_type=NodeType.CHARACTER))
+        assert nodes == []
+
+    @pytest.mark.asyncio
+    async def test_query_by_properties_and_limit(self, graph_store):
+        """Property filters and limit are applied"""
+        nodes = await graph_store.query_nodes(
+            CanonQuery(node_type=NodeType.CHARACTER, properties_filter={"name": "Bob"})
+        )
+        assert [n.id for n in nodes] == ["char2"]
+
+        nodes = await graph_store.query_nodes(CanonQuery(limit=2))
+        assert len(nodes) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_nodes(self, graph_store):
+        """Bulk lookup returns found nodes keyed by id"""
+        nodes = await graph_store.get_nodes(["char1", "missing", "loc1"])
+        assert set(nodes) == {"char1", "loc1"}
+        assert nodes["loc1"].properties["name"] == "Castle"
+
+    @pytest.mark.asyncio
+    async def test_type_index_tracks_deletes(self, graph_store):
+        """Deleted nodes disappear from type queries"""
+        assert await graph_store.delete_node("char1")
+        nodes = await graph_store.query_nodes(CanonQuery(node_type=NodeType.CHARACTER))
+        assert [n.id for n in nodes] == ["char2"]
+
+        await graph_store.clear()
+        assert await graph_store.query_nodes(CanonQuery(node_type=NodeType.CHARACTER)) == []
+
+
+class TestEdges:
+    """Test edge bookkeeping"""
+
+    @pytest.mark.asyncio
+    async def test_delete_node_removes_its_edges(self, graph_store):
+        """Incoming, outgoing and self-loop edges all go with the node"""
+        await graph_store.create_edge(CanonEdge(source_id="char1", target_id="loc1", type=EdgeType.LOCATED_IN))
+        await graph_store.create_edge(CanonEdge(source_id="char1", target_id="char1", type=EdgeType.FEARS))
+
+        assert await graph_store.delete_node("char1")
+        assert all("char1" not in (e.source_id, e.target_id) for e in await graph_store.get_edges())
+        assert [e.target_id for e in await graph_store.get_edges(source_id="scene_1")] == ["loc1"]
+        assert await graph_store.get_edges(target_id="loc1") == await graph_store.get_edges(source_id="scene_1")
+        assert all("char1" not in key for key in graph_store.edge_index)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_edge_merges_properties(self, graph_store):
+        """Re-creating an edge updates the existing one"""
+        await graph_store.create_edge(
+            CanonEdge(source_id="scene_1", target_id="char1", type=EdgeType.APPEARS_IN, properties={"pov": True})
+        )
+        edges = await graph_store.get_edges(source_id="scene_1", edge_type=EdgeType.APPEARS_IN)
+        assert len(edges) == 1 and edges[0].properties == {"pov": True}
+
+        assert await graph_store.delete_edge("scene_1", "char1", EdgeType.APPEARS_IN)
+        assert not await graph_store.delete_edge("scene_1", "char1", EdgeType.APPEARS_IN)
+        assert await graph_store.get_neighbors("char1") == []
+
+    @pytest.mark.asyncio
+    async def test_batch_create(self, graph_store):
+        """Batch creation goes through the same validation as single creates"""
+        await graph_store.create_nodes_batch([
+            CanonNode(id="e1", type=NodeType.EVENT),
+            CanonNode(id="e2", type=NodeType.EVENT),
+        ])
+        await graph_store.create_edges_batch([
+            CanonEdge(source_id="e1", target_id="e2", type=EdgeType.BEFORE),
+            CanonEdge(source_id="e2", target_id="char1", type=EdgeType.INTRODUCED_IN),
+        ])
+        assert [e.target_id for e in await graph_store.get_edges(source_id="e1")] == ["e2"]
+
+        with pytest.raises(ValueError):
+            await graph_store.create_edges_batch([CanonEdge(source_id="e1", target_id="nope", type=EdgeType.AFTER)])
+
+
+class TestTraversal:
+    """Test timeline and related-entity traversal"""
+
+    @pytest.fixture
+    async def timeline(self):
+        """Diamond of events: e1 -> (e2, e3) -> e4 -> e5 via AFTER edges"""
+        store = InMemoryGraphStore()
+        for i in range(1, 6):
+            await store.create_node(CanonNode(id=f"e{i}", type=NodeType.EVENT))
+        for source, target in [("e1", "e2"), ("e1", "e3"), ("e2", "e4"), ("e3", "e4"), ("e4", "e5")]:
+            await store.create_edge(CanonEdge(source_id=source, target_id=target, type=EdgeType.AFTER))
+        return store
+
+    @pytest.mark.asyncio
+    async def test_query_timeline_visits_each_node_once(self, timeline):
+        """Reconverging paths don't duplicate nodes"""
+        nodes = await timeline.query_timeline(TimelineQuery(start_node_id="e1", direction="forward"))
+        assert [n.id for n in nodes][:1] == ["e1"]
+        assert sorted(n.id for n in nodes) == ["e1", "e2", "e3", "e4", "e5"]
+
+    @pytest.mark.asyncio
+    async def test_query_timeline_respects_max_depth(self, timeline):
+        """Nodes beyond max_depth hops are not returned"""
+        nodes = await timeline.query_timeline(TimelineQuery(start_node_id="e1", direction="forward", max_depth=2))
+        assert sorted(n.id for n in nodes) == ["e1", "e2", "e3", "e4"]
+
+        nodes = await timeline.query_timeline(TimelineQuery(start_node_id="e1", direction="forward", limit=2))
+        assert len(nodes) == 2 and nodes[0].id == "e1"
+
+    @pytest.mark.asyncio
+    async def test_get_related_entities(self, timeline):
+        """Related entities exclude the start node and stop at max_depth"""
+        nodes = await timeline.get_related_entities("e4", max_depth=1)
+        assert sorted(n.id for n in nodes) == ["e2", "e3", "e5"]
+
+    @pytest.mark.asyncio
+    async def test_sync_reads_match_async(self, timeline):
+        """The *_sync fast paths return the same results as the async API"""
+        query = TimelineQuery(start_node_id="e1", direction="forward")
+        assert timeline.query_timeline_sync(query) == await timeline.query_timeline(query)
+        assert timeline.get_node_sync("e2") is await timeline.get_node("e2")
+        assert timeline.get_edges_sync(source_id="e1") == await timeline.get_edges(source_id="e1")
+        assert timeline.check_cycle_sync("e1") is False
+
+    @pytest.mark.asyncio
+    async def test_bulk_query_timeline_matches_query_timeline(self, timeline):
+        """Vectorized multi-seed traversal reaches the same nodes as query_timeline"""
+        await timeline.create_node(CanonNode(id="e0", type=NodeType.EVENT))
+        await timeline.create_edge(CanonEdge(source_id="e0", target_id="e1", type=EdgeType.BEFORE))
+
+        for direction in ("forward", "backward", "both"):
+            bulk = timeline.bulk_query_timeline(["e1", "e4", "missing"], direction=direction)
+            for start in ("e1", "e4"):
+                expected = await timeline.query_timeline(TimelineQuery(start_node_id=start, direction=direction))
+                assert bulk[start][0].id == start
+                assert {n.id for n in bulk[start]} == {n.id for n in expected}
+            assert bulk["missing"] == []
+
+    @pytest.mark.asyncio
+    async def test_csr_rebuilt_after_mutation(self, timeline):
+        """The CSR snapshot reflects edges added after it was built"""
+        assert timeline.csr().out_degree().tolist() == [2, 1, 1, 1, 0]
+        await timeline.create_edge(CanonEdge(source_id="e5", target_id="e1", type=EdgeType.AFTER))
+        assert timeline.csr().out_degree().tolist() == [2, 1, 1, 1, 1]
+
+
+class TestSnapshots:
+    """Test copy-on-write snapshots"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_isolated_from_later_writes(self, graph_store):
+        """Writes after snapshot() are invisible to the snapshot"""
+        snap = graph_store.snapshot()
+
+        await graph_store.update_node("char1", name="Alicia")
+        await graph_store.create_node(CanonNode(id="char3", type=NodeType.CHARACTER))
+        await graph_store.create_edge(
+            CanonEdge(source_id="scene_1", target_id="char1", type=EdgeType.APPEARS_IN, properties={"pov": True})
+        )
+        await graph_store.delete_node("loc1")
+
+        assert snap.get_node_sync("char1").properties["name"] == "Alice"
+        assert snap.get_node_sync("char3") is None
+        assert {n.id for n in snap.query_nodes_sync(CanonQuery(node_type=NodeType.CHARACTER))} == {"char1", "char2"}
+        assert snap.get_edges_sync(source_id="scene_1", target_id="char1")[0].properties == {}
+        assert {n.id for n in snap.get_neighbors_sync("scene_1")} == {"char1", "loc1"}
+
+        assert (await graph_store.get_node("char1")).properties["name"] == "Alicia"
+        assert {n.id for n in await graph_store.get_neighbors("scene_1")} == {"char1"}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_read_only(self, graph_store):
+        """Mutating a snapshot raises"""
+        snap = graph_store.snapshot()
+        with pytest.raises(RuntimeError):
+            await snap.create_node(CanonNode(id="x", type=NodeType.EVENT))
+        with pytest.raises(RuntimeError):
+            await snap.clear()
+
+    @pytest.mark.asyncio
+    async def test_updates_in_place_without_snapshots(self, graph_store):
+        """Without snapshots, update_node keeps mutating the stored object"""
+        node = await graph_store.get_node("char1")
+        await graph_store.update_node("char1", name="Alicia")
+        assert node.properties["name"] == "Alicia"
@@ -0,0 +1,193 @@
+"""Tests for local file-based storage"""
+
+import asyncio
+import pytest
+from datetime import datetime
+
+from src.memory import LocalFileState, LocalLogState, LocalObjectStore
+
+
+@pytest.fixture
+def state(tmp_path):
+    """Local file state rooted in a temp directory"""
+    return LocalFileState(storage_dir=str(tmp_path / "data"))
+
+
+@pytest.fixture
+def object_store(tmp_path):
+    """Local object store rooted in a temp directory"""
+    return LocalObjectStore(storage_dir=str(tmp_path / "objects"))
+
+
+class TestLocalFileState:
+    """Test LocalFileState read/write/query"""
+
+    @pytest.mark.asyncio
+    async def test_write_and_read_roundtrip(self, state):
+        """Datetimes are stored as ISO strings, other values unchanged"""
+        created = datetime(2024, 1, 2, 3, 4, 5)
+        await state.write("outlines", {"id": "n1", "title": "Book", "created_at": created, "tags": ["a"]})
+
+        item = await state.read("outlines", {"id": "n1"})
+        assert item == {"id": "n1", "title": "Book", "created_at": created.isoformat(), "tags": ["a"]}
+        assert await state.read("outlines", {"id": "missing"}) is None
+
+    @pytest.mark.asyncio
+    async def test_write_requires_id(self, state):
+        """Items without an id are rejected"""
+        with pytest.raises(ValueError):
+            await state.write("outlines", {"title": "No id"})
+
+    @pytest.mark.asyncio
+    async def test_update(self, state):
+        """Updates merge into the stored item"""
+        await state.write("outlines", {"id": "n1", "status": "draft"})
+        assert await state.update("outlines", {"id": "n1"}, {"status": "done", "nested": {"at": datetime(2024, 1, 1)}})
+        assert not await state.update("outlines", {"id": "missing"}, {"status": "done"})
+
+        item = await state.read("outlines", {"id": "n1"})
+        assert item["status"] == "done"
+        assert item["nested"] == {"at": "2024-01-01T00:00:00"}
+
+    @pytest.mark.asyncio
+    async def test_read_cache(self, tmp_path):
+        """Cached reads return independent copies and see writes"""
+        state = LocalFileState(storage_dir=str(tmp_path / "data"), read_cache_size=1)
+        await state.write("outlines", {"id": "n1", "tags": ["a"]})
+        await state.write("outlines", {"id": "n2"})
+
+        first = await state.read("outlines", {"id": "n1"})
+        first["tags"].append("mutated")
+        assert (await state.read("outlines", {"id": "n1"}))["tags"] == ["a"]
+
+        await state.update("outlines", {"id": "n1"}, {"tags": ["b"]})
+        assert (await state.read("outlines", {"id": "n1"}))["tags"] == ["b"]
+
+        # Capacity 1: reading n2 evicts n1
+        await state.read("outlines", {"id": "n2"})
+        assert list(state._read_cache) == [("outlines", "n2")]
+
+        await state.delete("outlines", {"id": "n2"})
+        assert await state.read("outlines", {"id": "n2"}) is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_are_not_lost(self, state):
+        """Updates running on worker threads don't clobber each other"""
+        await state.write("outlines", {"id": "n1"})
+        await asyncio.gather(*(
+            state.update("outlines", {"id": "n1"}, {f"field_{i}": i}) for i in range(20)
+        ))
+
+        item = await state.read("outlines", {"id": "n1"})
+        assert all(item[f"field_{i}"] == i for i in range(20))
+
+    @pytest.mark.asyncio
+    async def test_query_and_list_all(self, state):
+        """Query filters on key condition; list_all returns everything"""
+        await state.write("versions", {"id": "v1", "novel_id": "a"})
+        await state.write("versions", {"id": "v2", "novel_id": "b"})
+        await state.write("versions", {"id": "v3", "novel_id": "a"})
+
+        items = await state.query("versions", {"novel_id": "a"})
+        assert sorted(i["id"] for i in items) == ["v1", "v3"]
+        assert len(await state.list_all("versions")) == 3
+
+    @pytest.mark.asyncio
+    async def test_delete(self, state):
+        """Deleted items can no longer be read"""
+        await state.write("outlines", {"id": "n1"})
+        assert await state.delete("outlines", {"id": "n1"})
+        assert not await state.delete("outlines", {"id": "n1"})
+        assert await state.read("outlines", {"id": "n1"}) is None
+
+
+class TestLocalLogState:
+    """Test the packed per-table log layout"""
+
+    @pytest.mark.asyncio
+    async def test_crud_roundtrip(self, tmp_path):
+        """Writes, updates and deletes are visible through read/query/list_all"""
+        state = LocalLogState(storage_dir=str(tmp_path / "data"))
+        await state.write("versions", {"id": "v1", "novel_id": "a", "at": datetime(2024, 1, 1)})
+        await state.write("versions", {"id": "v2", "novel_id": "b"})
+        await state.write("versions", {"id": "v3", "novel_id": "a"})
+
+        assert await state.read("versions", {"id": "v1"}) == {"id": "v1", "novel_id": "a", "at": "2024-01-01T00:00:00"}
+        assert sorted(i["id"] for i in await state.query("versions", {"novel_id": "a"})) == ["v1", "v3"]
+
+        assert await state.update("versions", {"id": "v3"}, {"novel_id": "b"})
+        assert not await state.update("versions", {"id": "missing"}, {"novel_id": "b"})
+        assert await state.delete("versions", {"id": "v1"})
+        assert not await state.delete("versions", {"id": "v1"})
+
+        assert await state.read("versions", {"id": "v1"}) is None
+        assert sorted(i["id"] for i in await state.list_all("versions")) == ["v2", "v3"]
+        assert (await state.read("versions", {"id": "v3"}))["novel_id"] == "b"
+        state.close()
+
+    @pytest.mark.asyncio
+    async def test_reopen_and_compact(self, tmp_path):
+        """The index is rebuilt from the log on reopen; compaction keeps live records"""
+        state = LocalLogState(storage_dir=str(tmp_path / "data"), compact_min_bytes=0)
+        for i in range(5):
+            await state.write("outlines", {"id": "n1", "rev": i})
+        await state.write("outlines", {"id": "n2", "rev": 0})
+        state.close()
+
+        log_path = tmp_path / "data" / "outlines.log"
+        assert len(log_path.read_bytes().splitlines()) == 2
+
+        reopened = LocalLogState(storage_dir=str(tmp_path / "data"))
+        assert (await reopened.read("outlines", {"id": "n1"}))["rev"] == 4
+        assert len(await reopened.list_all("outlines")) == 2
+        reopened.close()
+
+
+class TestLocalObjectStore:
+    """Test LocalObjectStore upload/download/list"""
+
+    @pytest.mark.asyncio
+    async def test_upload_download_delete(self, object_store):
+        """Objects round-trip and can be deleted"""
+        await object_store.upload("entities/e1/content.txt", b"hello", metadata={"k": "v", "at": datetime(2024, 1, 1)})
+        assert await object_store.download("entities/e1/content.txt") == b"hello"
+        assert await object_store.delete("entities/e1/content.txt")
+        assert await object_store.download("entities/e1/content.txt") is None
+
+    @pytest.mark.asyncio
+    async def test_download_many(self, object_store):
+        """Batch downloads keep key order and return None for missing keys"""
+        await object_store.upload("a.txt", b"a")
+        await object_store.upload("b.txt", b"b")
+        assert await object_store.download_many(["b.txt", "missing", "a.txt"]) == [b"b", None, b"a"]
+        assert await object_store.download_many_text(["a.txt", "missing"]) == ["a", None]
+
+    @pytest.mark.asyncio
+    async def test_list_with_prefix(self, object_store):
+        """Listing skips metadata files and honours prefixes"""
+        await object_store.upload("entities/e1/content.txt", b"1", metadata={"k": "v"})
+        await object_store.upload("entities/e2/content.txt", b"2")
+        await object_store.upload("outlines/o1.md", b"3")
+
+        assert sorted(await object_store.list()) == [
+            "entities/e1/content.txt",
+            "entities/e2/content.txt",
+            "outlines/o1.md",
+        ]
+        assert sorted(await object_store.list("entities")) == [
+            "entities/e1/content.txt",
+            "entities/e2/content.txt",
+        ]
+        assert await object_store.list("outlines/o") == ["outlines/o1.md"]
+
+    @pytest.mark.asyncio
+    async def test_manifest_rebuilt_from_existing_files(self, tmp_path):
+        """Objects already on disk are indexed when the manifest is missing"""
+        objects_dir = tmp_path / "objects"
+        (objects_dir / "entities" / "e1").mkdir(parents=True)
+        (objects_dir / "entities" / "e1" / "content.txt").write_bytes(b"1")
+        (objects_dir / "entities" / "e1" / "content.txt.meta.json").write_text("{}")
+
+        store = LocalObjectStore(storage_dir=str(objects_dir))
+        assert await store.list() == ["entities/e1/content.txt"]
+        store.close()
@@ -0,0 +1,176 @@
+"""Tests for hybrid RAG retrieval"""
+
+import pytest
+
+from src.memory import HybridRAGRetrieval, InMemoryGraphStore, LocalObjectStore, SemanticQueryCache, VectorStore
+from src.models.canon import CanonNode, CanonEdge, NodeType, EdgeType
+
+
+class FakeVectorStore(VectorStore):
+    """Vector store that returns fixed hits and counts searches"""
+
+    def __init__(self, hits):
+        self.hits = hits
+        self.searches = 0
+
+    async def create_collection(self, collection_name, vector_size, distance="Cosine"):
+        return True
+
+    async def upsert(self, collection_name, points):
+        self.generation += 1
+        return True
+
+    async def search(self, collection_name, query_vector, limit=10, filter=None, payload_fields=None):
+        self.searches += 1
+        return [dict(hit) for hit in self.hits[:limit]]
+
+    async def delete(self, collection_name, point_ids):
+        self.generation += 1
+        return True
+
+    async def retrieve_by_ids(self, collection_name, entity_ids, payload_fields=None):
+        return [{"id": hit["id"], "payload": hit["payload"]} for hit in self.hits if hit["id"] in entity_ids]
+
+
+async def embed(text):
+    """Toy embedding: near-identical for queries sharing a first letter"""
+    return [1.0, 0.01 * len(text)] if text.startswith("a") else [0.0, 1.0]
+
+
+class TestEnrichment:
+    """Test graph and blob enrichment of retrieval results"""
+
+    @pytest.mark.asyncio
+    async def test_retrieve_enriches_each_hit(self, tmp_path):
+        """Canon nodes, relationships, timeline facts and content are attached per hit"""
+        graph = InMemoryGraphStore()
+        await graph.create_node(CanonNode(id="s1", type=NodeType.SCENE))
+        await graph.create_node(CanonNode(id="s2", type=NodeType.SCENE))
+        await graph.create_node(CanonNode(id="c1", type=NodeType.CHARACTER, properties={"name": "Alice"}))
+        await graph.create_edge(CanonEdge(source_id="s1", target_id="s2", type=EdgeType.BEFORE))
+        await graph.create_edge(CanonEdge(source_id="s1", target_id="c1", type=EdgeType.APPEARS_IN))
+        objects = LocalObjectStore(storage_dir=str(tmp_path))
+        await objects.upload("entities/c1/content.txt", b"full text")
+
+        hits = [{"id": i, "score": 1.0, "payload": {}} for i in ("s1", "c1", "missing")]
+        rag = HybridRAGRetrieval(FakeVectorStore(hits), graph_store=graph, object_store=objects)
+        results = {r["id"]: r for r in await rag.retrieve("q", embed, include_full_content=True)}
+
+        assert results["s1"]["canon_facts"] == [{"type": "timeline", "before_events": 1}]
+        assert {r["name"] for r in results["s1"]["relationships"]} == {"Alice", "s2"}
+        assert results["c1"]["canon_node"]["type"] == "character"
+        assert results["c1"]["full_content"] == "full text"
+        assert "canon_node" not in results["missing"] and results["missing"]["full_content"] is None
+
+        by_id = await rag.retrieve_by_ids(["c1"])
+        assert [r["name"] for r in by_id[0]["relationships"]] == ["s1"]
+
+        batches = await rag.retrieve_batch(["q1", "q2"], embed, top_k=2)
+        assert [[r["id"] for r in batch] for batch in batches] == [["s1", "c1"], ["s1", "c1"]]
+        assert batches[1][0]["canon_facts"] == results["s1"]["canon_facts"]
+        assert batches[1][0]["relationships"] is not batches[0][0]["relationships"]
+
+
+    @pytest.mark.asyncio
+    async def test_graph_cache(self):
+        """Enrichment reuses cached nodes until the entity is invalidated"""
+        graph = InMemoryGraphStore()
+        await graph.create_node(CanonNode(id="c1", type=NodeType.CHARACTER, properties={"name": "Alice"}))
+        rag = HybridRAGRetrieval(FakeVectorStore([{"id": "c1", "score": 1.0, "payload": {}}]), graph_store=graph)
+
+        await rag.retrieve("q", embed)
+        await graph.create_node(CanonNode(id="c2", type=NodeType.CHARACTER))
+        await graph.create_edge(CanonEdge(source_id="c1", target_id="c2", type=EdgeType.KNOWS))
+        assert (await rag.retrieve("q", embed))[0]["relationships"] == []
+
+        rag.invalidate("c1")
+        assert [r["id"] for r in (await rag.retrieve("q", embed))[0]["relationships"]] == ["c2"]
+
+
+    @pytest.mark.asyncio
+    async def test_build_context_enriches_only_what_fits(self):
+        """Hits whose entity lines can't fit the budget are not enriched"""
+        graph = InMemoryGraphStore()
+        hits = []
+        for i in range(4):
+            await graph.create_node(CanonNode(id=f"c{i}", type=NodeType.CHARACTER))
+            hits.append({"id": f"c{i}", "score": 1.0, "payload": {"name": f"c{i}", "summary": "x" * 40, "type": "character"}})
+        rag = HybridRAGRetrieval(FakeVectorStore(hits), graph_store=graph)
+
+        requested = []
+        get_nodes = graph.get_nodes
+
+        async def recording_get_nodes(node_ids):
+            requested.extend(node_ids)
+            return await get_nodes(node_ids)
+
+        graph.get_nodes = recording_get_nodes
+        context = await rag.build_context("q", embed, max_tokens=30)
+        assert requested == ["c0", "c1"]
+        assert context.startswith("[character] c0:")
+
+
+class TestSemanticQueryCache:
+    """Test the semantic query cache in front of retrieve()"""
+
+    @pytest.fixture
+    def vector_store(self):
+        return FakeVectorStore([{"id": "e1", "score": 0.9, "payload": {"name": "Alice"}}])
+
+    @pytest.mark.asyncio
+    async def test_similar_queries_hit(self, vector_store):
+        """Near-identical embeddings reuse results; different ones and parameters miss"""
+        rag = HybridRAGRetrieval(vector_store, query_cache=SemanticQueryCache())
+
+        first = await rag.retrieve("alice", embed)
+        first[0]["payload"]["name"] = "mutated"
+        again = await rag.retrieve("alice?", embed)
+        assert vector_store.searches == 1
+        assert again[0]["payload"]["name"] == "Alice"
+
+        await rag.retrieve("bob", embed)
+        await rag.retrieve("alice", embed, top_k=5)
+        assert vector_store.searches == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate(self, vector_store):
+        """Upserts bump the generation so cached results are not reused"""
+        rag = HybridRAGRetrieval(vector_store, query_cache=SemanticQueryCache())
+        await rag.retrieve("alice", embed)
+        await vector_store.upsert("c", [])
+        await rag.retrieve("alice", embed)
+        assert vector_store.searches == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_text_is_embedded_once(self, vector_store):
+        """Repeated query text reuses the cached embedding"""
+        calls = []
+
+        async def counting_embed(text):
+            calls.append(text)
+            return await embed(text)
+
+        rag = HybridRAGRetrieval(vector_store)
+        await rag.retrieve("alice", counting_embed)
+        await rag.retrieve_batch(["alice", "bob", "bob"], counting_embed)
+        await rag.retrieve("bob", counting_embed)
+        assert sorted(calls) == ["alice", "bob"]
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when full"""
+        cache = SemanticQueryCache(max_entries=2)
+        cache.update([1.0, 0.0], ["x"])
+        cache.update([0.0, 1.0], ["y"])
+        assert cache.lookup([1.0, 0.0]) == ["x"]
+        cache.update([-1.0, 0.0], ["z"])
+        assert cache.lookup([0.0, 1.0]) is None
+        assert cache.lookup([1.0, 0.0]) == ["x"]
+
+    def test_quantized_scores_match(self):
+        """int8 rows score within rounding error of float32 rows"""
+        exact, quantized = SemanticQueryCache(), SemanticQueryCache(quantize=True)
+        for cache in (exact, quantized):
+            cache.update([0.3, -0.5, 0.8, 0.1], ["x"])
+        query = exact._normalize([0.31, -0.48, 0.79, 0.12])
+        assert abs(exact._scores(query, 1)[0] - quantized._scores(query, 1)[0]) < 0.01
+        assert quantized.lookup([0.31, -0.48, 0.79, 0.12]) == ["x"]
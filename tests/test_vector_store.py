@@ -0,0 +1,43 @@
+"""Tests for the Qdrant vector store"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.memory.vector_store import QdrantVectorStore
+
+
+class RecordingStore(QdrantVectorStore):
+    """Qdrant store that records client calls instead of sending them"""
+
+    def __init__(self, **kwargs):
+        super().__init__(shared_client=False, **kwargs)
+        self.calls = []
+
+    async def _call(self, method, **kwargs):
+        self.calls.append((method, kwargs))
+        return SimpleNamespace(points=[])
+
+
+class TestNormalization:
+    """Test client-side normalization per collection distance"""
+
+    @pytest.mark.asyncio
+    async def test_only_cosine_collections_normalize(self):
+        """Cosine vectors are scaled to unit length; Euclidean and Dot ones pass through unchanged"""
+        store = RecordingStore()
+        for name, distance in (("cos", "Cosine"), ("euc", "Euclidean"), ("dot", "Dot")):
+            await store.create_collection(name, vector_size=2, distance=distance)
+            await store.upsert(name, [{"id": 1, "vector": [3.0, 4.0]}])
+            await store.search(name, [3.0, 4.0])
+
+        sent = {}
+        for method, kwargs in store.calls:
+            if method == "upsert":
+                sent.setdefault(kwargs["collection_name"], []).append(kwargs["points"][0].vector)
+            elif method == "query_points":
+                sent[kwargs["collection_name"]].append(kwargs["query"])
+
+        assert sent["cos"] == [pytest.approx([0.6, 0.8])] * 2
+        assert sent["euc"] == [[3.0, 4.0]] * 2
+        assert sent["dot"] == [[3.0, 4.0]] * 2